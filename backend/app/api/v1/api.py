@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, organizations, users, projects, audits, templates, findings, reports, activity, notifications, analytics
+from app.api.v1.endpoints import auth, organizations, users, projects, audits, templates, findings, reports, activity, notifications, analytics, jobs
 
 api_router = APIRouter()
 
@@ -14,4 +14,4 @@ api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(activity.router, prefix="/activity", tags=["activity"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
-
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime
-from app.db.database import get_db
+from app.db.read_routing import get_read_db
 from app.models.activity import ActivityLog
 from app.models.user import User, UserRole
 from app.schemas.activity import ActivityLog as ActivityLogSchema
@@ -10,15 +10,25 @@ from app.core.dependencies import get_current_user
 
 router = APIRouter()
 
+def _in_time_range(query, since: Optional[datetime], until: Optional[datetime]):
+    """created_at bounds; activity_logs is partitioned by month, so they limit the partitions scanned"""
+    if since:
+        query = query.filter(ActivityLog.created_at >= since)
+    if until:
+        query = query.filter(ActivityLog.created_at < until)
+    return query
+
 @router.get("/", response_model=List[ActivityLogSchema])
 def get_activity_logs(
     entity_type: Optional[str] = Query(None, description="Filter by entity type (finding, audit, project, etc.)"),
     entity_id: Optional[int] = Query(None, description="Filter by entity ID"),
     action: Optional[str] = Query(None, description="Filter by action"),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    since: Optional[datetime] = Query(None, description="Only activity at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only activity before this time"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get activity logs with optional filters"""
@@ -37,6 +47,7 @@ def get_activity_logs(
             query = query.filter(ActivityLog.user_id == user_id)
         else:
             raise HTTPException(status_code=403, detail="Not enough permissions")
+    query = _in_time_range(query, since, until)
     
     # Order by most recent first
     query = query.order_by(ActivityLog.created_at.desc())
@@ -63,16 +74,19 @@ def get_activity_logs(
 def get_entity_activity_logs(
     entity_type: str,
     entity_id: int,
+    since: Optional[datetime] = Query(None, description="Only activity at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only activity before this time"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get activity logs for a specific entity"""
     query = db.query(ActivityLog).options(joinedload(ActivityLog.user)).filter(
         ActivityLog.entity_type == entity_type,
         ActivityLog.entity_id == entity_id
-    ).order_by(ActivityLog.created_at.desc())
+    )
+    query = _in_time_range(query, since, until).order_by(ActivityLog.created_at.desc())
     
     logs = query.offset(skip).limit(limit).all()
     
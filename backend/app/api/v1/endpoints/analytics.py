@@ -1,163 +1,511 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, cast, case, Interval
 from typing import Optional
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from app.db.database import get_db
-from app.models.finding import Finding
-from app.models.audit import Audit, AuditStatus
+from app.db.read_routing import get_async_read_db
+from app.models.finding import Finding, FindingStatusTransition, control_prefix_expression
+from app.models.audit import Audit, AuditStatus, AuditStandard
 from app.models.project import Project
-from app.models.template import Severity, Status
-from app.core.dependencies import get_current_user
+from app.models.template import Severity, Status, OPEN_STATUSES, CLOSED_STATUSES
+from app.models.analytics import FindingRollup
+from app.db.soft_delete import live_audit_ids
+from app.core.config import settings
+from app.core.dependencies import get_current_user, get_current_user_async, get_accessible_project_ids_query, get_accessible_project_ids_async
+from app.core.cache import project_scope_tags
+from app.services.analytics_rollups import ROLLUP_RECONCILE_JOB, run_rollup_reconcile
+from app.services.jobs import create_job, run_job
+from app.services.analytics_cache import analytics_cache
 from app.models.user import User, UserRole
+from app.schemas.job import Job as JobSchema
 
 router = APIRouter()
 
-@router.get("/dashboard")
-def get_dashboard_stats(
-    project_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Get dashboard statistics"""
-    from app.models.project import ProjectUser
+def _dashboard_filters(accessible_project_ids, project_id: Optional[int]):
+    audit_filters = []
+    # Rollups still count findings of soft-deleted audits until they are purged
+    rollup_filters = [FindingRollup.audit_id.in_(live_audit_ids())]
+    if accessible_project_ids is not None:
+        audit_filters.append(Audit.project_id.in_(accessible_project_ids))
+        rollup_filters.append(FindingRollup.project_id.in_(accessible_project_ids))
+    if project_id:
+        audit_filters.append(Audit.project_id == project_id)
+        rollup_filters.append(FindingRollup.project_id == project_id)
+    return audit_filters, rollup_filters
+
+def _rollup_sum(*conditions):
+    total = func.sum(FindingRollup.finding_count)
+    if conditions:
+        total = total.filter(*conditions)
+    return func.coalesce(total, 0)
+
+def _compute_dashboard_stats(db: Session, accessible_project_ids, project_id: Optional[int]) -> dict:
+    """Dashboard figures shared by every user with the same project scope"""
+    audit_filters, rollup_filters = _dashboard_filters(accessible_project_ids, project_id)
     
-    # Filter accessible projects
-    if current_user.role == UserRole.PLATFORM_ADMIN:
-        accessible_project_ids = None  # All projects
-    elif current_user.role == UserRole.ORG_ADMIN:
-        projects = db.query(Project).filter(Project.organization_id == current_user.organization_id).all()
-        accessible_project_ids = [p.id for p in projects]
+    if accessible_project_ids is None:
+        total_projects_query = select(func.count(Project.id)).scalar_subquery()
     else:
-        project_users = db.query(ProjectUser).filter(ProjectUser.user_id == current_user.id).all()
-        accessible_project_ids = [pu.project_id for pu in project_users]
+        total_projects_query = select(func.count()).select_from(accessible_project_ids.subquery()).scalar_subquery()
     
-    # Base queries
-    audits_query = db.query(Audit)
-    findings_query = db.query(Finding).join(Audit)
+    # Round trip 1: project and audit counts
+    audit_row = db.execute(
+        select(
+            total_projects_query.label("total_projects"),
+            func.count(Audit.id).label("total_audits"),
+            *[func.count(Audit.id).filter(Audit.status == status).label(f"audit_{status.value}") for status in AuditStatus]
+        ).select_from(Audit).where(*audit_filters)
+    ).one()._mapping
     
-    if accessible_project_ids is not None:
-        audits_query = audits_query.filter(Audit.project_id.in_(accessible_project_ids))
-        findings_query = findings_query.filter(Audit.project_id.in_(accessible_project_ids))
+    # Round trip 2: finding counters from the trigger-maintained rollups.
+    # Overdue / due-soon depend on the current time, so they stay live (indexed due_date) as scalar subqueries.
+    def live_findings_count(*conditions):
+        return select(func.count(Finding.id)).join(Audit, Finding.audit_id == Audit.id).where(
+            *audit_filters, *conditions
+        ).scalar_subquery()
     
-    if project_id:
-        audits_query = audits_query.filter(Audit.project_id == project_id)
-        findings_query = findings_query.filter(Audit.project_id == project_id)
-    
-    # Get counts
-    total_projects = db.query(Project).count() if current_user.role == UserRole.PLATFORM_ADMIN else len(accessible_project_ids or [])
-    total_audits = audits_query.count()
-    total_findings = findings_query.count()
-    
-    # Status distribution
-    audit_status_dist = {}
-    for status in AuditStatus:
-        count = audits_query.filter(Audit.status == status).count()
-        audit_status_dist[status.value] = count
-    
-    # Severity distribution
-    severity_dist = {}
-    for severity in Severity:
-        count = findings_query.filter(Finding.severity == severity).count()
-        severity_dist[severity.value] = count
-    
-    # Status distribution
-    finding_status_dist = {}
-    for status in Status:
-        count = findings_query.filter(Finding.status == status).count()
-        finding_status_dist[status.value] = count
-    
-    # Open findings count
-    open_findings = findings_query.filter(
-        Finding.status.in_([Status.OPEN, Status.IN_PROGRESS])
-    ).count()
-    
-    # Urgent findings (critical/high, open/in_progress)
-    urgent_findings = findings_query.filter(
-        Finding.severity.in_([Severity.CRITICAL, Severity.HIGH]),
-        Finding.status.in_([Status.OPEN, Status.IN_PROGRESS])
-    ).count()
-    
-    # Assigned findings count for current user
-    my_findings = findings_query.filter(Finding.assigned_to_user_id == current_user.id).count()
-    
-    # Overdue findings
     now = datetime.now()
-    overdue_findings = findings_query.filter(
-        Finding.due_date.isnot(None),
-        Finding.due_date < now,
-        Finding.status.in_([Status.OPEN, Status.IN_PROGRESS])
-    ).count()
-    
-    # Due soon (next 3 days)
     three_days_later = now + timedelta(days=3)
-    due_soon_findings = findings_query.filter(
-        Finding.due_date.isnot(None),
-        Finding.due_date <= three_days_later,
-        Finding.due_date > now,
-        Finding.status.in_([Status.OPEN, Status.IN_PROGRESS])
-    ).count()
+    is_open = FindingRollup.status.in_([Status.OPEN, Status.IN_PROGRESS])
+    finding_is_open = Finding.status.in_([Status.OPEN, Status.IN_PROGRESS])
+    finding_row = db.execute(
+        select(
+            _rollup_sum().label("total_findings"),
+            *[_rollup_sum(FindingRollup.severity == severity).label(f"severity_{severity.value}") for severity in Severity],
+            *[_rollup_sum(FindingRollup.status == status).label(f"status_{status.value}") for status in Status],
+            _rollup_sum(is_open).label("open_findings"),
+            # Urgent findings (critical/high, open/in_progress)
+            _rollup_sum(FindingRollup.severity.in_([Severity.CRITICAL, Severity.HIGH]), is_open).label("urgent_findings"),
+            live_findings_count(
+                Finding.due_date.isnot(None), Finding.due_date < now, finding_is_open
+            ).label("overdue_findings"),
+            # Due soon (next 3 days)
+            live_findings_count(
+                Finding.due_date.isnot(None), Finding.due_date <= three_days_later, Finding.due_date > now, finding_is_open
+            ).label("due_soon_findings"),
+        ).select_from(FindingRollup).where(*rollup_filters)
+    ).one()._mapping
     
     # Completion rate
-    total_findings_for_completion = total_findings
-    completed_findings = findings_query.filter(Finding.status == Status.RESOLVED).count()
-    completion_rate = (completed_findings / total_findings_for_completion * 100) if total_findings_for_completion > 0 else 0
+    total_findings = finding_row["total_findings"]
+    completed_findings = finding_row[f"status_{Status.RESOLVED.value}"]
+    completion_rate = (completed_findings / total_findings * 100) if total_findings > 0 else 0
     
     return {
-        "total_projects": total_projects,
-        "total_audits": total_audits,
+        "total_projects": audit_row["total_projects"],
+        "total_audits": audit_row["total_audits"],
         "total_findings": total_findings,
-        "open_findings": open_findings,
-        "urgent_findings": urgent_findings,
-        "my_findings": my_findings,
-        "overdue_findings": overdue_findings,
-        "due_soon_findings": due_soon_findings,
+        "open_findings": finding_row["open_findings"],
+        "urgent_findings": finding_row["urgent_findings"],
+        "overdue_findings": finding_row["overdue_findings"],
+        "due_soon_findings": finding_row["due_soon_findings"],
         "completion_rate": round(completion_rate, 2),
-        "audit_status_distribution": audit_status_dist,
-        "severity_distribution": severity_dist,
-        "status_distribution": finding_status_dist
+        "audit_status_distribution": {status.value: audit_row[f"audit_{status.value}"] for status in AuditStatus},
+        "severity_distribution": {severity.value: finding_row[f"severity_{severity.value}"] for severity in Severity},
+        "status_distribution": {status.value: finding_row[f"status_{status.value}"] for status in Status}
     }
 
+def _compute_my_findings(db: Session, accessible_project_ids, project_id: Optional[int], user_id: int) -> int:
+    """Per-user dashboard counter, kept apart from the shared figures"""
+    _, rollup_filters = _dashboard_filters(accessible_project_ids, project_id)
+    return db.execute(
+        select(_rollup_sum()).where(*rollup_filters, FindingRollup.assigned_to_user_id == user_id)
+    ).scalar()
+
+def _finding_scope_filters(accessible_project_ids, project_id: Optional[int]) -> list:
+    """Finding filters for the accessible projects (semi-join on audits, no row fan-out)"""
+    audit_filters, _ = _dashboard_filters(accessible_project_ids, project_id)
+    if not audit_filters:
+        return []
+    return [Finding.audit_id.in_(select(Audit.id).where(*audit_filters))]
+
+def _scope_tags(project_scope, project_id: Optional[int]):
+    if project_id:
+        return project_scope_tags([project_id])
+    return project_scope_tags(project_scope)
+
+@router.get("/dashboard")
+async def get_dashboard_stats(
+    project_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get dashboard statistics"""
+    # Filter accessible projects (subquery, resolved inside the aggregate statements)
+    accessible_project_ids = get_accessible_project_ids_query(current_user)
+    # Resolved scope: users seeing the same projects share cache entries
+    project_scope = await get_accessible_project_ids_async(current_user, db)
+    tags = _scope_tags(project_scope, project_id)
+    
+    stats = await analytics_cache.get_or_compute_async(
+        ("dashboard", project_scope, project_id),
+        lambda: db.run_sync(_compute_dashboard_stats, accessible_project_ids, project_id),
+        tags
+    )
+    my_findings = await analytics_cache.get_or_compute_async(
+        ("dashboard:my_findings", current_user.id, project_scope, project_id),
+        lambda: db.run_sync(_compute_my_findings, accessible_project_ids, project_id, current_user.id),
+        tags
+    )
+    
+    return {**stats, "my_findings": my_findings}
+
+TIMELINE_GRANULARITIES = {"day": "1 day", "week": "1 week", "month": "1 month"}
+TIMELINE_SPLITS = {"severity": (Finding.severity, Severity), "status": (Finding.status, Status)}
+
+def _truncate_to_bucket(local_dt: datetime, granularity: str) -> datetime:
+    """Start of the bucket containing local_dt (same semantics as PostgreSQL date_trunc)"""
+    local_dt = local_dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "week":
+        local_dt -= timedelta(days=local_dt.weekday())
+    elif granularity == "month":
+        local_dt = local_dt.replace(day=1)
+    return local_dt
+
+def _compute_findings_timeline(
+    db: Session,
+    accessible_project_ids,
+    project_id: Optional[int],
+    first_bucket: datetime,
+    last_bucket: datetime,
+    granularity: str,
+    tz: str,
+    split: Optional[str]
+) -> list:
+    """
+    Gap-filled timeline in one statement: generate_series buckets LEFT JOIN the grouped counts.
+    The counts side is an index-only scan of ix_findings_created_at_audit_severity.
+    """
+    bucket = func.date_trunc(granularity, func.timezone(tz, Finding.created_at))
+    series_column, series_enum = TIMELINE_SPLITS[split] if split else (None, None)
+    group_columns = [bucket.label("bucket")]
+    if series_column is not None:
+        group_columns.append(series_column.label("series"))
+    
+    counts = select(*group_columns, func.count().label("count")).where(
+        Finding.created_at >= first_bucket,
+        *_finding_scope_filters(accessible_project_ids, project_id)
+    ).group_by(*group_columns).subquery("counts")
+    
+    buckets = select(
+        func.generate_series(
+            first_bucket.replace(tzinfo=None),
+            last_bucket.replace(tzinfo=None),
+            cast(TIMELINE_GRANULARITIES[granularity], Interval)
+        ).label("bucket")
+    ).subquery("buckets")
+    
+    result_columns = [buckets.c.bucket, func.coalesce(counts.c.count, 0).label("count")]
+    if series_column is not None:
+        result_columns.append(counts.c.series)
+    rows = db.execute(
+        select(*result_columns)
+        .select_from(buckets.outerjoin(counts, counts.c.bucket == buckets.c.bucket))
+        .order_by(buckets.c.bucket)
+    ).all()
+    
+    timeline = []
+    points = {}
+    for row in rows:
+        point = points.get(row.bucket)
+        if point is None:
+            point = {"date": row.bucket.date().isoformat(), "count": 0}
+            if series_enum is not None:
+                point["series"] = {member.value: 0 for member in series_enum}
+            points[row.bucket] = point
+            timeline.append(point)
+        point["count"] += row.count
+        if series_enum is not None and row.series is not None:
+            point["series"][row.series.value] = row.count
+    return timeline
+
 @router.get("/findings-timeline")
-def get_findings_timeline(
+async def get_findings_timeline(
     days: int = Query(30, ge=1, le=365),
     project_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    tz: str = Query(settings.DEFAULT_TIMEZONE, description="IANA time zone used for bucketing, e.g. Europe/Istanbul"),
+    split: Optional[str] = Query(None, pattern="^(severity|status)$"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
 ):
-    """Get findings created over time"""
-    from app.models.project import ProjectUser
+    """Get findings created over time, one point per day/week/month (empty buckets included)"""
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone '{tz}'")
     
     # Filter accessible projects
-    if current_user.role == UserRole.PLATFORM_ADMIN:
-        accessible_project_ids = None
-    elif current_user.role == UserRole.ORG_ADMIN:
-        projects = db.query(Project).filter(Project.organization_id == current_user.organization_id).all()
-        accessible_project_ids = [p.id for p in projects]
-    else:
-        project_users = db.query(ProjectUser).filter(ProjectUser.user_id == current_user.id).all()
-        accessible_project_ids = [pu.project_id for pu in project_users]
+    accessible_project_ids = get_accessible_project_ids_query(current_user)
+    project_scope = await get_accessible_project_ids_async(current_user, db)
     
-    start_date = datetime.now() - timedelta(days=days)
+    now = datetime.now(zone)
+    first_bucket = _truncate_to_bucket(now - timedelta(days=days), granularity)
+    last_bucket = _truncate_to_bucket(now, granularity)
     
-    query = db.query(
-        func.date(Finding.created_at).label('date'),
-        func.count(Finding.id).label('count')
-    ).join(Audit)
+    return await analytics_cache.get_or_compute_async(
+        ("findings-timeline", project_scope, project_id, granularity, tz, split, first_bucket, last_bucket),
+        lambda: db.run_sync(
+            _compute_findings_timeline, accessible_project_ids, project_id, first_bucket, last_bucket, granularity, tz, split
+        ),
+        _scope_tags(project_scope, project_id)
+    )
+
+# Open finding age buckets in days: (label, lower bound inclusive, upper bound exclusive)
+AGEING_BUCKETS = [("0-30", 0, 30), ("30-90", 30, 90), ("90-180", 90, 180), ("180+", 180, None)]
+
+def _days_between(start, end):
+    return func.extract("epoch", end - start) / 86400.0
+
+def _compute_remediation_stats(
+    db: Session,
+    accessible_project_ids,
+    project_id: Optional[int],
+    start_date: datetime,
+    end_date: datetime
+) -> dict:
+    """MTTR and SLA breaches of resolutions in [start_date, end_date), ageing and SLA state of open findings"""
+    finding_filters = _finding_scope_filters(accessible_project_ids, project_id)
+    sla_days = case(
+        {severity: settings.REMEDIATION_SLA_DAYS.get(severity.value, 0) for severity in Severity},
+        value=Finding.severity
+    )
     
-    if accessible_project_ids is not None:
-        query = query.filter(Audit.project_id.in_(accessible_project_ids))
+    # Last transition into resolved/closed per finding inside the window (to_status, changed_at) range scan
+    resolutions = select(
+        FindingStatusTransition.finding_id,
+        func.max(FindingStatusTransition.changed_at).label("resolved_at")
+    ).where(
+        FindingStatusTransition.to_status.in_(CLOSED_STATUSES),
+        FindingStatusTransition.changed_at >= start_date,
+        FindingStatusTransition.changed_at < end_date
+    ).group_by(FindingStatusTransition.finding_id).subquery("resolutions")
     
-    if project_id:
-        query = query.filter(Audit.project_id == project_id)
+    days_to_resolve = _days_between(Finding.created_at, resolutions.c.resolved_at)
+    resolved_rows = db.execute(
+        select(
+            Finding.severity,
+            func.count().label("resolved"),
+            func.avg(days_to_resolve).label("mttr_days"),
+            func.percentile_cont(0.5).within_group(days_to_resolve).label("median_days"),
+            func.count().filter(days_to_resolve > sla_days).label("sla_breached")
+        ).join(resolutions, resolutions.c.finding_id == Finding.id)
+        .where(*finding_filters)
+        .group_by(Finding.severity)
+    ).all()
     
-    query = query.filter(Finding.created_at >= start_date).group_by(func.date(Finding.created_at)).order_by('date')
+    age_days = _days_between(Finding.created_at, func.now())
+    open_rows = db.execute(
+        select(
+            Finding.severity,
+            func.count().label("open"),
+            func.count().filter(age_days > sla_days).label("sla_breached"),
+            *[
+                func.count().filter(
+                    age_days >= lower, *([age_days < upper] if upper is not None else [])
+                ).label(f"age_{index}")
+                for index, (label, lower, upper) in enumerate(AGEING_BUCKETS)
+            ]
+        ).where(Finding.status.in_(OPEN_STATUSES), *finding_filters)
+        .group_by(Finding.severity)
+    ).all()
+    
+    severities = {
+        severity.value: {
+            "sla_days": settings.REMEDIATION_SLA_DAYS.get(severity.value, 0),
+            "resolved": 0,
+            "mttr_days": None,
+            "median_days": None,
+            "resolved_sla_breached": 0,
+            "sla_breach_rate": None,
+            "open": 0,
+            "open_sla_breached": 0,
+            "ageing": {label: 0 for label, _, _ in AGEING_BUCKETS},
+        }
+        for severity in Severity
+    }
+    for row in resolved_rows:
+        entry = severities[row.severity.value]
+        entry["resolved"] = row.resolved
+        entry["mttr_days"] = round(float(row.mttr_days), 2) if row.mttr_days is not None else None
+        entry["median_days"] = round(float(row.median_days), 2) if row.median_days is not None else None
+        entry["resolved_sla_breached"] = row.sla_breached
+        entry["sla_breach_rate"] = round(row.sla_breached / row.resolved * 100, 2) if row.resolved else None
+    for row in open_rows:
+        entry = severities[row.severity.value]
+        entry["open"] = row.open
+        entry["open_sla_breached"] = row.sla_breached
+        entry["ageing"] = {label: row._mapping[f"age_{index}"] for index, (label, _, _) in enumerate(AGEING_BUCKETS)}
     
-    results = query.all()
+    total_resolved = sum(row.resolved for row in resolved_rows)
+    total_breached = sum(row.sla_breached for row in resolved_rows)
+    total_days = sum(float(row.mttr_days) * row.resolved for row in resolved_rows if row.mttr_days is not None)
     
-    return [{"date": str(result.date), "count": result.count} for result in results]
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "resolved": total_resolved,
+        "mttr_days": round(total_days / total_resolved, 2) if total_resolved else None,
+        "sla_breach_rate": round(total_breached / total_resolved * 100, 2) if total_resolved else None,
+        "open": sum(row.open for row in open_rows),
+        "open_sla_breached": sum(row.sla_breached for row in open_rows),
+        "severities": severities,
+    }
 
+@router.get("/remediation")
+async def get_remediation_stats(
+    project_id: Optional[int] = Query(None),
+    start_date: Optional[datetime] = Query(None, description="Resolutions on or after this date (default: 90 days ago)"),
+    end_date: Optional[datetime] = Query(None, description="Resolutions before this date (default: now)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Mean time to remediate, ageing buckets and SLA breach rates per severity"""
+    end_date = end_date or datetime.now().astimezone()
+    start_date = start_date or end_date - timedelta(days=90)
+    if start_date >= end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    
+    accessible_project_ids = get_accessible_project_ids_query(current_user)
+    project_scope = await get_accessible_project_ids_async(current_user, db)
+    
+    return await analytics_cache.get_or_compute_async(
+        # Default windows end "now"; bucket the key by minute so they can be shared
+        ("remediation", project_scope, project_id, start_date.replace(second=0, microsecond=0), end_date.replace(second=0, microsecond=0)),
+        lambda: db.run_sync(_compute_remediation_stats, accessible_project_ids, project_id, start_date, end_date),
+        _scope_tags(project_scope, project_id)
+    )
 
+def _compute_control_heatmap(
+    db: Session,
+    accessible_project_ids,
+    organization_id: Optional[int],
+    project_id: Optional[int],
+    standard: Optional[AuditStandard],
+    period: Optional[str],
+    open_only: bool,
+    limit: int
+) -> dict:
+    """Control prefix x severity (x period) counts in one grouped statement over ix_findings_control_prefix"""
+    audit_filters, _ = _dashboard_filters(accessible_project_ids, project_id)
+    if organization_id:
+        audit_filters.append(Audit.project_id.in_(select(Project.id).where(Project.organization_id == organization_id)))
+    if standard:
+        audit_filters.append(Audit.standard == standard)
+    
+    control_prefix = control_prefix_expression()
+    group_columns = [control_prefix.label("control_prefix"), Finding.severity.label("severity")]
+    if period:
+        group_columns.append(
+            func.date_trunc(period, func.timezone(settings.DEFAULT_TIMEZONE, Finding.created_at)).label("period")
+        )
+    
+    filters = [control_prefix.isnot(None), control_prefix != ""]
+    if audit_filters:
+        filters.append(Finding.audit_id.in_(select(Audit.id).where(*audit_filters)))
+    if open_only:
+        filters.append(Finding.status.in_(OPEN_STATUSES))
+    
+    rows = db.execute(
+        select(
+            *group_columns,
+            func.count().label("count"),
+            func.count().filter(Finding.status.in_(OPEN_STATUSES)).label("open")
+        ).where(*filters).group_by(*group_columns)
+    ).all()
+    
+    controls = {}
+    periods = set()
+    for row in rows:
+        entry = controls.get(row.control_prefix)
+        if entry is None:
+            entry = {
+                "control_prefix": row.control_prefix,
+                "total": 0,
+                "open": 0,
+                "severity": {severity.value: 0 for severity in Severity},
+            }
+            if period:
+                entry["periods"] = {}
+            controls[row.control_prefix] = entry
+        entry["total"] += row.count
+        entry["open"] += row.open
+        entry["severity"][row.severity.value] += row.count
+        if period:
+            period_key = row.period.date().isoformat()
+            periods.add(period_key)
+            period_counts = entry["periods"].setdefault(period_key, {severity.value: 0 for severity in Severity})
+            period_counts[row.severity.value] += row.count
+    
+    # Most failing controls first
+    ranked = sorted(controls.values(), key=lambda entry: (-entry["total"], entry["control_prefix"]))
+    return {
+        "severities": [severity.value for severity in Severity],
+        "periods": sorted(periods) if period else None,
+        "total_controls": len(ranked),
+        "rows": ranked[:limit],
+    }
 
+@router.get("/control-heatmap")
+async def get_control_heatmap(
+    organization_id: Optional[int] = Query(None),
+    project_id: Optional[int] = Query(None),
+    standard: Optional[AuditStandard] = Query(None),
+    period: Optional[str] = Query(None, pattern="^(month|quarter|year)$"),
+    open_only: bool = Query(False),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Which control families (e.g. A.8 in ISO27001) fail most often: control prefix x severity matrix"""
+    if current_user.role != UserRole.PLATFORM_ADMIN:
+        if organization_id and organization_id != current_user.organization_id:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        # Already restricted to the user's organization by the project scope
+        organization_id = None
+    
+    accessible_project_ids = get_accessible_project_ids_query(current_user)
+    # Org admins share one entry per organization, auditors per assigned project set
+    project_scope = await get_accessible_project_ids_async(current_user, db)
+    
+    return await analytics_cache.get_or_compute_async(
+        ("control-heatmap", project_scope, organization_id, project_id, standard, period, open_only, limit),
+        lambda: db.run_sync(
+            _compute_control_heatmap, accessible_project_ids, organization_id, project_id, standard, period, open_only, limit
+        ),
+        _scope_tags(project_scope, project_id)
+    )
 
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_user: User = Depends(get_current_user_async)
+):
+    """Analytics cache hit/miss counters of this worker process (platform admin only)"""
+    if current_user.role != UserRole.PLATFORM_ADMIN:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    return analytics_cache.stats()
 
+@router.post("/rollups/reconcile", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+def reconcile_rollups(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Recompute analytics rollups from findings (platform admin only, normally run nightly).
+    The rebuild locks the rollups and may outlast the statement timeout, so it runs as a
+    background job; poll GET /jobs/{id} for its result.
+    """
+    if current_user.role != UserRole.PLATFORM_ADMIN:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    job = create_job(db, ROLLUP_RECONCILE_JOB, user_id=current_user.id)
+    db.commit()
+    db.refresh(job)
+    
+    background_tasks.add_task(run_job, job.id, run_rollup_reconcile)
+    return job
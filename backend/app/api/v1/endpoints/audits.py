@@ -1,22 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, BackgroundTasks
 from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, literal, func
 from typing import List
 from app.db.database import get_db
+from app.db.read_routing import get_read_db
 from app.models.audit import Audit, AuditStatus
 from app.models.project import Project
-from app.models.template import Template, TemplateItem
+from app.models.template import Template, TemplateItem, Severity, Status, OPEN_STATUSES, CLOSED_STATUSES
 from app.models.finding import Finding
 from app.models.user import User, UserRole
-from app.schemas.audit import Audit as AuditSchema, AuditCreate, AuditUpdate
-from app.core.dependencies import get_current_user
+from app.schemas.audit import Audit as AuditSchema, AuditCreate, AuditUpdate, AuditWithStats
+from app.core.dependencies import get_current_user, get_accessible_project_ids_query, is_project_member
 from app.core.activity_logger import log_activity
 from app.core.notification_service import create_notification
 from app.models.notification import NotificationType
+from app.core.i18n import get_language
+from app.services.findings_export import findings_export_response
+from app.services.analytics_cache import invalidate_analytics_cache
+from app.services.audit_copy import copy_audit_contents
+from app.services.finding_history import record_entry_transitions
+from app.services.deletion import delete_audit_cascade, soft_delete_audit
+from app.services.evidence_files import remove_evidence_files
 
 router = APIRouter()
 
-def check_project_access(user: User, project_id: int, db: Session):
-    project = db.query(Project).filter(Project.id == project_id).first()
+def check_project_access(user: User, project_id: int, db: Session, include_deleted: bool = False):
+    project = db.query(Project).filter(Project.id == project_id).execution_options(include_deleted=include_deleted).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -28,8 +37,7 @@ def check_project_access(user: User, project_id: int, db: Session):
         return project
     else:
         # Auditor can only access assigned projects
-        project_ids = [pu.project_id for pu in user.project_assignments]
-        if project_id not in project_ids:
+        if not is_project_member(db, user.id, project_id):
             raise HTTPException(status_code=403, detail="Not enough permissions")
         return project
 
@@ -65,7 +73,7 @@ def create_audit(
     
     # Create findings from template if provided
     if audit.template_id:
-        from app.core.i18n import get_template_field
+        from app.core.i18n import template_field_expression
         template = db.query(Template).filter(Template.id == audit.template_id).first()
         if template:
             # Get language from request (default to 'tr')
@@ -74,24 +82,25 @@ def create_audit(
             if lang not in ["tr", "en"]:
                 lang = "tr"
             
-            # Debug: Log the language being used
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"Creating findings from template {audit.template_id} with language: {lang}")
+            # One INSERT ... SELECT for all template items, language chosen in SQL
+            template_items = select(
+                literal(db_audit.id),
+                template_field_expression(TemplateItem, "default_title", lang),
+                template_field_expression(TemplateItem, "default_description", lang),
+                TemplateItem.control_reference,
+                TemplateItem.default_severity,
+                TemplateItem.default_status,
+                template_field_expression(TemplateItem, "default_recommendation", lang),
+            ).where(
+                TemplateItem.template_id == template.id
+            ).order_by(TemplateItem.order_number, TemplateItem.id)
             
-            findings_count = 0
-            for item in template.items:
-                finding = Finding(
-                    audit_id=db_audit.id,
-                    title=get_template_field(item, "default_title", lang),
-                    description=get_template_field(item, "default_description", lang),
-                    control_reference=item.control_reference,
-                    severity=item.default_severity,
-                    status=item.default_status,
-                    recommendation=get_template_field(item, "default_recommendation", lang)
+            findings_count = db.execute(
+                insert(Finding).from_select(
+                    ["audit_id", "title", "description", "control_reference", "severity", "status", "recommendation"],
+                    template_items
                 )
-                db.add(finding)
-                findings_count += 1
+            ).rowcount
             
             # Log template findings creation
             log_activity(
@@ -100,19 +109,24 @@ def create_audit(
                 entity_id=db_audit.id,
                 action="findings_created_from_template",
                 user_id=current_user.id,
-                details={"template_id": audit.template_id, "findings_count": findings_count}
+                details={"template_id": audit.template_id, "findings_count": findings_count},
+                critical=False
             )
+            # Template items may default to a resolved / closed status
+            record_entry_transitions(db, Finding.audit_id == db_audit.id, user_id=current_user.id)
     
     db.commit()
+    invalidate_analytics_cache(db_audit.project_id)
     db.refresh(db_audit)
     return db_audit
 
-@router.get("/", response_model=List[AuditSchema])
+@router.get("/", response_model=List[AuditWithStats])
 def read_audits(
     skip: int = 0,
     limit: int = 100,
     project_id: int = None,
-    db: Session = Depends(get_db),
+    include_stats: bool = Query(False, description="Add finding counts by severity/status, overdue count and completion"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     query = db.query(Audit)
@@ -124,20 +138,60 @@ def read_audits(
         # Filter by accessible projects
         if current_user.role == UserRole.PLATFORM_ADMIN:
             pass  # See all
-        elif current_user.role == UserRole.ORG_ADMIN:
-            project_ids = [p.id for p in db.query(Project).filter(Project.organization_id == current_user.organization_id).all()]
-            query = query.filter(Audit.project_id.in_(project_ids))
         else:
-            project_ids = [pu.project_id for pu in current_user.project_assignments]
-            query = query.filter(Audit.project_id.in_(project_ids))
+            query = query.filter(Audit.project_id.in_(get_accessible_project_ids_query(current_user)))
+    
+    query = query.order_by(Audit.id)
+    if not include_stats:
+        return query.offset(skip).limit(limit).all()
     
-    audits = query.offset(skip).limit(limit).all()
-    return audits
+    # One statement: the page of audits outer-joined to its findings grouped per audit
+    page = query.with_entities(Audit.id).offset(skip).limit(limit).cte("audit_page")
+    stats = _audit_finding_stats_subquery(select(page.c.id))
+    rows = (
+        db.query(Audit, stats)
+        .join(page, page.c.id == Audit.id)
+        .outerjoin(stats, stats.c.audit_id == Audit.id)
+        .order_by(Audit.id)
+        .all()
+    )
+    return [
+        AuditWithStats.model_validate(row[0]).model_copy(update={"finding_stats": _audit_finding_stats(row._mapping)})
+        for row in rows
+    ]
+
+def _audit_finding_stats_subquery(audit_ids):
+    """Finding counters per audit for the given audit ids (live findings only)"""
+    is_open = Finding.status.in_(OPEN_STATUSES)
+    return (
+        select(
+            Finding.audit_id.label("audit_id"),
+            func.count(Finding.id).label("total"),
+            *[func.count(Finding.id).filter(Finding.severity == severity).label(f"severity_{severity.value}") for severity in Severity],
+            *[func.count(Finding.id).filter(Finding.status == finding_status).label(f"status_{finding_status.value}") for finding_status in Status],
+            func.count(Finding.id).filter(is_open, Finding.due_date < func.now()).label("overdue"),
+            func.count(Finding.id).filter(Finding.status.in_(CLOSED_STATUSES)).label("closed"),
+        )
+        .where(Finding.audit_id.in_(audit_ids))
+        .group_by(Finding.audit_id)
+        .subquery("audit_finding_stats")
+    )
+
+def _audit_finding_stats(row) -> dict:
+    total = row["total"] or 0
+    closed = row["closed"] or 0
+    return {
+        "total": total,
+        "by_severity": {severity.value: row[f"severity_{severity.value}"] or 0 for severity in Severity},
+        "by_status": {finding_status.value: row[f"status_{finding_status.value}"] or 0 for finding_status in Status},
+        "overdue": row["overdue"] or 0,
+        "completion_percentage": round(closed * 100.0 / total, 1) if total else 0.0,
+    }
 
 @router.get("/{audit_id}", response_model=AuditSchema)
 def read_audit(
     audit_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     audit = db.query(Audit).filter(Audit.id == audit_id).first()
@@ -147,6 +201,26 @@ def read_audit(
     check_project_access(current_user, audit.project_id, db)
     return audit
 
+@router.get("/{audit_id}/findings.{export_format}")
+def export_audit_findings(
+    audit_id: int,
+    export_format: str,
+    lang: str = Query(None, description="Language code (tr/en)"),
+    request: Request = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Export the findings of an audit as CSV or XLSX"""
+    audit = db.query(Audit).filter(Audit.id == audit_id).first()
+    if not audit:
+        raise HTTPException(status_code=404, detail="Audit not found")
+    
+    check_project_access(current_user, audit.project_id, db)
+    
+    return findings_export_response(
+        db, export_format, [Finding.audit_id == audit_id], get_language(request, lang), f"audit_{audit_id}_findings"
+    )
+
 @router.put("/{audit_id}", response_model=AuditSchema)
 def update_audit(
     audit_id: int,
@@ -200,22 +274,35 @@ def update_audit(
                     )
     
     db.commit()
+    invalidate_analytics_cache(db_audit.project_id)
     db.refresh(db_audit)
     return db_audit
 
 @router.delete("/{audit_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_audit(
     audit_id: int,
+    background_tasks: BackgroundTasks,
+    permanent: bool = Query(False, description="Delete immediately instead of moving to trash (cannot be restored)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_audit = db.query(Audit).filter(Audit.id == audit_id).first()
+    """
+    Soft delete an audit (restorable for SOFT_DELETE_RETENTION_DAYS, purged afterwards).
+    permanent=true removes it with its findings right away, also from the trash.
+    """
+    db_audit = (
+        db.query(Audit)
+        .filter(Audit.id == audit_id)
+        .execution_options(include_deleted=permanent)
+        .first()
+    )
     if not db_audit:
         raise HTTPException(status_code=404, detail="Audit not found")
     
     check_project_access(current_user, db_audit.project_id, db)
     
     audit_name = db_audit.name
+    project_id = db_audit.project_id
     
     # Log activity before deletion
     log_activity(
@@ -224,17 +311,66 @@ def delete_audit(
         entity_id=audit_id,
         action="deleted",
         user_id=current_user.id,
-        details={"name": audit_name}
+        details={"name": audit_name, "permanent": permanent}
     )
     
-    db.delete(db_audit)
+    if not permanent:
+        # Flag only; the findings are hidden through the audit until the purger removes them
+        soft_delete_audit(db, audit_id)
+        db.commit()
+        invalidate_analytics_cache(project_id)
+        return None
+    
+    # Findings, comments and evidences follow via ON DELETE CASCADE
+    orphaned_paths = delete_audit_cascade(db, audit_id)
     db.commit()
+    
+    background_tasks.add_task(remove_evidence_files, orphaned_paths)
+    invalidate_analytics_cache(project_id)
     return None
 
+@router.post("/{audit_id}/restore", response_model=AuditSchema)
+def restore_audit(
+    audit_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Restore a soft-deleted audit; its project must not be deleted"""
+    db_audit = (
+        db.query(Audit)
+        .filter(Audit.id == audit_id, Audit.deleted_at.isnot(None))
+        .execution_options(include_deleted=True)
+        .first()
+    )
+    if not db_audit:
+        raise HTTPException(status_code=404, detail="Deleted audit not found")
+    
+    # Access first (the project may be deleted too), so the 409 reveals nothing to outsiders
+    project = check_project_access(current_user, db_audit.project_id, db, include_deleted=True)
+    if project.deleted_at is not None:
+        raise HTTPException(status_code=409, detail="The project of this audit is deleted; restore the project first")
+    
+    db_audit.deleted_at = None
+    record_entry_transitions(db, Finding.audit_id == audit_id, user_id=current_user.id)
+    log_activity(
+        db=db,
+        entity_type="audit",
+        entity_id=audit_id,
+        action="restored",
+        user_id=current_user.id,
+        details={"name": db_audit.name}
+    )
+    db.commit()
+    db.refresh(db_audit)
+    invalidate_analytics_cache(db_audit.project_id)
+    return db_audit
+
 @router.post("/{audit_id}/copy", response_model=AuditSchema, status_code=status.HTTP_201_CREATED)
 def copy_audit(
     audit_id: int,
     new_name: str,
+    include_comments: bool = Query(False, description="Also copy finding comments"),
+    include_evidence: bool = Query(False, description="Also copy evidence (files are shared, not duplicated)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -266,35 +402,30 @@ def copy_audit(
         details={"source_audit_id": audit_id, "source_name": source_audit.name}
     )
     
-    # Copy findings
-    findings_count = 0
-    for finding in source_audit.findings:
-        new_finding = Finding(
-            audit_id=new_audit.id,
-            title=finding.title,
-            description=finding.description,
-            control_reference=finding.control_reference,
-            severity=finding.severity,
-            status=finding.status,
-            recommendation=finding.recommendation,
-            assigned_to_user_id=finding.assigned_to_user_id,
-            due_date=finding.due_date
-        )
-        db.add(new_finding)
-        findings_count += 1
+    # Copy findings (and optionally comments / evidence references) in one statement
+    copied = copy_audit_contents(
+        db,
+        source_audit_id=audit_id,
+        target_audit_id=new_audit.id,
+        include_comments=include_comments,
+        include_evidence=include_evidence,
+        user_id=current_user.id
+    )
     
     # Log findings copy
-    if findings_count > 0:
+    if copied["findings"] > 0:
         log_activity(
             db=db,
             entity_type="audit",
             entity_id=new_audit.id,
             action="findings_copied",
             user_id=current_user.id,
-            details={"findings_count": findings_count}
+            details={"findings_count": copied["findings"], "comments_count": copied["comments"], "evidences_count": copied["evidences"]},
+            critical=False
         )
     
     db.commit()
+    invalidate_analytics_cache(new_audit.project_id)
     db.refresh(new_audit)
     return new_audit
 
@@ -1,11 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from datetime import timedelta
 from app.db.database import get_db
 from app.models.user import User
-from app.core.security import verify_password, create_access_token
-from app.core.config import settings
+from app.core.security import verify_password_async, get_password_hash_async, create_user_access_token
 from app.schemas.auth import Token, Login
 from app.core.dependencies import get_current_user
 
@@ -16,8 +15,9 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Database access runs in the threadpool and bcrypt on the hash pool; the loop never blocks
+    user = await run_in_threadpool(_get_user_by_email, db, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -26,11 +26,7 @@ async def login(
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email, "user_id": user.id, "role": user.role.value, "organization_id": user.organization_id},
-        expires_delta=access_token_expires
-    )
+    access_token = create_user_access_token(user)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me")
@@ -51,11 +47,20 @@ async def change_password(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    if not verify_password(current_password, current_user.hashed_password):
+    if not await verify_password_async(current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect current password")
     
-    from app.core.security import get_password_hash
-    current_user.hashed_password = get_password_hash(new_password)
+    hashed_password = await get_password_hash_async(new_password)
+    # The change revoked the current token; hand out one with the new version
+    access_token = await run_in_threadpool(_save_password, db, current_user, hashed_password)
+    return {"message": "Password updated successfully", "access_token": access_token, "token_type": "bearer"}
+
+def _get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+def _save_password(db: Session, user: User, hashed_password: str) -> str:
+    """Store the new hash and return a token for the bumped token version"""
+    user.hashed_password = hashed_password
     db.commit()
-    return {"message": "Password updated successfully"}
+    return create_user_access_token(user)
 
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 import os
 import uuid
 from app.db.database import get_db
+from app.db.read_routing import get_async_read_db
 from app.models.finding import Finding, Evidence, FindingComment
 from app.models.audit import Audit
 from app.models.user import User, UserRole
+from app.models.template import CLOSED_STATUSES
 from app.schemas.finding import (
     Finding as FindingSchema, 
     FindingCreate, 
@@ -17,21 +21,27 @@ from app.schemas.finding import (
     FindingComment as FindingCommentSchema,
     FindingCommentCreate
 )
-from app.core.dependencies import get_current_user
+from app.core.dependencies import (
+    get_current_user, get_current_user_async, get_accessible_project_ids_query, is_project_member, is_project_member_async
+)
 from app.core.config import settings
 from app.core.activity_logger import log_activity
 from app.core.notification_service import create_notification
 from app.models.notification import NotificationType
+from app.services.analytics_cache import invalidate_analytics_cache
+from app.services.finding_history import record_status_transition, record_entry_transitions
+from app.services.evidence_files import unreferenced_evidence_paths, remove_evidence_files
+from app.services.deletion import soft_delete_finding
 
 router = APIRouter()
 
-def check_audit_access(user: User, audit_id: int, db: Session):
-    audit = db.query(Audit).filter(Audit.id == audit_id).first()
+def check_audit_access(user: User, audit_id: int, db: Session, include_deleted: bool = False):
+    audit = db.query(Audit).filter(Audit.id == audit_id).execution_options(include_deleted=include_deleted).first()
     if not audit:
         raise HTTPException(status_code=404, detail="Audit not found")
     
     from app.models.project import Project
-    project = db.query(Project).filter(Project.id == audit.project_id).first()
+    project = db.query(Project).filter(Project.id == audit.project_id).execution_options(include_deleted=include_deleted).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -43,8 +53,32 @@ def check_audit_access(user: User, audit_id: int, db: Session):
         return audit
     else:
         # Auditor can only access assigned projects
-        project_ids = [pu.project_id for pu in user.project_assignments]
-        if audit.project_id not in project_ids:
+        if not is_project_member(db, user.id, audit.project_id):
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        return audit
+
+async def check_audit_access_async(user: User, audit_id: int, db: AsyncSession):
+    """check_audit_access for AsyncSession: audit and project organization in one round trip"""
+    from app.models.project import Project
+    row = (await db.execute(
+        select(Audit, Project.organization_id)
+        .outerjoin(Project, Project.id == Audit.project_id)
+        .where(Audit.id == audit_id)
+    )).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Audit not found")
+    audit, organization_id = row
+    if organization_id is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if user.role == UserRole.PLATFORM_ADMIN:
+        return audit
+    elif user.role == UserRole.ORG_ADMIN:
+        if organization_id != user.organization_id:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        return audit
+    else:
+        if not await is_project_member_async(db, user.id, audit.project_id):
             raise HTTPException(status_code=403, detail="Not enough permissions")
         return audit
 
@@ -54,7 +88,7 @@ def create_finding(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    check_audit_access(current_user, finding.audit_id, db)
+    audit = check_audit_access(current_user, finding.audit_id, db)
     
     finding_data = finding.dict()
     assigned_to_user_id = finding_data.pop('assigned_to_user_id', None)
@@ -64,6 +98,9 @@ def create_finding(
         db_finding.assigned_to_user_id = assigned_to_user_id
     db.add(db_finding)
     db.flush()
+    # Created already resolved / closed: remediation analytics only sees transitions
+    if db_finding.status in CLOSED_STATUSES:
+        record_status_transition(db, db_finding.id, None, db_finding.status, current_user.id)
     
     # Log activity
     log_activity(
@@ -88,6 +125,7 @@ def create_finding(
         )
     
     db.commit()
+    invalidate_analytics_cache(audit.project_id)
     
     # Refresh with relationships
     finding_id = db_finding.id
@@ -124,41 +162,36 @@ def create_finding(
     return FindingSchema(**finding_dict)
 
 @router.get("/", response_model=List[FindingSchema])
-def read_findings(
+async def read_findings(
     skip: int = 0,
     limit: int = 100,
     audit_id: int = None,
     assigned_to_user_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
 ):
-    query = db.query(Finding).options(
+    # Everything the response touches is eager loaded: lazy loads are not available on AsyncSession
+    query = select(Finding).options(
         joinedload(Finding.assigned_to),
         joinedload(Finding.comments).joinedload(FindingComment.user)
     )
     
     if audit_id:
-        check_audit_access(current_user, audit_id, db)
-        query = query.filter(Finding.audit_id == audit_id)
+        await check_audit_access_async(current_user, audit_id, db)
+        query = query.where(Finding.audit_id == audit_id)
     else:
         # Filter by accessible audits
-        from app.models.project import Project
-        if current_user.role == UserRole.PLATFORM_ADMIN:
-            pass  # See all
-        elif current_user.role == UserRole.ORG_ADMIN:
-            project_ids = [p.id for p in db.query(Project).filter(Project.organization_id == current_user.organization_id).all()]
-            audit_ids = [a.id for a in db.query(Audit).filter(Audit.project_id.in_(project_ids)).all()]
-            query = query.filter(Finding.audit_id.in_(audit_ids))
-        else:
-            project_ids = [pu.project_id for pu in current_user.project_assignments]
-            audit_ids = [a.id for a in db.query(Audit).filter(Audit.project_id.in_(project_ids)).all()]
-            query = query.filter(Finding.audit_id.in_(audit_ids))
+        accessible_project_ids = get_accessible_project_ids_query(current_user)
+        if accessible_project_ids is not None:
+            query = query.where(
+                Finding.audit_id.in_(select(Audit.id).where(Audit.project_id.in_(accessible_project_ids)))
+            )
     
     # Filter by assigned user if provided
     if assigned_to_user_id:
-        query = query.filter(Finding.assigned_to_user_id == assigned_to_user_id)
+        query = query.where(Finding.assigned_to_user_id == assigned_to_user_id)
     
-    findings = query.offset(skip).limit(limit).all()
+    findings = (await db.execute(query.offset(skip).limit(limit))).unique().scalars().all()
     
     # Format response with user info
     result = []
@@ -187,19 +220,21 @@ def read_findings(
     return result
 
 @router.get("/{finding_id}", response_model=FindingSchema)
-def read_finding(
+async def read_finding(
     finding_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
 ):
-    finding = db.query(Finding).options(
-        joinedload(Finding.assigned_to),
-        joinedload(Finding.comments).joinedload(FindingComment.user)
-    ).filter(Finding.id == finding_id).first()
+    finding = (await db.execute(
+        select(Finding).options(
+            joinedload(Finding.assigned_to),
+            joinedload(Finding.comments).joinedload(FindingComment.user)
+        ).where(Finding.id == finding_id)
+    )).unique().scalar_one_or_none()
     if not finding:
         raise HTTPException(status_code=404, detail="Finding not found")
     
-    check_audit_access(current_user, finding.audit_id, db)
+    await check_audit_access_async(current_user, finding.audit_id, db)
     
     # Format response with user info
     finding_dict = {
@@ -234,7 +269,7 @@ def update_finding(
     if not db_finding:
         raise HTTPException(status_code=404, detail="Finding not found")
     
-    check_audit_access(current_user, db_finding.audit_id, db)
+    audit = check_audit_access(current_user, db_finding.audit_id, db)
     
     update_data = finding.dict(exclude_unset=True)
     old_assigned_to = db_finding.assigned_to_user_id
@@ -247,6 +282,9 @@ def update_finding(
             changes[field] = {"old": str(old_value), "new": str(value)}
             setattr(db_finding, field, value)
     
+    if "status" in changes:
+        record_status_transition(db, db_finding.id, old_status, db_finding.status, current_user.id)
+    
     # Log activity
     if changes:
         log_activity(
@@ -287,6 +325,7 @@ def update_finding(
                 )
     
     db.commit()
+    invalidate_analytics_cache(audit.project_id)
     
     # Refresh with relationships
     finding_id = db_finding.id
@@ -325,24 +364,28 @@ def update_finding(
 @router.delete("/{finding_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_finding(
     finding_id: int,
+    permanent: bool = Query(False, description="Delete immediately instead of moving to trash (cannot be restored)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    db_finding = db.query(Finding).filter(Finding.id == finding_id).first()
+    """
+    Soft delete a finding (restorable for SOFT_DELETE_RETENTION_DAYS, purged afterwards).
+    permanent=true removes it with its evidence right away, also from the trash.
+    """
+    db_finding = (
+        db.query(Finding)
+        .filter(Finding.id == finding_id)
+        .execution_options(include_deleted=permanent)
+        .first()
+    )
     if not db_finding:
         raise HTTPException(status_code=404, detail="Finding not found")
     
-    check_audit_access(current_user, db_finding.audit_id, db)
+    audit = check_audit_access(current_user, db_finding.audit_id, db)
     
     finding_title = db_finding.title
     finding_id_val = db_finding.id
     
-    # Delete associated evidence files
-    for evidence in db_finding.evidences:
-        file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
-        if os.path.exists(file_path):
-            os.remove(file_path)
-    
     # Log activity before deletion
     log_activity(
         db=db,
@@ -350,13 +393,63 @@ def delete_finding(
         entity_id=finding_id_val,
         action="deleted",
         user_id=current_user.id,
-        details={"title": finding_title}
+        details={"title": finding_title, "permanent": permanent}
     )
     
+    if not permanent:
+        soft_delete_finding(db, finding_id_val)
+        db.commit()
+        invalidate_analytics_cache(audit.project_id)
+        return None
+    
+    evidence_paths = [evidence.file_path for evidence in db_finding.evidences]
     db.delete(db_finding)
+    db.flush()
+    
+    # Evidence files may be shared with copied audits; only remove unreferenced ones
+    orphaned_paths = unreferenced_evidence_paths(db, evidence_paths)
     db.commit()
+    remove_evidence_files(orphaned_paths)
+    invalidate_analytics_cache(audit.project_id)
     return None
 
+@router.post("/{finding_id}/restore", response_model=FindingSchema)
+def restore_finding(
+    finding_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Restore a soft-deleted finding; its audit must not be deleted"""
+    db_finding = (
+        db.query(Finding)
+        .filter(Finding.id == finding_id, Finding.deleted_at.isnot(None))
+        .execution_options(include_deleted=True)
+        .first()
+    )
+    if not db_finding:
+        raise HTTPException(status_code=404, detail="Deleted finding not found")
+    
+    # Access first (the audit may be deleted too), so the 409 reveals nothing to outsiders
+    audit = check_audit_access(current_user, db_finding.audit_id, db, include_deleted=True)
+    if audit.deleted_at is not None:
+        raise HTTPException(status_code=409, detail="The audit of this finding is deleted; restore the audit first")
+    
+    db_finding.deleted_at = None
+    db.flush()
+    record_entry_transitions(db, Finding.id == finding_id, user_id=current_user.id)
+    log_activity(
+        db=db,
+        entity_type="finding",
+        entity_id=finding_id,
+        action="restored",
+        user_id=current_user.id,
+        details={"title": db_finding.title}
+    )
+    db.commit()
+    db.refresh(db_finding)
+    invalidate_analytics_cache(audit.project_id)
+    return db_finding
+
 @router.post("/{finding_id}/evidences", response_model=EvidenceSchema, status_code=status.HTTP_201_CREATED)
 def upload_evidence(
     finding_id: int,
@@ -476,11 +569,6 @@ def delete_evidence(
     finding = db.query(Finding).filter(Finding.id == evidence.finding_id).first()
     check_audit_access(current_user, finding.audit_id, db)
     
-    # Delete file
-    file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
-    if os.path.exists(file_path):
-        os.remove(file_path)
-    
     # Log activity
     log_activity(
         db=db,
@@ -491,8 +579,14 @@ def delete_evidence(
         details={"finding_id": finding.id, "file_name": evidence.file_name}
     )
     
+    evidence_path = evidence.file_path
     db.delete(evidence)
+    db.flush()
+    
+    # Delete file (unless another copy of the evidence still uses it)
+    orphaned_paths = unreferenced_evidence_paths(db, [evidence_path])
     db.commit()
+    remove_evidence_files(orphaned_paths)
     return None
 
 # Comments endpoints
@@ -524,7 +618,8 @@ def create_comment(
         entity_id=finding_id,
         action="comment_added",
         user_id=current_user.id,
-        details={"comment_id": db_comment.id}
+        details={"comment_id": db_comment.id},
+        critical=False
     )
     
     # Create notification for assigned user if not the commenter
@@ -556,20 +651,22 @@ def create_comment(
     return FindingCommentSchema(**comment_dict)
 
 @router.get("/{finding_id}/comments", response_model=List[FindingCommentSchema])
-def get_comments(
+async def get_comments(
     finding_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async)
 ):
-    finding = db.query(Finding).filter(Finding.id == finding_id).first()
-    if not finding:
+    audit_id = await db.scalar(select(Finding.audit_id).where(Finding.id == finding_id))
+    if audit_id is None:
         raise HTTPException(status_code=404, detail="Finding not found")
     
-    check_audit_access(current_user, finding.audit_id, db)
+    await check_audit_access_async(current_user, audit_id, db)
     
-    comments = db.query(FindingComment).options(
-        joinedload(FindingComment.user)
-    ).filter(FindingComment.finding_id == finding_id).order_by(FindingComment.created_at).all()
+    comments = (await db.execute(
+        select(FindingComment).options(
+            joinedload(FindingComment.user)
+        ).where(FindingComment.finding_id == finding_id).order_by(FindingComment.created_at)
+    )).scalars().all()
     
     # Format response
     result = []
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.database import get_db
+from app.models.job import Job, JobStatus
+from app.schemas.job import Job as JobSchema
+from app.core.dependencies import get_current_user
+from app.models.user import User, UserRole
+
+router = APIRouter()
+
+@router.get("/", response_model=List[JobSchema])
+def get_jobs(
+    status: Optional[JobStatus] = Query(None, description="Filter by job status"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get background jobs started by the current user"""
+    query = db.query(Job).filter(Job.created_by_user_id == current_user.id)
+    if status is not None:
+        query = query.filter(Job.status == status)
+    return query.order_by(Job.created_at.desc()).limit(limit).all()
+
+@router.get("/{job_id}", response_model=JobSchema)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a background job with its progress"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if current_user.role != UserRole.PLATFORM_ADMIN and job.created_by_user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    return job
@@ -1,104 +1,104 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.notification import Notification, NotificationType
 from app.schemas.notification import Notification as NotificationSchema, NotificationUpdate
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user_async
 from app.core.notification_service import check_due_dates
 from app.models.user import User
 
 router = APIRouter()
 
+async def _get_own_notification(db: AsyncSession, notification_id: int, current_user: User) -> Notification:
+    notification = await db.get(Notification, notification_id)
+    if not notification:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    
+    if notification.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return notification
+
 @router.get("/", response_model=List[NotificationSchema])
-def get_notifications(
+async def get_notifications(
     read: Optional[bool] = Query(None, description="Filter by read status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get notifications for current user"""
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
+    query = select(Notification).where(Notification.user_id == current_user.id)
     
     if read is not None:
-        query = query.filter(Notification.read == read)
+        query = query.where(Notification.read == read)
     
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
-    return notifications
+    result = await db.execute(query.order_by(Notification.created_at.desc()).offset(skip).limit(limit))
+    return result.scalars().all()
 
 @router.get("/unread/count")
-def get_unread_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get count of unread notifications"""
-    count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.read == False
-    ).count()
+    count = await db.scalar(
+        select(func.count(Notification.id)).where(
+            Notification.user_id == current_user.id,
+            Notification.read == False
+        )
+    )
     return {"count": count}
 
 @router.put("/{notification_id}/read", response_model=NotificationSchema)
-def mark_as_read(
+async def mark_as_read(
     notification_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Mark a notification as read"""
-    notification = db.query(Notification).filter(Notification.id == notification_id).first()
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    
-    if notification.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
+    notification = await _get_own_notification(db, notification_id, current_user)
     notification.read = True
-    db.commit()
-    db.refresh(notification)
+    await db.commit()
     return notification
 
 @router.put("/read-all", response_model=dict)
-def mark_all_as_read(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def mark_all_as_read(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Mark all notifications as read for current user"""
-    updated = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.read == False
-    ).update({"read": True})
-    db.commit()
-    return {"updated": updated}
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.user_id == current_user.id, Notification.read == False)
+        .values(read=True)
+    )
+    await db.commit()
+    return {"updated": result.rowcount}
 
 @router.delete("/{notification_id}", status_code=204)
-def delete_notification(
+async def delete_notification(
     notification_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Delete a notification"""
-    notification = db.query(Notification).filter(Notification.id == notification_id).first()
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    
-    if notification.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    db.delete(notification)
-    db.commit()
+    notification = await _get_own_notification(db, notification_id, current_user)
+    await db.delete(notification)
+    await db.commit()
     return None
 
 @router.post("/check-due-dates")
-def trigger_due_date_check(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def trigger_due_date_check(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Manually trigger due date check (admin only)"""
     from app.models.user import UserRole
     if current_user.role != UserRole.PLATFORM_ADMIN:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    check_due_dates(db)
+    # The due date check is shared with the sync scheduler; run it on the session's sync side
+    await db.run_sync(check_due_dates)
     return {"message": "Due date check completed"}
-
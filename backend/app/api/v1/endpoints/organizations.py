@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
+from app.db.read_routing import get_read_db
 from app.models.organization import Organization
 from app.models.user import User, UserRole
 from app.schemas.organization import Organization as OrganizationSchema, OrganizationCreate, OrganizationUpdate
-from app.core.dependencies import get_current_user, require_platform_admin
+from app.core.dependencies import get_current_user, require_platform_admin, require_org_admin_or_platform_admin
+from app.core.i18n import get_language
+from app.services.findings_export import findings_export_response
+from app.services.analytics_cache import invalidate_analytics_cache
+from app.core.principals import invalidate_principals
+from app.services.deletion import delete_organization_cascade
+from app.services.evidence_files import remove_evidence_files
 
 router = APIRouter()
 
@@ -25,7 +32,7 @@ def create_organization(
 def read_organizations(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role == UserRole.PLATFORM_ADMIN:
@@ -40,7 +47,7 @@ def read_organizations(
 @router.get("/{organization_id}", response_model=OrganizationSchema)
 def read_organization(
     organization_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     org = db.query(Organization).filter(Organization.id == organization_id).first()
@@ -54,6 +61,28 @@ def read_organization(
     
     return org
 
+@router.get("/{organization_id}/findings.{export_format}")
+def export_organization_findings(
+    organization_id: int,
+    export_format: str,
+    lang: str = Query(None, description="Language code (tr/en)"),
+    request: Request = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_org_admin_or_platform_admin)
+):
+    """Export the findings of every project in an organization as CSV or XLSX"""
+    from app.models.project import Project
+    org = db.query(Organization).filter(Organization.id == organization_id).first()
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    if current_user.role != UserRole.PLATFORM_ADMIN and current_user.organization_id != organization_id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    return findings_export_response(
+        db, export_format, [Project.organization_id == organization_id], get_language(request, lang), f"organization_{organization_id}_findings"
+    )
+
 @router.put("/{organization_id}", response_model=OrganizationSchema)
 def update_organization(
     organization_id: int,
@@ -83,13 +112,21 @@ def update_organization(
 @router.delete("/{organization_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_organization(
     organization_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_platform_admin)
 ):
     db_org = db.query(Organization).filter(Organization.id == organization_id).first()
     if not db_org:
         raise HTTPException(status_code=404, detail="Organization not found")
-    db.delete(db_org)
+    
+    # Bulk DELETEs relying on ON DELETE CASCADE, nothing below the organization is loaded
+    orphaned_paths = delete_organization_cascade(db, organization_id)
     db.commit()
+    
+    background_tasks.add_task(remove_evidence_files, orphaned_paths)
+    invalidate_analytics_cache()
+    # Member users were removed by the cascade
+    invalidate_principals(organization_ids=[organization_id])
     return None
 
@@ -1,11 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, BackgroundTasks
 from sqlalchemy.orm import Session
+from sqlalchemy import select
 from typing import List
 from app.db.database import get_db
-from app.models.project import Project, ProjectUser
+from app.db.read_routing import get_read_db
+from app.models.project import Project
+from app.models.audit import Audit
+from app.models.finding import Finding
 from app.models.user import User, UserRole
 from app.schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate
-from app.core.dependencies import get_current_user, get_user_projects
+from app.core.dependencies import get_current_user, member_project_ids_query, is_project_member
+from app.core.i18n import get_language
+from app.services.findings_export import findings_export_response
+from app.services.analytics_cache import invalidate_analytics_cache
+from app.services.evidence_files import remove_evidence_files
+from app.services.deletion import delete_project_cascade, soft_delete_project, restore_project
+from app.services.finding_history import record_entry_transitions
+from app.services.jobs import create_job, run_job
+from app.services.project_copy import PROJECT_COPY_JOB, copy_project_assignments, run_project_copy
+from app.services.project_members import sync_project_members
+from app.schemas.job import Job as JobSchema
+from app.core.activity_logger import log_activity
 
 router = APIRouter()
 
@@ -32,16 +47,12 @@ def create_project(
     db.add(db_project)
     db.flush()
     
-    # Assign users
+    # Assign users (only users of the same organization)
     if project.user_ids:
-        for user_id in project.user_ids:
-            # Verify user belongs to same organization
-            user = db.query(User).filter(User.id == user_id).first()
-            if user and user.organization_id == project.organization_id:
-                project_user = ProjectUser(project_id=db_project.id, user_id=user_id)
-                db.add(project_user)
+        sync_project_members(db, db_project.id, project.organization_id, project.user_ids)
     
     db.commit()
+    invalidate_analytics_cache()  # project totals of unscoped entries
     db.refresh(db_project)
     return db_project
 
@@ -50,7 +61,7 @@ def read_projects(
     skip: int = 0,
     limit: int = 100,
     organization_id: int = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role == UserRole.PLATFORM_ADMIN:
@@ -63,7 +74,7 @@ def read_projects(
         projects = query.offset(skip).limit(limit).all()
     else:
         # Auditor sees only assigned projects
-        project_ids = [pu.project_id for pu in current_user.project_assignments]
+        project_ids = member_project_ids_query(current_user.id)
         projects = db.query(Project).filter(Project.id.in_(project_ids)).offset(skip).limit(limit).all()
     
     return projects
@@ -71,7 +82,7 @@ def read_projects(
 @router.get("/{project_id}", response_model=ProjectSchema)
 def read_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     project = db.query(Project).filter(Project.id == project_id).first()
@@ -86,12 +97,28 @@ def read_project(
             raise HTTPException(status_code=403, detail="Not enough permissions")
     else:
         # Auditor can only see assigned projects
-        project_ids = [pu.project_id for pu in current_user.project_assignments]
-        if project_id not in project_ids:
+        if not is_project_member(db, current_user.id, project_id):
             raise HTTPException(status_code=403, detail="Not enough permissions")
     
     return project
 
+@router.get("/{project_id}/findings.{export_format}")
+def export_project_findings(
+    project_id: int,
+    export_format: str,
+    lang: str = Query(None, description="Language code (tr/en)"),
+    request: Request = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Export the findings of every audit in a project as CSV or XLSX"""
+    from app.api.v1.endpoints.audits import check_project_access
+    check_project_access(current_user, project_id, db)
+    
+    return findings_export_response(
+        db, export_format, [Audit.project_id == project_id], get_language(request, lang), f"project_{project_id}_findings"
+    )
+
 @router.put("/{project_id}", response_model=ProjectSchema)
 def update_project(
     project_id: int,
@@ -118,93 +145,110 @@ def update_project(
     for field, value in update_data.items():
         setattr(db_project, field, value)
     
-    # Update user assignments
+    # Update user assignments: only the difference is written
+    membership_changes = None
     if user_ids is not None:
-        # Remove existing assignments
-        db.query(ProjectUser).filter(ProjectUser.project_id == project_id).delete()
-        # Add new assignments
-        for user_id in user_ids:
-            user = db.query(User).filter(User.id == user_id).first()
-            if user and user.organization_id == db_project.organization_id:
-                project_user = ProjectUser(project_id=project_id, user_id=user_id)
-                db.add(project_user)
+        membership_changes = sync_project_members(db, project_id, db_project.organization_id, user_ids)
     
     db.commit()
+    if membership_changes and (membership_changes["added"] or membership_changes["removed"]):
+        # Cached entries computed for the old member scopes
+        invalidate_analytics_cache(project_id)
     db.refresh(db_project)
     return db_project
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_project(
     project_id: int,
+    background_tasks: BackgroundTasks,
+    permanent: bool = Query(False, description="Delete immediately instead of moving to trash (cannot be restored)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    from app.models.audit import Audit
-    from app.models.finding import Finding, Evidence
-    from sqlalchemy.orm import joinedload
-    
-    db_project = db.query(Project).options(
-        joinedload(Project.audits).joinedload(Audit.findings).joinedload(Finding.evidences)
-    ).filter(Project.id == project_id).first()
+    """
+    Soft delete a project (restorable for SOFT_DELETE_RETENTION_DAYS, purged afterwards).
+    permanent=true removes it with everything below it right away, also from the trash.
+    """
+    db_project = (
+        db.query(Project)
+        .filter(Project.id == project_id)
+        .execution_options(include_deleted=permanent)
+        .first()
+    )
     
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Check permissions
-    if current_user.role == UserRole.PLATFORM_ADMIN:
-        pass
-    elif current_user.role == UserRole.ORG_ADMIN:
-        if db_project.organization_id != current_user.organization_id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-    else:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
+    _check_project_delete_permission(db_project, current_user)
+    
+    if not permanent:
+        # Flag only; findings stay in place until the purger removes them
+        soft_delete_project(db, project_id)
+        db.commit()
+        invalidate_analytics_cache(project_id)
+        return None
     
-    # Delete all related data manually to avoid foreign key constraint issues
-    # Delete evidences first (child of findings)
-    for audit in db_project.audits:
-        for finding in audit.findings:
-            # Delete evidence files from filesystem
-            import os
-            from app.core.config import settings
-            for evidence in finding.evidences:
-                file_path = os.path.join(settings.UPLOAD_DIR, evidence.file_path)
-                if os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                    except Exception as e:
-                        print(f"Warning: Could not delete evidence file {file_path}: {e}")
-                db.delete(evidence)
-    
-    # Delete findings (child of audits)
-    for audit in db_project.audits:
-        for finding in audit.findings:
-            db.delete(finding)
-    
-    # Delete audits (child of projects)
-    for audit in db_project.audits:
-        db.delete(audit)
-    
-    # Delete project user assignments
-    db.query(ProjectUser).filter(ProjectUser.project_id == project_id).delete()
-    
-    # Delete project_users association table entries
-    from sqlalchemy import delete
-    from app.models.project import project_user_association
-    stmt = delete(project_user_association).where(project_user_association.c.project_id == project_id)
-    db.execute(stmt)
-    
-    # Finally delete the project
-    db.delete(db_project)
+    # One DELETE; audits, findings, evidences and assignments follow via ON DELETE CASCADE
+    orphaned_paths = delete_project_cascade(db, project_id)
     db.commit()
+    
+    # Remove files only after the rows are gone for good
+    background_tasks.add_task(remove_evidence_files, orphaned_paths)
+    invalidate_analytics_cache(project_id)
     return None
 
-@router.post("/{project_id}/copy", response_model=ProjectSchema, status_code=status.HTTP_201_CREATED)
+@router.post("/{project_id}/restore", response_model=ProjectSchema)
+def restore_deleted_project(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Restore a soft-deleted project together with the audits deleted with it"""
+    db_project = (
+        db.query(Project)
+        .filter(Project.id == project_id, Project.deleted_at.isnot(None))
+        .execution_options(include_deleted=True)
+        .first()
+    )
+    if not db_project:
+        raise HTTPException(status_code=404, detail="Deleted project not found")
+    
+    _check_project_delete_permission(db_project, current_user)
+    
+    restore_project(db, db_project)
+    db.flush()
+    record_entry_transitions(
+        db, Finding.audit_id.in_(select(Audit.id).where(Audit.project_id == project_id, Audit.deleted_at.is_(None))),
+        user_id=current_user.id
+    )
+    db.commit()
+    db.refresh(db_project)
+    invalidate_analytics_cache(project_id)
+    return db_project
+
+def _check_project_delete_permission(db_project: Project, current_user: User):
+    if current_user.role == UserRole.PLATFORM_ADMIN:
+        return
+    if current_user.role == UserRole.ORG_ADMIN and db_project.organization_id == current_user.organization_id:
+        return
+    raise HTTPException(status_code=403, detail="Not enough permissions")
+
+@router.post("/{project_id}/copy", response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
 def copy_project(
     project_id: int,
     new_name: str,
+    background_tasks: BackgroundTasks,
+    include_comments: bool = Query(False, description="Also copy finding comments"),
+    include_evidence: bool = Query(False, description="Also copy evidence (files are shared, not duplicated)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    """
+    Deep copy a project: the project and its user assignments are created immediately,
+    audits, findings (and optionally comments / evidence) are cloned by a background job.
+    Poll GET /jobs/{id} for progress; the job result holds the new project id.
+    """
     source_project = db.query(Project).filter(Project.id == project_id).first()
     if not source_project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -227,10 +271,26 @@ def copy_project(
     db.add(new_project)
     db.flush()
     
-    # Copy audits (without findings for now, can be extended)
-    # This is a simplified copy - you might want to copy audits and findings too
+    copy_project_assignments(db, source_project.id, new_project.id)
     
+    log_activity(
+        db=db,
+        entity_type="project",
+        entity_id=new_project.id,
+        action="copied",
+        user_id=current_user.id,
+        details={"source_project_id": project_id, "source_name": source_project.name}
+    )
+    
+    job = create_job(db, PROJECT_COPY_JOB, user_id=current_user.id, parameters={
+        "source_project_id": project_id,
+        "target_project_id": new_project.id,
+        "include_comments": include_comments,
+        "include_evidence": include_evidence,
+    })
     db.commit()
-    db.refresh(new_project)
-    return new_project
-
+    invalidate_analytics_cache()
+    db.refresh(job)
+    
+    background_tasks.add_task(run_job, job.id, run_project_copy)
+    return job
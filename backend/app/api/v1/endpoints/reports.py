@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from typing import Optional
+from app.db.read_routing import get_read_db
 from app.models.audit import Audit
-from app.models.user import User
-from app.core.dependencies import get_current_user
-from app.services.word_generator import generate_audit_word_report
+from app.models.organization import Organization
+from app.models.user import User, UserRole
+from app.core.dependencies import get_current_user, require_org_admin_or_platform_admin
+from app.services.word_generator import generate_audit_word_report, generate_consolidated_word_report
 from datetime import datetime
 import os
 import tempfile
@@ -15,7 +18,7 @@ router = APIRouter()
 @router.get("/audit/{audit_id}/word")
 def generate_word_report(
     audit_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Generate Word (.docx) report for an audit with cover page"""
@@ -47,3 +50,52 @@ def generate_word_report(
         filename=f"denetim_raporu_{audit_id}_{datetime.now().strftime('%Y%m%d')}.docx"
     )
 
+@router.get("/project/{project_id}/word")
+def generate_project_word_report(
+    project_id: int,
+    start_date: Optional[datetime] = Query(None, description="Only include audits on or after this date"),
+    end_date: Optional[datetime] = Query(None, description="Only include audits on or before this date"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Generate one consolidated Word (.docx) report for every audit of a project"""
+    from app.api.v1.endpoints.audits import check_project_access
+    project = check_project_access(current_user, project_id, db)
+    
+    word_path = generate_consolidated_word_report(
+        db, project.organization, project=project, start_date=start_date, end_date=end_date
+    )
+    
+    return FileResponse(
+        word_path,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        filename=f"proje_raporu_{project_id}_{datetime.now().strftime('%Y%m%d')}.docx",
+        background=BackgroundTask(os.remove, word_path)
+    )
+
+@router.get("/organization/{organization_id}/word")
+def generate_organization_word_report(
+    organization_id: int,
+    start_date: Optional[datetime] = Query(None, description="Only include audits on or after this date"),
+    end_date: Optional[datetime] = Query(None, description="Only include audits on or before this date"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_org_admin_or_platform_admin)
+):
+    """Generate one consolidated Word (.docx) report for every audit of an organization"""
+    organization = db.query(Organization).filter(Organization.id == organization_id).first()
+    if not organization:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    if current_user.role != UserRole.PLATFORM_ADMIN and current_user.organization_id != organization_id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    word_path = generate_consolidated_word_report(
+        db, organization, start_date=start_date, end_date=end_date
+    )
+    
+    return FileResponse(
+        word_path,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        filename=f"organizasyon_raporu_{organization_id}_{datetime.now().strftime('%Y%m%d')}.docx",
+        background=BackgroundTask(os.remove, word_path)
+    )
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import List, Dict, Any
 from app.db.database import get_db
+from app.db.read_routing import get_read_db
 from app.models.template import Template, TemplateItem
 from app.models.organization import Organization
 from app.models.user import User, UserRole
@@ -132,7 +133,7 @@ def read_templates(
     organization_id: int = None,
     lang: str = Query(None, description="Language code (tr/en)"),
     request: Request = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     # Get language
@@ -178,7 +179,7 @@ def read_template(
     template_id: int,
     lang: str = Query(None, description="Language code (tr/en)"),
     request: Request = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     # Get language
@@ -2,10 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.database import get_db
+from app.db.read_routing import get_read_db
 from app.models.user import User, UserRole
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate, UserPasswordUpdate
 from app.core.dependencies import get_current_user, require_org_admin_or_platform_admin
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_password, create_user_access_token
 
 router = APIRouter()
 
@@ -48,7 +49,7 @@ def read_users(
     skip: int = 0,
     limit: int = 100,
     organization_id: int = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     query = db.query(User)
@@ -68,7 +69,7 @@ def read_users(
 @router.get("/{user_id}", response_model=UserSchema)
 def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     db_user = db.query(User).filter(User.id == user_id).first()
@@ -170,5 +171,10 @@ def change_password(
     current_user.hashed_password = get_password_hash(password_data.new_password)
     db.commit()
     
-    return {"message": "Password changed successfully"}
+    # The change revoked the current token; hand out one with the new version
+    return {
+        "message": "Password changed successfully",
+        "access_token": create_user_access_token(current_user),
+        "token_type": "bearer"
+    }
 
@@ -1,7 +1,126 @@
+"""
+Activity log writer
+log_activity() only collects the event on the session; everything collected in a transaction is
+written with one multi-row INSERT right before it commits, and dropped when it rolls back.
+Non-critical events can instead go to a per-worker background writer after the commit
+(ACTIVITY_LOG_ASYNC), which batches them across requests through a bounded queue and is
+drained on shutdown. Those events are lost if the worker is killed before they are written.
+"""
+from sqlalchemy import event, insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import logging
+import os
+import queue
+import threading
+import time
+from app.core.config import settings
+from app.db.database import engine
 from app.models.activity import ActivityLog
-from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# session.info key of the events collected in the current transaction
+PENDING_KEY = "pending_activity"
+# Rows per INSERT statement (bounds the number of bind parameters)
+INSERT_CHUNK_SIZE = 1000
+
+def _insert_rows(connection, rows: List[dict]):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        connection.execute(insert(ActivityLog).values(rows[start:start + INSERT_CHUNK_SIZE]))
+
+class ActivityLogWriter:
+    """Background thread writing queued activity rows in batches, on its own connections"""
+
+    def __init__(self, queue_size: int, batch_size: int, flush_interval_seconds: float):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _ensure_started(self):
+        # Started lazily so every worker process (forked after import) gets its own thread
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, rows: List[dict]):
+        """Queue rows for writing; rows that don't fit in the queue are dropped and counted"""
+        self._ensure_started()
+        dropped = 0
+        for row in rows:
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                dropped += 1
+        if dropped:
+            with self._lock:
+                self.dropped += dropped
+            logger.warning(f"Activity log queue is full, dropped {dropped} event(s)")
+
+    def _write(self, batch: List[dict]):
+        try:
+            with engine.begin() as connection:
+                _insert_rows(connection, batch)
+            with self._lock:
+                self.written += len(batch)
+        except SQLAlchemyError as e:
+            with self._lock:
+                self.failed += len(batch)
+            logger.error(f"Writing {len(batch)} activity log events failed: {e}")
+
+    def _run(self):
+        # A batch is written when it is full or flush_interval_seconds after its first event
+        batch: List[dict] = []
+        deadline: Optional[float] = None
+        while True:
+            timeout = self.flush_interval_seconds if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                row = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                if batch:
+                    self._write(batch)
+                batch, deadline = [], None
+                continue
+            if row is None:
+                if batch:
+                    self._write(batch)
+                return
+            batch.append(row)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval_seconds
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch, deadline = [], None
+
+    def stop(self, timeout: float = 10):
+        """Write everything queued so far and stop the thread (application shutdown)"""
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Activity log queue is still full at shutdown; queued events may be lost")
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"queued": self._queue.qsize(), "written": self.written, "dropped": self.dropped, "failed": self.failed}
+
+activity_writer = ActivityLogWriter(
+    settings.ACTIVITY_LOG_QUEUE_SIZE, settings.ACTIVITY_LOG_BATCH_SIZE, settings.ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS
+)
 
 def log_activity(
     db: Session,
@@ -9,21 +128,60 @@ def log_activity(
     entity_id: int,
     action: str,
     user_id: Optional[int] = None,
-    details: Optional[Dict[str, Any]] = None
+    details: Optional[Dict[str, Any]] = None,
+    critical: bool = True
 ):
-    """Log an activity to the activity log table"""
-    activity_log = ActivityLog(
-        entity_type=entity_type,
-        entity_id=entity_id,
-        action=action,
-        user_id=user_id,
-        details=details or {}
-    )
-    db.add(activity_log)
-    db.flush()  # Don't commit, let the caller commit
-    return activity_log
-
+    """
+    Log an activity; written when the caller commits, discarded when it rolls back.
+    Non-critical events may be written shortly after the commit by the background writer.
+    """
+    db.info.setdefault(PENDING_KEY, []).append((critical, {
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "action": action,
+        "user_id": user_id,
+        "details": details or {},
+    }))
 
+def render_activity_metrics() -> str:
+    """Background writer counters of this worker, in the Prometheus text format (empty when off)"""
+    if not settings.ACTIVITY_LOG_ASYNC:
+        return ""
+    labels = f'{{pid="{os.getpid()}"}}'
+    stats = activity_writer.stats()
+    lines = [
+        "# HELP archrampart_activity_log_queued Activity log events waiting for the background writer",
+        "# TYPE archrampart_activity_log_queued gauge",
+        f"archrampart_activity_log_queued{labels} {stats['queued']}",
+    ]
+    for key, help_text in [
+        ("written", "Activity log events written by the background writer"),
+        ("dropped", "Activity log events dropped because the queue was full"),
+        ("failed", "Activity log events lost to failed batch inserts"),
+    ]:
+        metric = f"archrampart_activity_log_{key}_total"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter", f"{metric}{labels} {stats[key]}"]
+    return "\n".join(lines) + "\n"
 
+@event.listens_for(Session, "before_commit")
+def _write_pending_activity(session):
+    pending = session.info.get(PENDING_KEY)
+    if not pending:
+        return
+    deferred = settings.ACTIVITY_LOG_ASYNC
+    rows = [row for critical, row in pending if critical or not deferred]
+    if rows:
+        _insert_rows(session, rows)
+    session.info[PENDING_KEY] = [(critical, row) for critical, row in pending if deferred and not critical]
 
+@event.listens_for(Session, "after_commit")
+def _submit_deferred_activity(session):
+    deferred = session.info.pop(PENDING_KEY, None)
+    if deferred:
+        activity_writer.submit([row for _, row in deferred])
 
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_activity(session, transaction):
+    # Outermost transaction rolled back or closed without a commit
+    if transaction.parent is None:
+        session.info.pop(PENDING_KEY, None)
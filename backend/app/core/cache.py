@@ -0,0 +1,218 @@
+"""
+In-process TTL response cache
+Each worker process keeps its own cache; entries are tagged (e.g. by project) so writes can
+invalidate exactly the entries that depend on them. The TTL bounds staleness across workers.
+"""
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+import asyncio
+import threading
+import time
+
+# Tag carried by entries that depend on every project (platform admin scope)
+ALL_PROJECTS_TAG = "*"
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry, tag based invalidation and hit/miss counters"""
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, frozenset]]" = OrderedDict()
+        self._tag_index: Dict[Hashable, set] = {}
+        # Bumped on every invalidation of a tag (per tag) and on clear() (generation); a value
+        # computed while its tags were invalidated is returned to the caller but not stored.
+        # Epochs are only kept for tags of computations in flight (_tag_refs counts them).
+        self._generation = 0
+        self._tag_epochs: Dict[Hashable, int] = {}
+        self._tag_refs: Dict[Hashable, int] = {}
+        # key -> [lock, number of threads using it]; removed by the last one out
+        self._key_locks: Dict[Hashable, list] = {}
+        # Pending async computations (only touched from the event loop thread)
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value); must be called with self._lock held"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value, tags = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _store(self, key: Hashable, value: Any, tags: frozenset):
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _begin_compute(self, tags: frozenset) -> Tuple[int, Dict[Hashable, int]]:
+        """Snapshot the generation and tag epochs before a computation; must be called with self._lock held"""
+        self.misses += 1
+        for tag in tags:
+            self._tag_refs[tag] = self._tag_refs.get(tag, 0) + 1
+        return self._generation, {tag: self._tag_epochs.get(tag, 0) for tag in tags}
+
+    def _end_compute(self, key: Hashable, tags: frozenset, snapshot: Tuple[int, Dict[Hashable, int]], value: Any = None, store: bool = False):
+        """Store value unless it was invalidated meanwhile and release the snapshot; must be called with self._lock held"""
+        generation, epochs = snapshot
+        if store and generation == self._generation and all(self._tag_epochs.get(tag, 0) == epoch for tag, epoch in epochs.items()):
+            self._store(key, value, tags)
+        for tag in tags:
+            refs = self._tag_refs[tag] - 1
+            if refs:
+                self._tag_refs[tag] = refs
+            else:
+                # Nobody holds a snapshot of this tag anymore
+                del self._tag_refs[tag]
+                self._tag_epochs.pop(tag, None)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], tags: Iterable[Hashable] = ()) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+        Concurrent misses on the same key wait for a single computation.
+        """
+        if not self.enabled:
+            return compute()
+
+        tags = frozenset(tags)
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            # The lock stays registered while any thread uses it, so late callers wait on the
+            # same lock as the one computing
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+
+        try:
+            with key_lock[0]:
+                with self._lock:
+                    # Another thread may have filled the entry while we waited
+                    found, value = self._lookup(key)
+                    if found:
+                        self.hits += 1
+                        return value
+                    snapshot = self._begin_compute(tags)
+                try:
+                    value = compute()
+                except BaseException:
+                    with self._lock:
+                        self._end_compute(key, tags, snapshot)
+                    raise
+                with self._lock:
+                    self._end_compute(key, tags, snapshot, value, store=True)
+                return value
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if not key_lock[1]:
+                    del self._key_locks[key]
+
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]], tags: Iterable[Hashable] = ()) -> Any:
+        """
+        get_or_compute for async callers: compute is awaited and concurrent misses on the same
+        key in this event loop await a single computation instead of blocking on a lock.
+        """
+        if not self.enabled:
+            return await compute()
+
+        tags = frozenset(tags)
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        with self._lock:
+            snapshot = self._begin_compute(tags)
+        try:
+            value = await compute()
+            with self._lock:
+                self._end_compute(key, tags, snapshot, value, store=True)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            with self._lock:
+                self._end_compute(key, tags, snapshot)
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; don't log it as never retrieved
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate_tags(self, tags: Iterable[Hashable]) -> int:
+        """Drop every entry carrying one of the tags; returns the number of entries removed"""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                if tag in self._tag_refs:
+                    self._tag_epochs[tag] = self._tag_epochs.get(tag, 0) + 1
+                for key in list(self._tag_index.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            # Computations in flight, whatever their tags, must not store their (older) values
+            self._generation += 1
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+def project_scope_tags(project_ids: Optional[Iterable[int]]) -> frozenset:
+    """Invalidation tags for a value computed over the given projects (None = all projects)"""
+    if project_ids is None:
+        return frozenset([ALL_PROJECTS_TAG])
+    return frozenset(("project", project_id) for project_id in project_ids)
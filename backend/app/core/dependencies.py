@@ -1,31 +1,51 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db
 from app.models.user import User, UserRole
 from app.core.security import decode_access_token
+from app.core.principals import load_principal, load_principal_async
 from app.schemas.auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-async def get_current_user(
+# Plain def: FastAPI runs it in the threadpool, so the (rare) principal lookup does not block the loop
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
-    credentials_exception = HTTPException(
+    payload = _decode_principal_claims(token)
+    # Tokens issued before versioning have no "ver" claim and match version 0
+    user = load_principal(db, payload["user_id"], payload.get("ver", 0), payload.get("organization_id"))
+    return _check_principal(user)
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_current_user for async endpoints; the user is attached to the request's AsyncSession"""
+    payload = _decode_principal_claims(token)
+    user = await load_principal_async(db, payload["user_id"], payload.get("ver", 0), payload.get("organization_id"))
+    return _check_principal(user)
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _decode_principal_claims(token: str) -> dict:
     payload = decode_access_token(token)
-    if payload is None:
-        raise credentials_exception
-    email: str = payload.get("sub")
-    if email is None:
-        raise credentials_exception
-    user = db.query(User).filter(User.email == email).first()
+    if payload is None or payload.get("user_id") is None:
+        raise _credentials_exception()
+    return payload
+
+def _check_principal(user) -> User:
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
@@ -70,3 +90,55 @@ def get_user_projects(user: User, db: Session):
         # Auditor sees only assigned projects
         return user.project_assignments
 
+def get_accessible_project_ids_query(user: User):
+    """
+    Select of project IDs accessible by user based on role, usable as an IN subquery.
+    Returns None when access is unrestricted (platform admin).
+    """
+    from app.models.project import Project, ProjectUser
+    if user.role == UserRole.PLATFORM_ADMIN:
+        return None
+    elif user.role == UserRole.ORG_ADMIN:
+        return select(Project.id).where(Project.organization_id == user.organization_id, Project.deleted_at.is_(None))
+    else:
+        return (
+            member_project_ids_query(user.id)
+            .join(Project, Project.id == ProjectUser.project_id)
+            .where(Project.deleted_at.is_(None))
+        )
+
+def member_project_ids_query(user_id: int):
+    """Select of the projects a user is assigned to (reverse index on project_user_assignments.user_id)"""
+    from app.models.project import ProjectUser
+    return select(ProjectUser.project_id).where(ProjectUser.user_id == user_id)
+
+def is_project_member(db: Session, user_id: int, project_id: int) -> bool:
+    """Primary key lookup on project_user_assignments"""
+    from app.models.project import ProjectUser
+    return db.execute(
+        select(ProjectUser.project_id).where(ProjectUser.project_id == project_id, ProjectUser.user_id == user_id)
+    ).first() is not None
+
+async def is_project_member_async(db: AsyncSession, user_id: int, project_id: int) -> bool:
+    from app.models.project import ProjectUser
+    result = await db.execute(
+        select(ProjectUser.project_id).where(ProjectUser.project_id == project_id, ProjectUser.user_id == user_id)
+    )
+    return result.first() is not None
+
+def get_accessible_project_ids(user: User, db: Session):
+    """
+    Resolved set of project IDs accessible by user (e.g. for cache keys).
+    Returns None when access is unrestricted (platform admin).
+    """
+    accessible_project_ids = get_accessible_project_ids_query(user)
+    if accessible_project_ids is None:
+        return None
+    return frozenset(db.execute(accessible_project_ids).scalars().all())
+
+async def get_accessible_project_ids_async(user: User, db: AsyncSession):
+    """get_accessible_project_ids for AsyncSession"""
+    accessible_project_ids = get_accessible_project_ids_query(user)
+    if accessible_project_ids is None:
+        return None
+    return frozenset((await db.execute(accessible_project_ids)).scalars().all())
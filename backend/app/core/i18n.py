@@ -1,4 +1,5 @@
 from fastapi import Request, Query
+from sqlalchemy import func
 from app.core.config import settings
 
 def get_language(request: Request = None, lang: str = Query(None)) -> str:
@@ -45,3 +46,34 @@ def get_template_field(obj, field_name: str, lang: str = "tr") -> str:
     value = getattr(obj, field_name, None)
     return str(value).strip() if value and str(value).strip() else ""
 
+def template_field_expression(model, field_name: str, lang: str = "tr"):
+    """
+    SQL counterpart of get_template_field for set-based queries:
+    COALESCE(NULLIF(trim(<field>_en), ''), NULLIF(trim(<field>), ''), '')
+    """
+    candidates = []
+    if lang == "en" and hasattr(model, f"{field_name}_en"):
+        candidates.append(func.nullif(func.trim(getattr(model, f"{field_name}_en")), ""))
+    candidates.append(func.nullif(func.trim(getattr(model, field_name)), ""))
+    return func.coalesce(*candidates, "")
+
+
+SEVERITY_LABELS = {
+    "tr": {"critical": "Kritik", "high": "Yüksek", "medium": "Orta", "low": "Düşük", "info": "Bilgi"},
+    "en": {"critical": "Critical", "high": "High", "medium": "Medium", "low": "Low", "info": "Info"},
+}
+
+STATUS_LABELS = {
+    "tr": {"open": "Açık", "in_progress": "Devam Ediyor", "resolved": "Çözüldü", "closed": "Kapatıldı"},
+    "en": {"open": "Open", "in_progress": "In Progress", "resolved": "Resolved", "closed": "Closed"},
+}
+
+def get_severity_label(severity, lang: str = "tr") -> str:
+    """Get localized label for a finding severity."""
+    labels = SEVERITY_LABELS.get(lang, SEVERITY_LABELS["tr"])
+    return labels.get(severity.value, severity.value.upper())
+
+def get_status_label(status, lang: str = "tr") -> str:
+    """Get localized label for a finding status."""
+    labels = STATUS_LABELS.get(lang, STATUS_LABELS["tr"])
+    return labels.get(status.value, status.value.upper())
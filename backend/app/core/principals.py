@@ -0,0 +1,92 @@
+"""
+Principal cache
+get_current_user resolves a token to its User without a database round trip on most requests:
+the user's columns are cached per worker, keyed by user ID and the token's version claim, and
+attached to the request session without a SELECT. Changing a user's role, organization, active
+flag or password bumps User.token_version, which revokes tokens issued before the change and
+drops the cached entry in this worker; other workers drop it when the TTL expires.
+"""
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, attributes, make_transient_to_detached
+from typing import Iterable, Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+# Changes to these columns revoke the user's existing tokens
+PRINCIPAL_SECURITY_FIELDS = ("role", "organization_id", "is_active", "hashed_password")
+
+principal_cache = TTLCache(
+    "principals",
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+)
+
+def load_principal(db: Session, user_id: int, token_version: int, organization_id: Optional[int] = None) -> Optional[User]:
+    """
+    User for a token (None if the user is gone or the token version was revoked),
+    attached to db so lazy loads and updates work as for a queried instance.
+    organization_id is the token's claim; it tags the entry for organization-wide invalidation.
+    """
+    def load_snapshot():
+        user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+        if user is None or user.token_version != token_version:
+            return None
+        return {column.key: getattr(user, column.key) for column in inspect(User).column_attrs}
+
+    snapshot = principal_cache.get_or_compute(
+        (user_id, token_version), load_snapshot, [("user", user_id), ("organization", organization_id)]
+    )
+    if snapshot is None:
+        return None
+
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+async def load_principal_async(db: AsyncSession, user_id: int, token_version: int, organization_id: Optional[int] = None) -> Optional[User]:
+    """load_principal for AsyncSession; shares the same cache entries"""
+    async def load_snapshot():
+        user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+        if user is None or user.token_version != token_version:
+            return None
+        return {column.key: getattr(user, column.key) for column in inspect(User).column_attrs}
+
+    snapshot = await principal_cache.get_or_compute_async(
+        (user_id, token_version), load_snapshot, [("user", user_id), ("organization", organization_id)]
+    )
+    if snapshot is None:
+        return None
+
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+def invalidate_principals(user_ids: Iterable[int] = (), organization_ids: Iterable[int] = ()) -> int:
+    tags = [("user", user_id) for user_id in user_ids]
+    tags += [("organization", organization_id) for organization_id in organization_ids]
+    return principal_cache.invalidate_tags(tags)
+
+@event.listens_for(Session, "before_flush")
+def _revoke_tokens_on_security_change(session, flush_context, instances):
+    revoked = session.info.setdefault("revoked_principals", set())
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        if any(attributes.get_history(obj, field).has_changes() for field in PRINCIPAL_SECURITY_FIELDS):
+            obj.token_version = (obj.token_version or 0) + 1
+            revoked.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            revoked.add(obj.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_revoked_principals(session):
+    revoked = session.info.pop("revoked_principals", None)
+    if revoked:
+        invalidate_principals(user_ids=revoked)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_revoked_principals(session):
+    session.info.pop("revoked_principals", None)
@@ -1,11 +1,105 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.core.config import settings
+from app.db.pool_metrics import instrumented_pool_class, register_engine
 
-engine = create_engine(settings.DATABASE_URL)
+def _server_settings() -> dict:
+    """Per-connection server limits (not sent through PgBouncer, see DB_PGBOUNCER_MODE)"""
+    if settings.DB_PGBOUNCER_MODE:
+        return {}
+    server_settings = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS:
+        server_settings["idle_in_transaction_session_timeout"] = str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS)
+    return server_settings
+
+def disable_query_timeouts(db: Session):
+    """
+    Lift the statement and idle-in-transaction timeouts for the rest of the current transaction.
+    For the few deliberately long paths (streamed exports, consolidated reports, copy jobs);
+    SET LOCAL ends with the transaction, so call it again after a commit.
+    """
+    db.execute(text("SET LOCAL statement_timeout = 0"))
+    db.execute(text("SET LOCAL idle_in_transaction_session_timeout = 0"))
+
+def _pool_options(pool_class, name: str) -> dict:
+    if settings.DB_PGBOUNCER_MODE:
+        # PgBouncer does the pooling; a second pool here would just pin its server connections
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": instrumented_pool_class(pool_class, name),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def _psycopg2_connect_args() -> dict:
+    options = " ".join(f"-c {name}={value}" for name, value in _server_settings().items())
+    return {"options": options} if options else {}
+
+def _asyncpg_connect_args() -> dict:
+    connect_args = {"server_settings": _server_settings()}
+    if settings.DB_PGBOUNCER_MODE:
+        # Prepared statements do not survive transaction pooling
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+    return connect_args
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    connect_args=_psycopg2_connect_args(),
+    **_pool_options(QueuePool, "sync"),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def async_database_url(database_url: str) -> str:
+    """The same database through the asyncpg driver"""
+    return make_url(database_url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+# Async stack for endpoints moved off the threadpool (an awaiting request holds no thread).
+# Sync code (scripts, background jobs, handlers not yet migrated) keeps using SessionLocal.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+    connect_args=_asyncpg_connect_args(),
+    **_pool_options(AsyncAdaptedQueuePool, "async"),
+)
+# No expiry on commit: attribute access after commit would need implicit IO, which async sessions forbid
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+register_engine("sync", engine)
+register_engine("async", async_engine.sync_engine)
+
+# Read replica (see app/db/read_routing.py); None when DATABASE_READ_URL is not set.
+# Sessions are flagged read-only so a handler routed to the replica cannot write by mistake.
+read_engine = None
+ReadSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+if settings.DATABASE_READ_URL:
+    read_engine = create_engine(
+        settings.DATABASE_READ_URL,
+        connect_args={**_psycopg2_connect_args(), "connect_timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS},
+        **_pool_options(QueuePool, "sync_read"),
+    )
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine, info={"read_only": True})
+    async_read_engine = create_async_engine(
+        settings.ASYNC_DATABASE_READ_URL or async_database_url(settings.DATABASE_READ_URL),
+        connect_args={**_asyncpg_connect_args(), "timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS},
+        **_pool_options(AsyncAdaptedQueuePool, "async_read"),
+    )
+    AsyncReadSessionLocal = async_sessionmaker(
+        async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False, info={"read_only": True}
+    )
+    register_engine("sync_read", read_engine)
+    register_engine("async_read", async_read_engine.sync_engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -15,3 +109,6 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
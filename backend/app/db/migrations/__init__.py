@@ -0,0 +1,118 @@
+"""
+Versioned schema migrations
+Each module in app/db/migrations/versions is one migration, applied once in version order and
+recorded in schema_migrations. Module names are v<NNNN>_<name>.py and define upgrade(conn):
+- transactional migrations (the default) run in one transaction together with their
+  schema_migrations row, so they either apply completely or not at all;
+- migrations with TRANSACTIONAL = False get an autocommit connection, for statements that cannot
+  run in a transaction block (CREATE INDEX CONCURRENTLY). They must be safe to re-run, since a
+  failure can leave them half applied.
+A session-level advisory lock serialises concurrent runners; the runner is started once before the
+API workers (scripts/docker_init.py, scripts/migrate.py), which do no DDL themselves.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from typing import List, Optional
+import importlib
+import pkgutil
+import time
+
+# pg_advisory_lock key shared by every migration runner
+MIGRATION_LOCK_KEY = 4702310547
+
+SCHEMA_MIGRATIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR NOT NULL,
+        applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+        duration_ms INTEGER NOT NULL
+    )
+"""
+
+class Migration:
+    def __init__(self, version: int, name: str, module):
+        self.version = version
+        self.name = name
+        self.module = module
+        self.transactional = getattr(module, "TRANSACTIONAL", True)
+        self.description = (module.__doc__ or "").strip().splitlines()[0] if module.__doc__ else ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.version:04d}_{self.name}"
+
+def load_migrations() -> List[Migration]:
+    """Every migration module, in version order"""
+    from app.db.migrations import versions
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        if not module_info.name.startswith("v"):
+            continue
+        version, _, name = module_info.name[1:].partition("_")
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(int(version), name, module))
+    migrations.sort(key=lambda migration: migration.version)
+    versions_seen = [migration.version for migration in migrations]
+    if len(versions_seen) != len(set(versions_seen)):
+        raise RuntimeError(f"Duplicate migration versions: {versions_seen}")
+    return migrations
+
+def applied_versions(conn) -> set:
+    return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars().all())
+
+def _apply(engine: Engine, migration: Migration):
+    started = time.perf_counter()
+    record = text("INSERT INTO schema_migrations (version, name, duration_ms) VALUES (:version, :name, :duration_ms)")
+    if migration.transactional:
+        with engine.begin() as conn:
+            migration.module.upgrade(conn)
+            conn.execute(record, {
+                "version": migration.version, "name": migration.name,
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+            })
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        migration.module.upgrade(conn)
+        conn.execute(record, {
+            "version": migration.version, "name": migration.name,
+            "duration_ms": int((time.perf_counter() - started) * 1000),
+        })
+
+def run_migrations(engine: Engine, target_version: Optional[int] = None) -> List[str]:
+    """Apply pending migrations up to target_version (default: all); returns the applied labels"""
+    applied = []
+    # Autocommit: the lock connection must not sit in an open transaction, which
+    # CREATE INDEX CONCURRENTLY in a later migration would wait for
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            lock_conn.execute(text(SCHEMA_MIGRATIONS_TABLE_SQL))
+            # Read after taking the lock: another runner may have applied migrations meanwhile
+            done = applied_versions(lock_conn)
+            for migration in load_migrations():
+                if migration.version in done or (target_version is not None and migration.version > target_version):
+                    continue
+                print(f"🔄 {migration.label}: {migration.description}")
+                _apply(engine, migration)
+                applied.append(migration.label)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    return applied
+
+def migration_status(engine: Engine) -> List[dict]:
+    """Every known migration with its applied_at (None while pending)"""
+    with engine.connect() as conn:
+        exists = conn.execute(text("SELECT to_regclass('schema_migrations') IS NOT NULL")).scalar()
+        rows = {}
+        if exists:
+            rows = {row.version: row for row in conn.execute(text("SELECT version, applied_at, duration_ms FROM schema_migrations"))}
+    return [
+        {
+            "version": migration.version,
+            "name": migration.name,
+            "transactional": migration.transactional,
+            "applied_at": rows[migration.version].applied_at if migration.version in rows else None,
+            "duration_ms": rows[migration.version].duration_ms if migration.version in rows else None,
+        }
+        for migration in load_migrations()
+    ]
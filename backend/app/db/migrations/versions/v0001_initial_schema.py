@@ -0,0 +1,6 @@
+"""Create the tables of the current models that do not exist yet (the full schema on a fresh database)"""
+from app.db.database import Base
+import app.models  # noqa: F401  (registers every model on Base.metadata)
+
+def upgrade(conn):
+    Base.metadata.create_all(bind=conn)
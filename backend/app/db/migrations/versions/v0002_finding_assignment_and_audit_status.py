@@ -0,0 +1,31 @@
+"""Finding assignee / due date and audit status columns on databases created before they existed"""
+from sqlalchemy import text
+
+def _column_exists(conn, table: str, column: str) -> bool:
+    return conn.execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = :table AND column_name = :column
+    """), {"table": table, "column": column}).first() is not None
+
+def upgrade(conn):
+    if not _column_exists(conn, "findings", "assigned_to_user_id"):
+        conn.execute(text("""
+            ALTER TABLE findings
+            ADD COLUMN assigned_to_user_id INTEGER REFERENCES users(id) ON DELETE SET NULL
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_findings_assigned_to_user_id ON findings (assigned_to_user_id)"))
+
+    if not _column_exists(conn, "findings", "due_date"):
+        conn.execute(text("ALTER TABLE findings ADD COLUMN due_date TIMESTAMP WITH TIME ZONE"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_findings_due_date ON findings (due_date)"))
+
+    if not _column_exists(conn, "audits", "status"):
+        conn.execute(text("""
+            DO $$ BEGIN
+                CREATE TYPE auditstatus AS ENUM ('planning', 'in_progress', 'completed', 'cancelled');
+            EXCEPTION
+                WHEN duplicate_object THEN null;
+            END $$;
+        """))
+        conn.execute(text("ALTER TABLE audits ADD COLUMN status auditstatus NOT NULL DEFAULT 'planning'"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_audits_status ON audits (status)"))
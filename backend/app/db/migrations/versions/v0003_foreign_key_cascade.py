@@ -0,0 +1,34 @@
+"""Make parent deletes cascade (set-based project / audit / organization / template deletes rely on it)"""
+from sqlalchemy import text
+
+# (table, constraint, column, referenced table, referenced column)
+CASCADING_FOREIGN_KEYS = [
+    ("audits", "audits_project_id_fkey", "project_id", "projects", "id"),
+    ("findings", "findings_audit_id_fkey", "audit_id", "audits", "id"),
+    ("evidences", "evidences_finding_id_fkey", "finding_id", "findings", "id"),
+    ("project_user_assignments", "project_user_assignments_project_id_fkey", "project_id", "projects", "id"),
+    ("project_user_assignments", "project_user_assignments_user_id_fkey", "user_id", "users", "id"),
+    ("projects", "projects_organization_id_fkey", "organization_id", "organizations", "id"),
+    ("templates", "templates_organization_id_fkey", "organization_id", "organizations", "id"),
+    ("template_items", "template_items_template_id_fkey", "template_id", "templates", "id"),
+    ("users", "users_organization_id_fkey", "organization_id", "organizations", "id"),
+]
+
+def upgrade(conn):
+    for table, constraint, column, ref_table, ref_column in CASCADING_FOREIGN_KEYS:
+        delete_rule = conn.execute(text("""
+            SELECT rc.delete_rule
+            FROM information_schema.table_constraints tc
+            JOIN information_schema.referential_constraints rc
+              ON rc.constraint_name = tc.constraint_name
+             AND rc.constraint_schema = tc.constraint_schema
+            WHERE tc.constraint_name = :constraint_name AND tc.table_name = :table_name
+        """), {"constraint_name": constraint, "table_name": table}).scalar()
+        if delete_rule is None or delete_rule == "CASCADE":
+            continue
+        conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {constraint}"))
+        conn.execute(text(f"""
+            ALTER TABLE {table}
+            ADD CONSTRAINT {constraint}
+            FOREIGN KEY ({column}) REFERENCES {ref_table}({ref_column}) ON DELETE CASCADE
+        """))
@@ -0,0 +1,15 @@
+"""English columns on templates and template items"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    conn.execute(text("""
+        ALTER TABLE templates
+        ADD COLUMN IF NOT EXISTS name_en VARCHAR,
+        ADD COLUMN IF NOT EXISTS description_en TEXT
+    """))
+    conn.execute(text("""
+        ALTER TABLE template_items
+        ADD COLUMN IF NOT EXISTS default_title_en VARCHAR,
+        ADD COLUMN IF NOT EXISTS default_description_en TEXT,
+        ADD COLUMN IF NOT EXISTS default_recommendation_en TEXT
+    """))
@@ -0,0 +1,37 @@
+"""deleted_at on projects, audits and findings with live / deleted partial indexes"""
+from sqlalchemy import text
+
+TRANSACTIONAL = False
+
+SOFT_DELETE_TABLES = {
+    "projects": "organization_id",
+    "audits": "project_id",
+    "findings": "audit_id",
+}
+
+# Finding indexes that become partial on live rows; full versions are dropped here and
+# recreated as partial by v0007 / v0010
+PARTIAL_FINDING_INDEXES = ["ix_findings_created_at_audit_severity", "ix_findings_control_prefix"]
+
+def upgrade(conn):
+    for table, parent_column in SOFT_DELETE_TABLES.items():
+        # Nullable column without default: metadata-only change, no table rewrite
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE"))
+        conn.execute(text(f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{parent_column}_live
+            ON {table} ({parent_column}) WHERE deleted_at IS NULL
+        """))
+        conn.execute(text(f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_deleted_at
+            ON {table} (deleted_at) WHERE deleted_at IS NOT NULL
+        """))
+
+    for index_name in PARTIAL_FINDING_INDEXES:
+        is_full_index = conn.execute(text("""
+            SELECT i.indpred IS NULL
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :index_name
+        """), {"index_name": index_name}).scalar()
+        if is_full_index:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
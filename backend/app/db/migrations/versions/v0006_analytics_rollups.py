@@ -0,0 +1,13 @@
+"""Trigger-maintained finding rollups, backfilled from the existing findings"""
+from sqlalchemy.orm import Session
+from app.models.analytics import FindingRollup
+from app.services.analytics_rollups import install_rollup_triggers, rollup_triggers_installed, rebuild_finding_rollups
+
+def upgrade(conn):
+    FindingRollup.__table__.create(conn, checkfirst=True)
+    # The session joins the migration's transaction
+    db = Session(bind=conn)
+    needs_backfill = not rollup_triggers_installed(db)
+    install_rollup_triggers(db)
+    if needs_backfill:
+        rebuild_finding_rollups(db)
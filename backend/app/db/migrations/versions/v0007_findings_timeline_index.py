@@ -0,0 +1,10 @@
+"""Covering index for the findings timeline (live findings only)"""
+from sqlalchemy import text
+
+TRANSACTIONAL = False
+
+def upgrade(conn):
+    conn.execute(text("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_findings_created_at_audit_severity
+        ON findings (created_at, audit_id, severity) INCLUDE (status) WHERE deleted_at IS NULL
+    """))
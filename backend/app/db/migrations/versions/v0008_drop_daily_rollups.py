@@ -0,0 +1,9 @@
+"""Drop finding_daily_rollups, superseded by the timeline index"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.services.analytics_rollups import install_rollup_triggers
+
+def upgrade(conn):
+    # Replace the trigger functions first so nothing writes to the dropped table
+    install_rollup_triggers(Session(bind=conn))
+    conn.execute(text("DROP TABLE IF EXISTS finding_daily_rollups"))
@@ -0,0 +1,8 @@
+"""Finding status transition history, backfilled from activity_logs"""
+from sqlalchemy.orm import Session
+from app.models.finding import FindingStatusTransition
+from app.services.finding_history import backfill_status_transitions
+
+def upgrade(conn):
+    FindingStatusTransition.__table__.create(conn, checkfirst=True)
+    backfill_status_transitions(Session(bind=conn))
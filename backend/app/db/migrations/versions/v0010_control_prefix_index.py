@@ -0,0 +1,12 @@
+"""ix_findings_control_prefix (same expression as control_prefix_expression())"""
+from sqlalchemy import text
+from app.models.finding import CONTROL_PREFIX_PATTERN
+
+TRANSACTIONAL = False
+
+def upgrade(conn):
+    conn.execute(text(f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_findings_control_prefix
+        ON findings (substring(control_reference, '{CONTROL_PREFIX_PATTERN}'), severity, status, audit_id)
+        WHERE deleted_at IS NULL
+    """))
@@ -0,0 +1,7 @@
+"""ix_evidences_file_path (shared evidence file lookups on delete)"""
+from sqlalchemy import text
+
+TRANSACTIONAL = False
+
+def upgrade(conn):
+    conn.execute(text("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_evidences_file_path ON evidences (file_path)"))
@@ -0,0 +1,76 @@
+"""
+Merge project_users into project_user_assignments, re-key the latter on (project_id, user_id)
+with a reverse index on user_id and drop project_users. Indexes are built concurrently; locks
+are only taken for the final swap.
+"""
+from sqlalchemy import text
+
+TRANSACTIONAL = False
+
+MERGE_LEGACY_MEMBERSHIPS_SQL = """
+    INSERT INTO project_user_assignments (project_id, user_id)
+    SELECT DISTINCT pu.project_id, pu.user_id
+    FROM project_users pu
+    WHERE NOT EXISTS (
+        SELECT 1 FROM project_user_assignments a
+        WHERE a.project_id = pu.project_id AND a.user_id = pu.user_id
+    )
+"""
+
+UNIQUE_INDEX_NAME = "project_user_assignments_project_user_key"
+
+def upgrade(conn):
+    has_legacy_table = conn.execute(text("SELECT to_regclass('project_users') IS NOT NULL")).scalar()
+    has_id_column = conn.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'project_user_assignments' AND column_name = 'id'
+        )
+    """)).scalar()
+
+    if has_legacy_table:
+        conn.execute(text(MERGE_LEGACY_MEMBERSHIPS_SQL))
+
+    if has_id_column:
+        conn.execute(text("""
+            DELETE FROM project_user_assignments a
+            USING project_user_assignments b
+            WHERE a.project_id = b.project_id AND a.user_id = b.user_id AND a.id > b.id
+        """))
+        # A failed concurrent build leaves an invalid index behind; start over in that case
+        is_invalid = conn.execute(text("""
+            SELECT NOT i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :index_name
+        """), {"index_name": UNIQUE_INDEX_NAME}).scalar()
+        if is_invalid:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {UNIQUE_INDEX_NAME}"))
+        conn.execute(text(f"""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {UNIQUE_INDEX_NAME}
+            ON project_user_assignments (project_id, user_id)
+        """))
+
+    conn.execute(text("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_project_user_assignments_user_id
+        ON project_user_assignments (user_id)
+    """))
+
+    if not (has_id_column or has_legacy_table):
+        return
+    # The swap runs in its own transaction
+    with conn.engine.begin() as swap:
+        if has_id_column:
+            # The unique index becomes the primary key without another table scan
+            swap.execute(text("ALTER TABLE project_user_assignments DROP CONSTRAINT IF EXISTS project_user_assignments_pkey"))
+            swap.execute(text(f"""
+                ALTER TABLE project_user_assignments
+                ADD CONSTRAINT project_user_assignments_pkey PRIMARY KEY USING INDEX {UNIQUE_INDEX_NAME}
+            """))
+            swap.execute(text("ALTER TABLE project_user_assignments DROP COLUMN id"))
+
+        if has_legacy_table:
+            # Pick up memberships written to the legacy table since the first merge, then drop it
+            swap.execute(text("LOCK TABLE project_users IN EXCLUSIVE MODE"))
+            swap.execute(text(MERGE_LEGACY_MEMBERSHIPS_SQL))
+            swap.execute(text("DROP TABLE project_users"))
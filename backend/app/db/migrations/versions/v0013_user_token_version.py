@@ -0,0 +1,5 @@
+"""users.token_version; a constant default is metadata-only and existing tokens keep matching version 0"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0"))
@@ -0,0 +1,48 @@
+"""Indexes for the hot query paths (foreign keys, activity / notification feeds, finding filters)"""
+from sqlalchemy import text
+from app.models.finding import OPEN_STATUS_NAMES
+
+TRANSACTIONAL = False
+
+INDEXES = {
+    # Foreign keys hit by ON DELETE CASCADE and purges, which also see soft-deleted rows
+    "ix_findings_audit_id": "findings (audit_id)",
+    "ix_audits_project_id": "audits (project_id)",
+    "ix_projects_organization_id": "projects (organization_id)",
+    "ix_evidences_finding_id": "evidences (finding_id)",
+    "ix_template_items_template_id": "template_items (template_id)",
+    "ix_activity_logs_entity_created_at": "activity_logs (entity_type, entity_id, created_at)",
+    "ix_notifications_user_read_created_at": "notifications (user_id, read, created_at)",
+    "ix_findings_audit_status_severity": "findings (audit_id, status, severity) WHERE deleted_at IS NULL",
+    "ix_findings_open_due_date": (
+        "findings (due_date) INCLUDE (audit_id, assigned_to_user_id) "
+        f"WHERE deleted_at IS NULL AND due_date IS NOT NULL AND status IN ({OPEN_STATUS_NAMES})"
+    ),
+}
+
+# Superseded by the indexes above: leading columns of a composite, or a boolean nobody
+# filters on alone. Dropped only after their replacements exist.
+REDUNDANT_INDEXES = ["ix_findings_audit_id_live", "ix_notifications_user_id", "ix_notifications_read"]
+
+def upgrade(conn):
+    for index_name, definition in INDEXES.items():
+        # A failed CONCURRENTLY build leaves an invalid index behind that IF NOT EXISTS would keep
+        is_invalid = conn.execute(text("""
+            SELECT NOT i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :index_name
+        """), {"index_name": index_name}).scalar()
+        if is_invalid:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+        # Partitioned tables (activity_logs on a schema created from the current models) cannot
+        # build indexes concurrently; there the index already exists and IF NOT EXISTS skips it
+        table = definition.split(" ", 1)[0]
+        is_partitioned = conn.execute(text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}).scalar()
+        concurrently = "" if is_partitioned else "CONCURRENTLY "
+        conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {index_name} ON {definition}"))
+
+    for index_name in REDUNDANT_INDEXES:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+    conn.execute(text("ANALYZE findings, audits, projects, evidences, template_items, activity_logs, notifications"))
@@ -0,0 +1,127 @@
+"""activity_logs partitioned by month, with per-filter indexes on every partition"""
+from sqlalchemy import text
+from datetime import datetime, timezone
+from app.core.config import settings
+from app.services.activity_partitions import (
+    PARENT_TABLE, DEFAULT_PARTITION, LOCK_TIMEOUT, create_month_partition, is_partitioned, month_start, monthly_partitions
+)
+
+# Online conversion of an existing plain table, in short transactions so API workers keep logging:
+# 1. the plain table is renamed aside and the partitioned table takes its name (one brief lock);
+#    new events go to the partitioned table from then on, with ids continuing after the old ones
+# 2. old rows are moved over in batches, newest first, each batch its own transaction; until the
+#    move is done the oldest history is missing from the activity feeds
+# 3. the emptied plain table is dropped
+# The old table cannot simply be attached as a partition: its id column is INTEGER, the
+# partitioned table's BIGINT. Moving newest first empties the end of the old table, which the
+# periodic VACUUM hands back to the file system, so the move needs little extra disk.
+# Re-running after an interruption continues the move.
+TRANSACTIONAL = False
+
+LEGACY_TABLE = "activity_logs_unpartitioned"
+MOVE_BATCH_SIZE = 10000
+VACUUM_EVERY_BATCHES = 20
+
+# Same shape as the ActivityLog model; id becomes BIGINT for the long run
+CREATE_TABLE_SQL = """
+    CREATE TABLE activity_logs (
+        id BIGSERIAL NOT NULL,
+        user_id INTEGER REFERENCES users (id) ON DELETE SET NULL,
+        entity_type VARCHAR NOT NULL,
+        entity_id INTEGER NOT NULL,
+        action VARCHAR NOT NULL,
+        details JSON,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at)
+"""
+
+INDEXES = {
+    "ix_activity_logs_entity_created_at": "(entity_type, entity_id, created_at)",
+    "ix_activity_logs_user_id_created_at": "(user_id, created_at)",
+    "ix_activity_logs_action_created_at": "(action, created_at)",
+    "ix_activity_logs_created_at": "(created_at)",
+}
+
+COLUMNS = "id, user_id, entity_type, entity_id, action, details, created_at"
+
+MOVE_BATCH_SQL = f"""
+    WITH batch AS (
+        DELETE FROM {LEGACY_TABLE}
+        WHERE id IN (SELECT id FROM {LEGACY_TABLE} ORDER BY id DESC LIMIT :batch_size)
+        RETURNING {COLUMNS}
+    )
+    INSERT INTO {PARENT_TABLE} ({COLUMNS})
+    SELECT id, user_id, entity_type, entity_id, action, details, COALESCE(created_at, now())
+    FROM batch
+"""
+
+def _swap_in_partitioned_table(engine, oldest):
+    """Step 1: rename the plain table aside and create the partitioned one in its place"""
+    with engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} RENAME TO {LEGACY_TABLE}"))
+        # Free the index and sequence names for the new table; only the primary key is kept,
+        # it serves the batched move
+        legacy_indexes = conn.execute(text("""
+            SELECT c.relname, i.indisprimary
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = CAST(:table AS regclass)
+        """), {"table": LEGACY_TABLE}).all()
+        for index_name, is_primary in legacy_indexes:
+            if is_primary:
+                conn.execute(text(f"ALTER INDEX {index_name} RENAME TO {LEGACY_TABLE}_pkey"))
+            else:
+                conn.execute(text(f"DROP INDEX {index_name}"))
+        conn.execute(text(f"ALTER SEQUENCE IF EXISTS activity_logs_id_seq RENAME TO {LEGACY_TABLE}_id_seq"))
+        conn.execute(text(CREATE_TABLE_SQL))
+        conn.execute(text(f"""
+            SELECT setval(pg_get_serial_sequence('{PARENT_TABLE}', 'id'), COALESCE((SELECT max(id) FROM {LEGACY_TABLE}), 0) + 1, false)
+        """))
+        _create_partitions(conn, oldest)
+        # Empty table: building the indexes is instant
+        for index_name, columns in INDEXES.items():
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {PARENT_TABLE} {columns}"))
+
+def _create_partitions(conn, oldest=None):
+    """Monthly partitions from the oldest row up to the configured months ahead, plus the default one"""
+    this_month = month_start(datetime.now(timezone.utc).date())
+    month = min(month_start(oldest.date()), this_month) if oldest else this_month
+    existing = {partition_month for _, partition_month in monthly_partitions(conn)}
+    while month <= month_start(this_month, settings.ACTIVITY_LOG_PARTITIONS_AHEAD):
+        if month not in existing:
+            create_month_partition(conn, month)
+        month = month_start(month, 1)
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+
+def _move_legacy_rows(conn, engine):
+    """Step 2 and 3: move the old rows in batches, then drop the old table (conn is autocommit)"""
+    batches = 0
+    while True:
+        with engine.begin() as batch_conn:
+            moved = batch_conn.execute(text(MOVE_BATCH_SQL), {"batch_size": MOVE_BATCH_SIZE}).rowcount
+        if not moved:
+            break
+        batches += 1
+        if batches % VACUUM_EVERY_BATCHES == 0:
+            print(f"  ↪ {batches * MOVE_BATCH_SIZE} activity log rows moved")
+            conn.execute(text(f"VACUUM {LEGACY_TABLE}"))
+    conn.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+
+def upgrade(conn):
+    engine = conn.engine
+    if not is_partitioned(conn):
+        # Read before the swap, without blocking writers; rows inserted meanwhile are newer
+        oldest = conn.execute(text(f"SELECT min(created_at) FROM {PARENT_TABLE}")).scalar()
+        _swap_in_partitioned_table(engine, oldest)
+    else:
+        # Schema created from the current models, or a re-run after the swap
+        with engine.begin() as tx:
+            _create_partitions(tx)
+        for index_name, columns in INDEXES.items():
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {PARENT_TABLE} {columns}"))
+
+    if conn.execute(text("SELECT to_regclass(:table) IS NOT NULL"), {"table": LEGACY_TABLE}).scalar():
+        _move_legacy_rows(conn, engine)
+    conn.execute(text(f"ANALYZE {PARENT_TABLE}"))
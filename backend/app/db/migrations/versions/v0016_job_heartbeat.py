@@ -0,0 +1,7 @@
+"""jobs.updated_at heartbeat, so jobs interrupted by a worker restart can be detected"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()"))
+    # Existing rows: last known activity instead of the migration time
+    conn.execute(text("UPDATE jobs SET updated_at = COALESCE(finished_at, started_at, created_at)"))
@@ -0,0 +1,16 @@
+"""jobs.status stores the JobStatus member names ('RUNNING') like every other enum column"""
+from sqlalchemy import text
+from app.models.job import Job, JobStatus
+
+def upgrade(conn):
+    status_type = Job.__table__.c.status.type.name
+    labels = set(conn.execute(text("""
+        SELECT e.enumlabel
+        FROM pg_enum e
+        JOIN pg_type t ON t.oid = e.enumtypid
+        WHERE t.typname = :type_name
+    """), {"type_name": status_type}).scalars().all())
+    for member in JobStatus:
+        # Renaming a label rewrites no rows; existing jobs keep their status
+        if member.value in labels and member.name not in labels:
+            conn.execute(text(f"ALTER TYPE {status_type} RENAME VALUE '{member.value}' TO '{member.name}'"))
@@ -0,0 +1,126 @@
+"""
+Connection pool metrics
+Pools are built from instrumented subclasses that time every checkout (waiting for a free
+connection or opening an overflow one) and count checkout timeouts. render_prometheus()
+exposes them, together with the pools' in-use / idle / overflow gauges, in the Prometheus
+text format. Figures are per worker process; the pid label tells the workers apart.
+"""
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+from typing import Dict, List, Tuple, Type
+import os
+import threading
+import time
+
+# Checkout wait histogram buckets, in seconds
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class PoolMetrics:
+    """Checkout wait histogram and timeout counter of one pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * len(WAIT_BUCKETS)
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def observe_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.bucket_counts[i] += 1
+                    break
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "bucket_counts": list(self.bucket_counts),
+                "checkouts": self.checkouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "timeouts": self.timeouts,
+            }
+
+# Engines whose pool gauges are exported, by pool name
+_engines: Dict[str, Engine] = {}
+_metrics: Dict[str, PoolMetrics] = {}
+
+def instrumented_pool_class(base: Type[Pool], name: str) -> Type[Pool]:
+    """
+    Subclass of a SQLAlchemy queue pool that records checkout waits under name.
+    The metrics live on the class, so they survive Pool.recreate() (engine.dispose()).
+    """
+    metrics = _metrics.setdefault(name, PoolMetrics(name))
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.record_timeout()
+            raise
+        metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get, "metrics": metrics})
+
+def register_engine(name: str, engine: Engine):
+    """Export the gauges of the engine's current pool (for an AsyncEngine pass .sync_engine)"""
+    _engines[name] = engine
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+def render_prometheus() -> str:
+    """All registered pools' metrics in the Prometheus text exposition format"""
+    pid = str(os.getpid())
+    gauges: List[Tuple[str, str, str]] = [
+        ("archrampart_db_pool_size", "Configured number of persistent connections", "size"),
+        ("archrampart_db_pool_checked_out", "Connections currently in use", "checkedout"),
+        ("archrampart_db_pool_checked_in", "Idle connections in the pool", "checkedin"),
+        ("archrampart_db_pool_overflow", "Connections opened beyond the pool size (negative while below it)", "overflow"),
+    ]
+    lines = []
+    for metric, help_text, method in gauges:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        for name, engine in _engines.items():
+            pool = engine.pool
+            # NullPool (PgBouncer mode) keeps no connections and has no gauges
+            if hasattr(pool, method):
+                lines.append(f"{metric}{_format_labels({'pool': name, 'pid': pid})} {getattr(pool, method)()}")
+
+    wait_metric = "archrampart_db_pool_checkout_wait_seconds"
+    lines += [
+        f"# HELP {wait_metric} Time spent waiting for a pooled connection",
+        f"# TYPE {wait_metric} histogram",
+    ]
+    snapshots = {name: metrics.snapshot() for name, metrics in _metrics.items()}
+    for name, snapshot in snapshots.items():
+        cumulative = 0
+        for bound, count in zip(WAIT_BUCKETS, snapshot["bucket_counts"]):
+            cumulative += count
+            lines.append(f"{wait_metric}_bucket{_format_labels({'pool': name, 'pid': pid, 'le': repr(bound)})} {cumulative}")
+        lines.append(f"{wait_metric}_bucket{_format_labels({'pool': name, 'pid': pid, 'le': '+Inf'})} {snapshot['checkouts']}")
+        lines.append(f"{wait_metric}_sum{_format_labels({'pool': name, 'pid': pid})} {snapshot['wait_seconds_total']}")
+        lines.append(f"{wait_metric}_count{_format_labels({'pool': name, 'pid': pid})} {snapshot['checkouts']}")
+
+    for metric, help_text, key in [
+        ("archrampart_db_pool_checkout_wait_max_seconds", "Longest checkout wait since start", "wait_seconds_max"),
+        ("archrampart_db_pool_checkout_timeouts_total", "Checkouts that gave up after the pool timeout", "timeouts"),
+    ]:
+        metric_type = "counter" if metric.endswith("_total") else "gauge"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {metric_type}"]
+        for name, snapshot in snapshots.items():
+            lines.append(f"{metric}{_format_labels({'pool': name, 'pid': pid})} {snapshot[key]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,152 @@
+"""
+Read replica routing
+Safe GET handlers depend on get_read_db / get_async_read_db instead of get_db / get_async_db and
+are served by the replica (DATABASE_READ_URL) unless:
+- the client wrote within READ_YOUR_WRITES_SECONDS: every successful write response carries a
+  deadline header which the client sends back until it passes, so it reads its own writes;
+- the replica lags behind by more than REPLICA_MAX_LAG_SECONDS or cannot be reached (checked at
+  most every REPLICA_LAG_CHECK_INTERVAL_SECONDS per worker).
+In those cases, and when no replica is configured, the handler gets a primary session.
+"""
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from typing import Optional
+import asyncio
+import os
+import threading
+import time
+from app.core.config import settings
+from app.db.database import (
+    SessionLocal, AsyncSessionLocal, ReadSessionLocal, AsyncReadSessionLocal, read_engine, async_read_engine
+)
+
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes-Until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Seconds the replica is behind; 0 when it is not a standby (e.g. a second stand-alone instance
+# used for local testing) or streams and has replayed everything it received. A standby that does
+# not stream (WAL receiver stopped, primary unreachable) has received nothing new either, so there
+# the age of the last replayed transaction is the lag (infinite when it never replayed one).
+# pg_stat_wal_receiver.status is only visible to superusers and pg_read_all_stats members; for
+# other users the age is used while streaming too, which errs on the side of the primary.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN
+            CASE
+                WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8, 0)
+            END
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8, 'Infinity')
+    END
+""")
+
+class ReplicaLagMonitor:
+    """Periodically measured replica lag; a failed measurement counts as unhealthy"""
+
+    def __init__(self, max_lag_seconds: float, check_interval_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_seconds: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        return self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+
+    def _claim_check(self) -> bool:
+        """True for the one caller that should measure now; others use the last result"""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval_seconds:
+                return False
+            self._checked_at = now
+            return True
+
+    def check(self, engine) -> bool:
+        if self._claim_check():
+            try:
+                with engine.connect() as conn:
+                    self.lag_seconds = float(conn.execute(REPLICA_LAG_SQL).scalar())
+            except SQLAlchemyError:
+                self.lag_seconds = None
+        return self.healthy
+
+    async def check_async(self, engine) -> bool:
+        if self._claim_check():
+            try:
+                async with engine.connect() as conn:
+                    self.lag_seconds = float((await conn.execute(REPLICA_LAG_SQL)).scalar())
+            except (SQLAlchemyError, OSError, asyncio.TimeoutError):
+                self.lag_seconds = None
+        return self.healthy
+
+replica_lag = ReplicaLagMonitor(settings.REPLICA_MAX_LAG_SECONDS, settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+
+def _needs_primary(request: Request) -> bool:
+    if request.method not in SAFE_METHODS:
+        return True
+    deadline = request.headers.get(READ_YOUR_WRITES_HEADER)
+    if not deadline:
+        return False
+    try:
+        return float(deadline) > time.time()
+    except ValueError:
+        return False
+
+def get_read_db(request: Request):
+    """Session for a read-only handler: the replica when it is safe to use, the primary otherwise"""
+    session_factory = SessionLocal
+    if ReadSessionLocal is not None and not _needs_primary(request) and replica_lag.check(read_engine):
+        session_factory = ReadSessionLocal
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def routed_session_factory(db: Session):
+    """Factory of the database a routed session reads from, for work that outlives the request (streamed responses)"""
+    return ReadSessionLocal if db.info.get("read_only") else SessionLocal
+
+async def get_async_read_db(request: Request):
+    """get_read_db for async handlers"""
+    session_factory = AsyncSessionLocal
+    if AsyncReadSessionLocal is not None and not _needs_primary(request) and await replica_lag.check_async(async_read_engine):
+        session_factory = AsyncReadSessionLocal
+    async with session_factory() as db:
+        yield db
+
+async def mark_read_your_writes(request: Request, call_next):
+    """HTTP middleware: successful writes open the client's read-your-writes window"""
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        response.headers[READ_YOUR_WRITES_HEADER] = f"{time.time() + settings.READ_YOUR_WRITES_SECONDS:.3f}"
+    return response
+
+def render_replica_metrics() -> str:
+    """Replica lag as seen by this worker, in the Prometheus text format (empty without a replica)"""
+    if read_engine is None:
+        return ""
+    labels = f'{{pid="{os.getpid()}"}}'
+    lag = replica_lag.lag_seconds
+    if lag is None:
+        lag = "NaN"
+    elif lag == float("inf"):
+        lag = "+Inf"
+    return "\n".join([
+        "# HELP archrampart_db_replica_lag_seconds Last measured replica lag (NaN when unreachable)",
+        "# TYPE archrampart_db_replica_lag_seconds gauge",
+        f"archrampart_db_replica_lag_seconds{labels} {lag}",
+        "# HELP archrampart_db_replica_in_use Whether reads are currently routed to the replica",
+        "# TYPE archrampart_db_replica_in_use gauge",
+        f"archrampart_db_replica_in_use{labels} {int(replica_lag.healthy)}",
+    ]) + "\n"
+
+@event.listens_for(Session, "before_flush")
+def _reject_replica_writes(session, flush_context, instances):
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Read replica sessions are read-only; use get_db for handlers that write")
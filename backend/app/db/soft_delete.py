@@ -0,0 +1,40 @@
+"""
+Soft delete
+Projects, audits and findings carry a deleted_at timestamp. Every ORM select issued through a
+Session is filtered to live rows automatically (including joins and relationship loads), and
+findings additionally require a live audit, so soft-deleting an audit or a project is a single
+row UPDATE. Use execution_options(include_deleted=True) to see deleted rows (restore, purge).
+Hard deletion happens later in app/services/purge.py.
+"""
+from sqlalchemy import Column, DateTime, event, select
+from sqlalchemy.orm import Session, with_loader_criteria
+
+class SoftDeleteMixin:
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+# Partial index predicates: read paths use the live one, the purger the deleted one
+LIVE_ROWS = "deleted_at IS NULL"
+DELETED_ROWS = "deleted_at IS NOT NULL"
+
+def live_audit_ids():
+    """Subquery of audits that are not soft-deleted (a deleted project flags its audits too)"""
+    from app.models.audit import Audit
+    return select(Audit.id).where(Audit.deleted_at.is_(None))
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_soft_deleted(execute_state):
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+        or execute_state.execution_options.get("include_deleted", False)
+    ):
+        # Column and relationship loads inherit the criteria of the statement that loaded the parent
+        return
+
+    from app.models.finding import Finding
+
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(Finding, Finding.audit_id.in_(live_audit_ids()), include_aliases=True),
+    )
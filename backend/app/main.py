@@ -1,15 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 import os
 
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.db.database import engine, Base
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from app.core.activity_logger import activity_writer, render_activity_metrics
+from app.services.jobs import fail_stale_jobs
+from app.db.pool_metrics import render_prometheus
+from app.db.read_routing import READ_YOUR_WRITES_HEADER, mark_read_your_writes, render_replica_metrics
 
+# The schema is created and migrated by scripts/migrate.py (docker_init.py) before the workers start
 app = FastAPI(
     title="ArchRampart Audit API",
     description="On-premise denetim yönetim sistemi",
@@ -25,6 +27,7 @@ if settings.DEBUG and "*" in settings.ALLOWED_ORIGINS:
         allow_credentials=False,  # * ile credentials kullanılamaz
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[READ_YOUR_WRITES_HEADER],
     )
 else:
     app.add_middleware(
@@ -33,8 +36,12 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[READ_YOUR_WRITES_HEADER],
     )
 
+if settings.DATABASE_READ_URL:
+    app.middleware("http")(mark_read_your_writes)
+
 # Static files for uploads
 if not os.path.exists(settings.UPLOAD_DIR):
     os.makedirs(settings.UPLOAD_DIR)
@@ -47,7 +54,25 @@ app.include_router(api_router, prefix="/api/v1")
 async def root():
     return {"message": "ArchRampart Audit API", "version": "1.0.0"}
 
+@app.on_event("startup")
+def fail_interrupted_jobs():
+    """Jobs left running by a killed or restarted worker would otherwise stay "running" forever"""
+    try:
+        fail_stale_jobs()
+    except Exception as e:
+        print(f"Warning: Could not check for interrupted jobs: {e}")
+
+@app.on_event("shutdown")
+def flush_activity_log():
+    """Write the activity events still queued for the background writer"""
+    activity_writer.stop()
+
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def metrics():
+        """Connection pool, replica and activity log metrics of the worker serving the request (Prometheus text format)"""
+        return render_prometheus() + render_replica_metrics() + render_activity_metrics()
@@ -3,9 +3,11 @@ from app.models.organization import Organization
 from app.models.project import Project
 from app.models.audit import Audit, AuditStatus
 from app.models.template import Template, TemplateItem
-from app.models.finding import Finding, Evidence, FindingComment
+from app.models.finding import Finding, Evidence, FindingComment, FindingStatusTransition
 from app.models.activity import ActivityLog
 from app.models.notification import Notification, NotificationType
+from app.models.analytics import FindingRollup
+from app.models.job import Job, JobStatus
 
 __all__ = [
     "User",
@@ -18,8 +20,12 @@ __all__ = [
     "Finding",
     "Evidence",
     "FindingComment",
+    "FindingStatusTransition",
     "ActivityLog",
     "Notification",
     "NotificationType",
+    "FindingRollup",
+    "Job",
+    "JobStatus",
 ]
 
@@ -1,23 +1,29 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 class ActivityLog(Base):
+    """Append-only; partitioned by month on created_at (see app/services/activity_partitions.py)"""
     __tablename__ = "activity_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # The primary key of a partitioned table has to include the partition key
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     entity_type = Column(String, nullable=False)  # e.g., "project", "audit", "finding"
     entity_id = Column(Integer, nullable=False)
     action = Column(String, nullable=False)  # e.g., "created", "updated", "deleted", "comment_added"
     details = Column(JSON, nullable=True)  # JSON field for additional details
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, nullable=False, server_default=func.now())
 
     # Relationships
     user = relationship("User")
 
-
-
-
-
+    __table_args__ = (
+        # Created on every partition; each serves a filter of the activity list, newest first
+        Index("ix_activity_logs_entity_created_at", "entity_type", "entity_id", "created_at"),
+        Index("ix_activity_logs_user_id_created_at", "user_id", "created_at"),
+        Index("ix_activity_logs_action_created_at", "action", "created_at"),
+        Index("ix_activity_logs_created_at", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
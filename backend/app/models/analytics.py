@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, ForeignKey, Enum
+from app.db.database import Base
+from app.models.template import Severity, Status
+
+# The rollup table is maintained by statement-level triggers on `findings`
+# (see app/services/analytics_rollups.py), never written by application code.
+# The audit determines project and organization, so (audit, severity, status, assignee)
+# is the effective (organization, project, audit, severity, status, assignee) key.
+
+class FindingRollup(Base):
+    __tablename__ = "finding_rollups"
+
+    audit_id = Column(Integer, ForeignKey("audits.id", ondelete="CASCADE"), primary_key=True)
+    severity = Column(Enum(Severity), primary_key=True)
+    status = Column(Enum(Status), primary_key=True)
+    assigned_to_user_id = Column(Integer, primary_key=True, default=0)  # 0 = unassigned (primary key columns cannot be NULL)
+    organization_id = Column(Integer, nullable=False, index=True)
+    project_id = Column(Integer, nullable=False, index=True)
+    finding_count = Column(Integer, nullable=False, default=0)
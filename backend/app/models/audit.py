@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from app.db.database import Base
+from app.db.soft_delete import SoftDeleteMixin, LIVE_ROWS, DELETED_ROWS
 
 class AuditStandard(str, enum.Enum):
     ISO27001 = "ISO27001"
@@ -32,14 +33,14 @@ class AuditStatus(str, enum.Enum):
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
-class Audit(Base):
+class Audit(SoftDeleteMixin, Base):
     __tablename__ = "audits"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=True)
     standard = Column(Enum(AuditStandard), nullable=False)
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     audit_date = Column(DateTime(timezone=True), nullable=True)
     status = Column(Enum(AuditStatus, values_callable=lambda x: [e.value for e in x]), nullable=False, default=AuditStatus.PLANNING, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -47,5 +48,10 @@ class Audit(Base):
 
     # Relationships
     project = relationship("Project", back_populates="audits")
-    findings = relationship("Finding", back_populates="audit", cascade="all, delete-orphan")
+    findings = relationship("Finding", back_populates="audit", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_audits_project_id_live", "project_id", postgresql_where=text(LIVE_ROWS)),
+        Index("ix_audits_deleted_at", "deleted_at", postgresql_where=text(DELETED_ROWS)),
+    )
 
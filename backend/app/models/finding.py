@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from app.db.database import Base
-from app.models.template import Severity, Status
+from app.db.soft_delete import SoftDeleteMixin, LIVE_ROWS, DELETED_ROWS
+from app.models.template import Severity, Status, OPEN_STATUSES
 
-class Finding(Base):
+# Enum(Status) stores member names, e.g. 'OPEN'
+OPEN_STATUS_NAMES = ", ".join(f"'{status.name}'" for status in OPEN_STATUSES)
+
+class Finding(SoftDeleteMixin, Base):
     __tablename__ = "findings"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -22,16 +26,56 @@ class Finding(Base):
 
     # Relationships
     audit = relationship("Audit", back_populates="findings")
-    evidences = relationship("Evidence", back_populates="finding", cascade="all, delete-orphan")
+    evidences = relationship("Evidence", back_populates="finding", cascade="all, delete-orphan", passive_deletes=True)
     assigned_to = relationship("User", foreign_keys=[assigned_to_user_id])
-    comments = relationship("FindingComment", back_populates="finding", cascade="all, delete-orphan", order_by="FindingComment.created_at")
+    comments = relationship("FindingComment", back_populates="finding", cascade="all, delete-orphan", passive_deletes=True, order_by="FindingComment.created_at")
+
+    __table_args__ = (
+        # Covering index for the findings timeline (index-only scan over a created_at range).
+        # Partial on live rows so the soft-delete filter needs no heap access.
+        Index(
+            "ix_findings_created_at_audit_severity", "created_at", "audit_id", "severity",
+            postgresql_include=["status"], postgresql_where=text(LIVE_ROWS)
+        ),
+        # Findings of an audit, optionally filtered by status / severity (audit pages, audit stats).
+        # The plain audit_id index serves the ON DELETE CASCADE from audits and purges, which see
+        # soft-deleted rows and so cannot use the partial one.
+        Index("ix_findings_audit_status_severity", "audit_id", "status", "severity", postgresql_where=text(LIVE_ROWS)),
+        Index("ix_findings_audit_id", "audit_id"),
+        # Overdue / due-soon counters and reminders only look at open findings with a due date
+        Index(
+            "ix_findings_open_due_date", "due_date",
+            postgresql_include=["audit_id", "assigned_to_user_id"],
+            postgresql_where=text(f"{LIVE_ROWS} AND due_date IS NOT NULL AND status IN ({OPEN_STATUS_NAMES})")
+        ),
+        Index("ix_findings_deleted_at", "deleted_at", postgresql_where=text(DELETED_ROWS)),
+    )
+
+# Control family of a control reference, e.g. "A.8.12" -> "A.8", "1.1.1" -> "1.1".
+# The heatmap groups by exactly this expression so it can use ix_findings_control_prefix.
+CONTROL_PREFIX_PATTERN = r"^[^.]+(?:\.[^.]+)?"
+
+def control_prefix_expression(control_reference=None):
+    return func.substring(
+        control_reference if control_reference is not None else Finding.control_reference,
+        literal_column(f"'{CONTROL_PREFIX_PATTERN}'")
+    )
+
+Index(
+    "ix_findings_control_prefix",
+    control_prefix_expression(),
+    Finding.severity,
+    Finding.status,
+    Finding.audit_id,
+    postgresql_where=text(LIVE_ROWS),
+)
 
 class Evidence(Base):
     __tablename__ = "evidences"
 
     id = Column(Integer, primary_key=True, index=True)
-    finding_id = Column(Integer, ForeignKey("findings.id", ondelete="CASCADE"), nullable=False)
-    file_path = Column(String, nullable=False)
+    finding_id = Column(Integer, ForeignKey("findings.id", ondelete="CASCADE"), nullable=False, index=True)
+    file_path = Column(String, nullable=False, index=True)  # relative to UPLOAD_DIR, may be shared by copies
     file_name = Column(String, nullable=False)
     file_size = Column(Integer, nullable=True)
     description = Column(Text, nullable=True)
@@ -53,3 +97,22 @@ class FindingComment(Base):
     finding = relationship("Finding", back_populates="comments")
     user = relationship("User")
 
+class FindingStatusTransition(Base):
+    __tablename__ = "finding_status_transitions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    finding_id = Column(Integer, ForeignKey("findings.id", ondelete="CASCADE"), nullable=False)
+    from_status = Column(Enum(Status), nullable=True)  # NULL when unknown (backfilled rows)
+    to_status = Column(Enum(Status), nullable=False)
+    changed_by_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    changed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    # Relationships
+    finding = relationship("Finding")
+    changed_by = relationship("User")
+
+    __table_args__ = (
+        # Per-finding history and "resolved within [start, end)" range scans
+        Index("ix_finding_status_transitions_finding_changed_at", "finding_id", "changed_at"),
+        Index("ix_finding_status_transitions_to_status_changed_at", "to_status", "changed_at", "finding_id"),
+    )
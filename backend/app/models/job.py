@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import enum
+from app.db.database import Base
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(Base):
+    """Long running background operation (e.g. project deep copy) with progress reporting"""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False, index=True)  # e.g. "project_copy"
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING, index=True)
+    progress = Column(Integer, nullable=False, default=0)  # 0-100
+    completed_steps = Column(Integer, nullable=False, default=0)
+    total_steps = Column(Integer, nullable=True)
+    message = Column(String, nullable=True)
+    parameters = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_by_user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    # Heartbeat: bumped with every progress update, see fail_stale_jobs
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    created_by = relationship("User")
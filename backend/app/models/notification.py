@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -16,18 +16,23 @@ class Notification(Base):
     __tablename__ = "notifications"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     type = Column(Enum(NotificationType), nullable=False)
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
     related_entity_type = Column(String, nullable=True)  # 'finding', 'audit', etc.
     related_entity_id = Column(Integer, nullable=True)
-    read = Column(Boolean, default=False, nullable=False, index=True)
+    read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     # Relationships
     user = relationship("User")
 
+    __table_args__ = (
+        # A user's (unread) notifications, newest first; also serves the users.id cascade
+        Index("ix_notifications_user_read_created_at", "user_id", "read", "created_at"),
+    )
+
 
 
 
@@ -15,7 +15,7 @@ class Organization(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    users = relationship("User", back_populates="organization", cascade="all, delete-orphan")
-    projects = relationship("Project", back_populates="organization", cascade="all, delete-orphan")
-    templates = relationship("Template", back_populates="organization", cascade="all, delete-orphan")
+    users = relationship("User", back_populates="organization", cascade="all, delete-orphan", passive_deletes=True)
+    projects = relationship("Project", back_populates="organization", cascade="all, delete-orphan", passive_deletes=True)
+    templates = relationship("Template", back_populates="organization", cascade="all, delete-orphan", passive_deletes=True)
 
@@ -1,41 +1,39 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Table
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
+from app.db.soft_delete import SoftDeleteMixin, LIVE_ROWS, DELETED_ROWS
 
-# Association table for many-to-many relationship between projects and users
-project_user_association = Table(
-    "project_users",
-    Base.metadata,
-    Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
-    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
-)
-
-class Project(Base):
+class Project(SoftDeleteMixin, Base):
     __tablename__ = "projects"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=True)
-    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     organization = relationship("Organization", back_populates="projects")
-    audits = relationship("Audit", back_populates="project", cascade="all, delete-orphan")
-    assigned_users = relationship("User", secondary=project_user_association)
+    audits = relationship("Audit", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    # Read-only view of the members; assignments are written through ProjectUser
+    assigned_users = relationship("User", secondary="project_user_assignments", viewonly=True)
+
+    __table_args__ = (
+        Index("ix_projects_organization_id_live", "organization_id", postgresql_where=text(LIVE_ROWS)),
+        Index("ix_projects_deleted_at", "deleted_at", postgresql_where=text(DELETED_ROWS)),
+    )
 
-# Additional model for project-user relationship with extra fields if needed
+# Canonical project membership: one row per (project, user); the reverse index on user_id
+# serves access checks and accessible-project lookups
 class ProjectUser(Base):
     __tablename__ = "project_user_assignments"
 
-    id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     project = relationship("Project")
-    user = relationship("User")
-
+    user = relationship("User", back_populates="project_assignments")
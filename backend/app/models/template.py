@@ -18,6 +18,9 @@ class Status(str, enum.Enum):
     RESOLVED = "resolved"
     CLOSED = "closed"
 
+OPEN_STATUSES = [Status.OPEN, Status.IN_PROGRESS]
+CLOSED_STATUSES = [Status.RESOLVED, Status.CLOSED]
+
 class Template(Base):
     __tablename__ = "templates"
 
@@ -27,20 +30,20 @@ class Template(Base):
     description = Column(Text, nullable=True)  # Turkish description
     description_en = Column(Text, nullable=True)  # English description
     standard = Column(Enum(AuditStandard), nullable=False)
-    organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=True)  # None for system templates
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=True)  # None for system templates
     is_system = Column(Boolean, default=False, nullable=False)  # Sistem şablonu (silinemez)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     organization = relationship("Organization", back_populates="templates")
-    items = relationship("TemplateItem", back_populates="template", cascade="all, delete-orphan", order_by="TemplateItem.order_number")
+    items = relationship("TemplateItem", back_populates="template", cascade="all, delete-orphan", passive_deletes=True, order_by="TemplateItem.order_number")
 
 class TemplateItem(Base):
     __tablename__ = "template_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    template_id = Column(Integer, ForeignKey("templates.id"), nullable=False)
+    template_id = Column(Integer, ForeignKey("templates.id", ondelete="CASCADE"), nullable=False, index=True)
     order_number = Column(Integer, nullable=False)
     control_reference = Column(String, nullable=True)  # e.g., "A.5.1.1"
     default_title = Column(String, nullable=False)  # Turkish title
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 from app.models.audit import AuditStandard, AuditStatus
 
@@ -31,3 +31,14 @@ class Audit(AuditBase):
     class Config:
         from_attributes = True
 
+
+class AuditFindingStats(BaseModel):
+    total: int = 0
+    by_severity: Dict[str, int] = {}
+    by_status: Dict[str, int] = {}
+    overdue: int = 0
+    completion_percentage: float = 0.0
+
+class AuditWithStats(Audit):
+    # Only filled when the list is requested with include_stats=true
+    finding_stats: Optional[AuditFindingStats] = None
@@ -0,0 +1,131 @@
+"""
+Monthly partitions of activity_logs
+activity_logs is range-partitioned on created_at, one partition per month (activity_logs_YYYY_MM)
+plus a default partition that only catches rows no monthly partition covers yet. Maintenance
+(scripts/archive_activity_logs.py, also run by docker_init.py) keeps ACTIVITY_LOG_PARTITIONS_AHEAD
+months created in advance, and moves months older than ACTIVITY_LOG_RETENTION_MONTHS out of the
+table: each is written to a gzip-compressed CSV in ACTIVITY_LOG_ARCHIVE_DIR, then detached and dropped.
+"""
+from sqlalchemy import text
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+import gzip
+import os
+from app.core.config import settings
+
+PARENT_TABLE = "activity_logs"
+DEFAULT_PARTITION = "activity_logs_default"
+# Partition locks are taken on the table every request inserts into: give up rather than queue
+# behind a long-running query (and block the inserts queued behind us)
+LOCK_TIMEOUT = "5s"
+
+def month_start(day: date, months: int = 0) -> date:
+    """First day of the month `months` months after the month of day (negative: before)"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month.year:04d}_{month.month:02d}"
+
+def monthly_partitions(conn) -> List[Tuple[str, date]]:
+    """(name, first day of month) of every attached monthly partition, oldest first"""
+    names = conn.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:parent AS regclass)
+    """), {"parent": PARENT_TABLE}).scalars().all()
+    partitions = []
+    for name in names:
+        if name == DEFAULT_PARTITION:
+            continue
+        year, month = name[len(PARENT_TABLE) + 1:].split("_")
+        partitions.append((name, date(int(year), int(month), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+def create_month_partition(conn, month: date):
+    """
+    Create and attach the partition of month, moving its rows out of the default partition.
+    Must run in a transaction. ATTACH takes a SHARE UPDATE EXCLUSIVE lock on the parent, so inserts
+    into the other partitions keep going; inserts routed to the default partition (rows of months
+    without a partition) wait until the transaction ends. The default partition is locked before
+    its rows are moved, otherwise rows of month landing there meanwhile would make ATTACH fail.
+    """
+    name = partition_name(month)
+    # Bounds in UTC, so a partition holds exactly its UTC month whatever the session time zone
+    lower, upper = f"{month.isoformat()} 00:00:00+00", f"{month_start(month, 1).isoformat()} 00:00:00+00"
+    conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE})"))
+    if conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}).scalar():
+        # EXCLUSIVE blocks writes but not reads; ATTACH upgrades it to ACCESS EXCLUSIVE for its scan
+        conn.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE"))
+        conn.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= '{lower}' AND created_at < '{upper}'
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """))
+    conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"))
+
+def ensure_partitions(engine, months_ahead: Optional[int] = None) -> List[str]:
+    """
+    Create the missing monthly partitions up to months_ahead; starts after the newest existing one
+    when that is in the past, so rows that went to the default partition meanwhile get their month back
+    """
+    if months_ahead is None:
+        months_ahead = settings.ACTIVITY_LOG_PARTITIONS_AHEAD
+    this_month = month_start(datetime.now(timezone.utc).date())
+    with engine.connect() as conn:
+        existing = {partition_month for _, partition_month in monthly_partitions(conn)}
+    month = min(this_month, month_start(max(existing), 1)) if existing else this_month
+    created = []
+    while month <= month_start(this_month, months_ahead):
+        if month not in existing:
+            # One transaction per partition keeps each lock short
+            with engine.begin() as conn:
+                create_month_partition(conn, month)
+            created.append(partition_name(month))
+        month = month_start(month, 1)
+    return created
+
+def expired_partitions(conn, retention_months: Optional[int] = None) -> List[str]:
+    """Monthly partitions entirely older than the retention window (none when retention is 0)"""
+    if retention_months is None:
+        retention_months = settings.ACTIVITY_LOG_RETENTION_MONTHS
+    if retention_months <= 0:
+        return []
+    cutoff = month_start(datetime.now(timezone.utc).date(), -retention_months)
+    return [name for name, month in monthly_partitions(conn) if month < cutoff]
+
+def archive_partition(engine, name: str, archive_dir: Optional[str] = None) -> str:
+    """Write a partition to <archive_dir>/<name>.csv.gz (with a header row); returns the path"""
+    archive_dir = archive_dir or settings.ACTIVITY_LOG_ARCHIVE_DIR
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    partial_path = path + ".partial"
+    raw_connection = engine.raw_connection()
+    try:
+        with gzip.open(partial_path, "wt", encoding="utf-8") as archive:
+            cursor = raw_connection.cursor()
+            cursor.copy_expert(f"COPY (SELECT * FROM {name} ORDER BY created_at, id) TO STDOUT WITH (FORMAT csv, HEADER)", archive)
+            cursor.close()
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
+    # Only a complete archive gets the final name
+    os.replace(partial_path, path)
+    return path
+
+def drop_partition(engine, name: str):
+    """Detach and drop an (archived) partition"""
+    with engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+
+def is_partitioned(conn) -> bool:
+    return bool(conn.execute(text("""
+        SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent))
+    """), {"parent": PARENT_TABLE}).scalar())
@@ -0,0 +1,19 @@
+"""
+Analytics response cache
+Dashboard / timeline results are shared by every user with the same resolved project scope
+and parameters. Finding and audit writes invalidate the entries of the affected project.
+"""
+from app.core.cache import TTLCache, ALL_PROJECTS_TAG
+from app.core.config import settings
+
+analytics_cache = TTLCache(
+    "analytics",
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+)
+
+def invalidate_analytics_cache(*project_ids: int) -> int:
+    """Drop cached analytics depending on the given projects (and unscoped platform admin entries)"""
+    tags = [("project", project_id) for project_id in project_ids if project_id is not None]
+    tags.append(ALL_PROJECTS_TAG)
+    return analytics_cache.invalidate_tags(tags)
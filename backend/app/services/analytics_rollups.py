@@ -0,0 +1,125 @@
+"""
+Analytics rollups for findings
+Counters in finding_rollups are kept in sync by statement-level triggers on `findings`,
+so every write path (API, template instantiation, copies, cascades, raw SQL) updates them
+in the same transaction. rebuild_finding_rollups() corrects drift; it runs nightly from
+scripts/reconcile_analytics_rollups.py or on demand as a background job (run_rollup_reconcile).
+Only live findings are counted; soft-deleting a finding is an update that moves it out of the
+counts. Findings of soft-deleted audits stay counted and are excluded by the readers.
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.db.database import disable_query_timeouts
+from app.models.job import Job
+from app.services.analytics_cache import analytics_cache
+
+ROLLUP_RECONCILE_JOB = "rollup_reconcile"
+
+# Net change per rollup key: -1 for every old row, +1 for every new row.
+# For updates that do not touch a key column the two cancel out and nothing is written.
+_OLD_ROWS_DELTA = "SELECT audit_id, severity, status, assigned_to_user_id, -1 AS n FROM old_rows WHERE deleted_at IS NULL"
+_NEW_ROWS_DELTA = "SELECT audit_id, severity, status, assigned_to_user_id, 1 AS n FROM new_rows WHERE deleted_at IS NULL"
+
+ROLLUP_TRIGGER_DELTAS = {
+    "insert": _NEW_ROWS_DELTA,
+    "update": f"{_OLD_ROWS_DELTA} UNION ALL {_NEW_ROWS_DELTA}",
+    "delete": _OLD_ROWS_DELTA,
+}
+
+ROLLUP_TRIGGER_FUNCTION_TEMPLATE = """
+CREATE OR REPLACE FUNCTION finding_rollups_after_{op}()
+RETURNS TRIGGER AS $$
+BEGIN
+    WITH delta AS ({delta})
+    INSERT INTO finding_rollups (audit_id, severity, status, assigned_to_user_id, organization_id, project_id, finding_count)
+    SELECT d.audit_id, d.severity, d.status, COALESCE(d.assigned_to_user_id, 0), p.organization_id, a.project_id, sum(d.n)
+    FROM delta d
+    JOIN audits a ON a.id = d.audit_id
+    JOIN projects p ON p.id = a.project_id
+    GROUP BY d.audit_id, d.severity, d.status, COALESCE(d.assigned_to_user_id, 0), p.organization_id, a.project_id
+    HAVING sum(d.n) <> 0
+    ON CONFLICT (audit_id, severity, status, assigned_to_user_id)
+    DO UPDATE SET finding_count = finding_rollups.finding_count + EXCLUDED.finding_count;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+ROLLUP_TRIGGER_TEMPLATE = """
+CREATE TRIGGER finding_rollups_{op}
+AFTER {event} ON findings
+REFERENCING {transition_tables}
+FOR EACH STATEMENT EXECUTE FUNCTION finding_rollups_after_{op}()
+"""
+
+ROLLUP_TRIGGER_TRANSITION_TABLES = {
+    "insert": "NEW TABLE AS new_rows",
+    "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "delete": "OLD TABLE AS old_rows",
+}
+
+def install_rollup_triggers(db: Session):
+    """Create (or replace) the rollup trigger functions and triggers on findings"""
+    for op, delta in ROLLUP_TRIGGER_DELTAS.items():
+        db.execute(text(ROLLUP_TRIGGER_FUNCTION_TEMPLATE.format(op=op, delta=delta)))
+        db.execute(text(f"DROP TRIGGER IF EXISTS finding_rollups_{op} ON findings"))
+        db.execute(text(ROLLUP_TRIGGER_TEMPLATE.format(
+            op=op, event=op.upper(), transition_tables=ROLLUP_TRIGGER_TRANSITION_TABLES[op]
+        )))
+
+def rollup_triggers_installed(db: Session) -> bool:
+    """Check whether the rollup triggers exist on findings"""
+    count = db.execute(text("""
+        SELECT count(*) FROM pg_trigger
+        WHERE tgrelid = 'findings'::regclass AND tgname LIKE 'finding_rollups_%'
+    """)).scalar()
+    return count == len(ROLLUP_TRIGGER_DELTAS)
+
+def rebuild_finding_rollups(db: Session) -> dict:
+    """
+    Recompute rollups from findings and correct any drift.
+    Rollup writers are blocked for the duration, so the result is exact at commit time.
+    Returns the number of rollup rows corrected or removed.
+    """
+    db.execute(text("LOCK TABLE finding_rollups IN SHARE ROW EXCLUSIVE MODE"))
+
+    rollups_upserted = db.execute(text("""
+        INSERT INTO finding_rollups (audit_id, severity, status, assigned_to_user_id, organization_id, project_id, finding_count)
+        SELECT f.audit_id, f.severity, f.status, COALESCE(f.assigned_to_user_id, 0), p.organization_id, a.project_id, count(*)
+        FROM findings f
+        JOIN audits a ON a.id = f.audit_id
+        JOIN projects p ON p.id = a.project_id
+        WHERE f.deleted_at IS NULL
+        GROUP BY f.audit_id, f.severity, f.status, COALESCE(f.assigned_to_user_id, 0), p.organization_id, a.project_id
+        ON CONFLICT (audit_id, severity, status, assigned_to_user_id)
+        DO UPDATE SET finding_count = EXCLUDED.finding_count,
+                      organization_id = EXCLUDED.organization_id,
+                      project_id = EXCLUDED.project_id
+        WHERE finding_rollups.finding_count IS DISTINCT FROM EXCLUDED.finding_count
+           OR finding_rollups.organization_id IS DISTINCT FROM EXCLUDED.organization_id
+           OR finding_rollups.project_id IS DISTINCT FROM EXCLUDED.project_id
+    """)).rowcount
+    rollups_removed = db.execute(text("""
+        DELETE FROM finding_rollups r
+        WHERE NOT EXISTS (
+            SELECT 1 FROM findings f
+            WHERE f.audit_id = r.audit_id
+              AND f.deleted_at IS NULL
+              AND f.severity = r.severity
+              AND f.status = r.status
+              AND COALESCE(f.assigned_to_user_id, 0) = r.assigned_to_user_id
+        )
+    """)).rowcount
+
+    return {
+        "finding_rollups": {"corrected": rollups_upserted, "removed": rollups_removed},
+    }
+
+def run_rollup_reconcile(db: Session, job: Job) -> dict:
+    """Job handler: rebuild_finding_rollups without the API's statement timeout"""
+    disable_query_timeouts(db)
+    result = rebuild_finding_rollups(db)
+    db.commit()
+    analytics_cache.clear()
+    return result
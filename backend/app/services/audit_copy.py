@@ -0,0 +1,85 @@
+"""
+Server-side audit deep copy
+Findings, and optionally their comments and evidence references, are copied in one statement.
+New finding IDs are drawn from the sequence inside a materialized CTE, so the old-ID -> new-ID
+mapping never leaves the database. Copied evidence rows reference the same stored file
+(copy-on-write, see app/services/evidence_files.py). Copies of resolved / closed findings get
+their transition into that status, like findings resolved through the API.
+"""
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.models.finding import Finding, Evidence
+from app.models.template import CLOSED_STATUSES
+from app.services.evidence_files import lock_evidence_paths
+
+CLOSED_STATUS_NAMES = ", ".join(f"'{status.name}'" for status in CLOSED_STATUSES)
+
+AUDIT_COPY_SQL = f"""
+WITH source AS MATERIALIZED (
+    SELECT f.*, nextval(pg_get_serial_sequence('findings', 'id')) AS new_id
+    FROM (SELECT * FROM findings WHERE audit_id = :source_audit_id AND deleted_at IS NULL ORDER BY id) f
+),
+copied_findings AS (
+    INSERT INTO findings (id, audit_id, title, description, control_reference, severity, status,
+                          recommendation, assigned_to_user_id, due_date)
+    SELECT new_id, :target_audit_id, title, description, control_reference, severity, status,
+           recommendation, assigned_to_user_id, due_date
+    FROM source
+    RETURNING id, status
+),
+copied_transitions AS (
+    INSERT INTO finding_status_transitions (finding_id, to_status, changed_by_user_id)
+    SELECT id, status, CAST(:user_id AS INTEGER)
+    FROM copied_findings
+    WHERE status IN ({CLOSED_STATUS_NAMES})
+),
+copied_comments AS (
+    INSERT INTO finding_comments (finding_id, user_id, comment, created_at)
+    SELECT s.new_id, c.user_id, c.comment, c.created_at
+    FROM finding_comments c
+    JOIN source s ON s.id = c.finding_id
+    WHERE :include_comments
+    ORDER BY c.id
+    RETURNING id
+),
+copied_evidences AS (
+    INSERT INTO evidences (finding_id, file_path, file_name, file_size, description, created_at)
+    SELECT s.new_id, e.file_path, e.file_name, e.file_size, e.description, e.created_at
+    FROM evidences e
+    JOIN source s ON s.id = e.finding_id
+    WHERE :include_evidence
+    ORDER BY e.id
+    RETURNING id
+)
+SELECT
+    (SELECT count(*) FROM copied_findings) AS findings,
+    (SELECT count(*) FROM copied_comments) AS comments,
+    (SELECT count(*) FROM copied_evidences) AS evidences
+"""
+
+def copy_audit_contents(
+    db: Session,
+    source_audit_id: int,
+    target_audit_id: int,
+    include_comments: bool = False,
+    include_evidence: bool = False,
+    user_id: Optional[int] = None
+) -> dict:
+    """Copy all findings of source audit into target audit; returns copied row counts"""
+    if include_evidence:
+        # Taken before the copy statement, so its snapshot sees any delete of these files that
+        # finished meanwhile, and deletes wait until the copied rows are committed
+        lock_evidence_paths(db, db.execute(
+            select(Evidence.file_path).distinct()
+            .join(Finding, Evidence.finding_id == Finding.id)
+            .where(Finding.audit_id == source_audit_id)
+        ).scalars().all())
+    row = db.execute(text(AUDIT_COPY_SQL), {
+        "source_audit_id": source_audit_id,
+        "target_audit_id": target_audit_id,
+        "include_comments": include_comments,
+        "include_evidence": include_evidence,
+        "user_id": user_id,
+    }).one()
+    return {"findings": row.findings, "comments": row.comments, "evidences": row.evidences}
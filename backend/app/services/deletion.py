@@ -0,0 +1,78 @@
+"""
+Set-based deletes
+Projects, audits and organizations are removed with single DELETE statements; ON DELETE CASCADE
+foreign keys take care of audits, findings, comments, evidences and assignments inside the
+database, so nothing is loaded into the identity map. Evidence files are collected with one
+query beforehand and returned for removal after commit (see remove_evidence_files).
+The API soft-deletes by default (deleted_at, see app/db/soft_delete.py); these run for
+permanent deletes and from the purger.
+"""
+from sqlalchemy import select, delete, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import List
+from app.models.audit import Audit
+from app.models.finding import Finding, Evidence
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.template import Template
+from app.services.evidence_files import unreferenced_evidence_paths
+
+def audit_evidence_paths(db: Session, *audit_filters) -> List[str]:
+    return db.execute(
+        select(Evidence.file_path).distinct()
+        .join(Finding, Evidence.finding_id == Finding.id)
+        .join(Audit, Finding.audit_id == Audit.id)
+        .where(*audit_filters)
+        .execution_options(include_deleted=True)
+    ).scalars().all()
+
+def delete_audit_cascade(db: Session, audit_id: int) -> List[str]:
+    """Delete an audit with its findings; returns evidence files that became unreferenced"""
+    evidence_paths = audit_evidence_paths(db, Audit.id == audit_id)
+    db.execute(delete(Audit).where(Audit.id == audit_id))
+    return unreferenced_evidence_paths(db, evidence_paths)
+
+def delete_project_cascade(db: Session, project_id: int) -> List[str]:
+    """Delete a project with everything below it; returns evidence files that became unreferenced"""
+    evidence_paths = audit_evidence_paths(db, Audit.project_id == project_id)
+    db.execute(delete(Project).where(Project.id == project_id))
+    return unreferenced_evidence_paths(db, evidence_paths)
+
+def delete_organization_cascade(db: Session, organization_id: int) -> List[str]:
+    """
+    Delete an organization with its projects, templates and users.
+    Projects go first so comments are removed before their authors (finding_comments.user_id is NOT NULL).
+    """
+    organization_projects = select(Project.id).where(Project.organization_id == organization_id)
+    evidence_paths = audit_evidence_paths(db, Audit.project_id.in_(organization_projects))
+    db.execute(delete(Project).where(Project.organization_id == organization_id))
+    db.execute(delete(Template).where(Template.organization_id == organization_id))
+    db.execute(delete(Organization).where(Organization.id == organization_id))
+    return unreferenced_evidence_paths(db, evidence_paths)
+
+def soft_delete_project(db: Session, project_id: int):
+    """Flag a project and its live audits as deleted with one timestamp (restore undoes exactly these)"""
+    deleted_at = datetime.now(timezone.utc)
+    db.execute(update(Project).where(Project.id == project_id).values(deleted_at=deleted_at))
+    db.execute(
+        update(Audit)
+        .where(Audit.project_id == project_id, Audit.deleted_at.is_(None))
+        .values(deleted_at=deleted_at)
+    )
+
+def restore_project(db: Session, project: Project):
+    """Restore a soft-deleted project and the audits that were deleted together with it"""
+    db.execute(
+        update(Audit)
+        .where(Audit.project_id == project.id, Audit.deleted_at == project.deleted_at)
+        .values(deleted_at=None)
+    )
+    project.deleted_at = None
+
+def soft_delete_audit(db: Session, audit_id: int):
+    """Flag an audit as deleted; its findings are hidden through the audit"""
+    db.execute(update(Audit).where(Audit.id == audit_id).values(deleted_at=datetime.now(timezone.utc)))
+
+def soft_delete_finding(db: Session, finding_id: int):
+    db.execute(update(Finding).where(Finding.id == finding_id).values(deleted_at=datetime.now(timezone.utc)))
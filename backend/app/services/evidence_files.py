@@ -0,0 +1,70 @@
+"""
+Evidence file storage
+Evidence rows may share a stored file (audit copies reference the same upload, copy-on-write),
+so a file is only removed from disk once no evidence row points at it any more.
+Copies and deletes take a transaction-level advisory lock per file path (lock_evidence_paths),
+and removal re-checks the references under the same locks after the deleting transaction
+committed, so a copy racing a delete can never leave a live row pointing at a removed file.
+"""
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from typing import Iterable, List
+import os
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.finding import Evidence
+
+# Sorted, so concurrent lockers of overlapping path sets cannot deadlock
+EVIDENCE_PATH_LOCK_SQL = text("""
+    SELECT pg_advisory_xact_lock(hashtext(path))
+    FROM (SELECT DISTINCT path FROM unnest(CAST(:paths AS TEXT[])) AS path ORDER BY path) paths
+""")
+
+def lock_evidence_paths(db: Session, file_paths: Iterable[str]):
+    """Serialize evidence copies and deletes sharing these files until the transaction ends"""
+    file_paths = sorted(set(path for path in file_paths if path))
+    if file_paths:
+        db.execute(EVIDENCE_PATH_LOCK_SQL, {"paths": file_paths}).all()
+
+def _referenced_paths(db: Session, file_paths: List[str]) -> set:
+    return set(db.execute(
+        select(Evidence.file_path).where(Evidence.file_path.in_(file_paths)).distinct()
+    ).scalars().all())
+
+def unreferenced_evidence_paths(db: Session, file_paths: Iterable[str]) -> List[str]:
+    """
+    Stored file paths (relative to UPLOAD_DIR) no longer referenced by any evidence row.
+    Call after the deleting statements have been flushed.
+    """
+    file_paths = sorted(set(path for path in file_paths if path))
+    if not file_paths:
+        return []
+    # Wait for copies of these files in flight; their rows are visible once they committed
+    lock_evidence_paths(db, file_paths)
+    return sorted(set(file_paths) - _referenced_paths(db, file_paths))
+
+def remove_evidence_files(file_paths: Iterable[str]):
+    """
+    Remove stored evidence files from disk; call after the deleting transaction committed.
+    References are checked again under the path locks, in case a copy committed in between.
+    """
+    file_paths = sorted(set(path for path in file_paths if path))
+    if not file_paths:
+        return
+    db = SessionLocal()
+    try:
+        lock_evidence_paths(db, file_paths)
+        still_referenced = _referenced_paths(db, file_paths)
+        for relative_path in file_paths:
+            if relative_path in still_referenced:
+                continue
+            file_path = os.path.join(settings.UPLOAD_DIR, relative_path)
+            if os.path.exists(file_path):
+                try:
+                    os.remove(file_path)
+                except OSError as e:
+                    print(f"Warning: Could not delete evidence file {file_path}: {e}")
+        # Ends the transaction and releases the locks only once the files are gone
+        db.commit()
+    finally:
+        db.close()
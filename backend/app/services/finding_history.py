@@ -0,0 +1,86 @@
+"""
+Finding status history
+Typed status transitions written alongside the activity log, so remediation analytics can use
+indexed range scans instead of parsing ActivityLog.details.
+"""
+from sqlalchemy import Integer, insert, literal, select, text
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.models.finding import Finding, FindingStatusTransition
+from app.models.template import Status, CLOSED_STATUSES
+
+def record_status_transition(
+    db: Session,
+    finding_id: int,
+    from_status: Optional[Status],
+    to_status: Status,
+    user_id: Optional[int] = None
+):
+    """Record a finding status change (no-op when the status did not change)"""
+    if from_status == to_status:
+        return None
+    transition = FindingStatusTransition(
+        finding_id=finding_id,
+        from_status=from_status,
+        to_status=to_status,
+        changed_by_user_id=user_id
+    )
+    db.add(transition)
+    return transition
+
+def record_entry_transitions(db: Session, *finding_filters, user_id: Optional[int] = None) -> int:
+    """
+    Record the transition into their current status of resolved / closed findings that appear
+    without going through update_finding (template, copy, restore), unless their history already
+    ends in that status. One INSERT ... SELECT; returns the number of transitions recorded.
+    """
+    latest_status = (
+        select(FindingStatusTransition.to_status)
+        .where(FindingStatusTransition.finding_id == Finding.id)
+        .order_by(FindingStatusTransition.changed_at.desc(), FindingStatusTransition.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    entering = select(Finding.id, Finding.status, literal(user_id, Integer)).where(
+        *finding_filters,
+        Finding.deleted_at.is_(None),
+        Finding.status.in_(CLOSED_STATUSES),
+        latest_status.is_distinct_from(Finding.status)
+    )
+    return db.execute(
+        insert(FindingStatusTransition).from_select(["finding_id", "to_status", "changed_by_user_id"], entering)
+    ).rowcount
+
+def backfill_status_transitions(db: Session) -> int:
+    """
+    Populate finding_status_transitions from "updated" activity log entries.
+    Status changes were logged as str(old)/str(new), i.e. 'Status.OPEN' (or 'open' in older
+    rows); both map onto the enum names stored by PostgreSQL. Findings that already have
+    transitions are skipped, so the backfill can be re-run safely.
+    """
+    status_type = Finding.__table__.c.status.type.name
+    status_names = ", ".join(f"'{member.name}'" for member in Status)
+    result = db.execute(text(f"""
+        INSERT INTO finding_status_transitions (finding_id, from_status, to_status, changed_by_user_id, changed_at)
+        SELECT l.entity_id,
+               CASE WHEN l.old_name IN ({status_names}) THEN CAST(l.old_name AS {status_type}) END,
+               CAST(l.new_name AS {status_type}),
+               l.user_id,
+               l.created_at
+        FROM (
+            SELECT entity_id, user_id, created_at,
+                   upper(regexp_replace(details->'changes'->'status'->>'old', '^Status\\.', '')) AS old_name,
+                   upper(regexp_replace(details->'changes'->'status'->>'new', '^Status\\.', '')) AS new_name
+            FROM activity_logs
+            WHERE entity_type = 'finding'
+              AND action = 'updated'
+              AND details->'changes'->'status' IS NOT NULL
+        ) l
+        JOIN findings f ON f.id = l.entity_id
+        WHERE l.new_name IN ({status_names})
+          AND l.created_at IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM finding_status_transitions t WHERE t.finding_id = l.entity_id
+          )
+    """))
+    return result.rowcount
@@ -0,0 +1,171 @@
+"""
+Findings spreadsheet export (CSV / XLSX)
+Rows are streamed from a server-side cursor so exports run in constant memory
+"""
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Callable, Iterator, List
+import csv
+import io
+import os
+import tempfile
+from app.db.database import disable_query_timeouts
+from app.db.read_routing import routed_session_factory
+from app.models.audit import Audit
+from app.models.finding import Finding
+from app.models.project import Project
+from app.models.user import User
+from app.core.i18n import get_severity_label, get_status_label
+
+EXPORT_FORMATS = ["csv", "xlsx"]
+
+# Number of rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_HEADERS = {
+    "tr": [
+        "Proje", "Denetim", "Bulgu ID", "Kontrol Referansı", "Başlık", "Önem Derecesi", "Durum",
+        "Atanan Kişi", "Atanan E-posta", "Son Tarih", "Oluşturulma Tarihi", "Açıklama", "Öneri",
+    ],
+    "en": [
+        "Project", "Audit", "Finding ID", "Control Reference", "Title", "Severity", "Status",
+        "Assignee", "Assignee Email", "Due Date", "Created At", "Description", "Recommendation",
+    ],
+}
+
+def build_findings_export_query(filters: list):
+    """Flat row query for the export; assignee names come from the same statement via an outer join."""
+    return (
+        select(
+            Project.name,
+            Audit.name,
+            Finding.id,
+            Finding.control_reference,
+            Finding.title,
+            Finding.severity,
+            Finding.status,
+            User.full_name,
+            User.email,
+            Finding.due_date,
+            Finding.created_at,
+            Finding.description,
+            Finding.recommendation,
+        )
+        .join(Audit, Finding.audit_id == Audit.id)
+        .join(Project, Audit.project_id == Project.id)
+        .outerjoin(User, Finding.assigned_to_user_id == User.id)
+        .where(*filters)
+        .order_by(Project.id, Audit.id, Finding.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+# A cell starting with one of these is evaluated as a formula by Excel / LibreOffice
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _neutralize_formula(value):
+    """Prefix user text that a spreadsheet would run as a formula with ' (CSV / formula injection)"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def _format_row(row, lang: str) -> list:
+    (project_name, audit_name, finding_id, control_reference, title, severity, status,
+     assignee_name, assignee_email, due_date, created_at, description, recommendation) = row
+    text = _neutralize_formula
+    return [
+        text(project_name),
+        text(audit_name),
+        finding_id,
+        text(control_reference),
+        text(title),
+        get_severity_label(severity, lang),
+        get_status_label(status, lang),
+        text(assignee_name),
+        text(assignee_email),
+        due_date,
+        created_at,
+        text(description),
+        text(recommendation),
+    ]
+
+def iter_findings_csv(session_factory: Callable[[], Session], filters: list, lang: str = "tr") -> Iterator[str]:
+    """
+    Yield the CSV export chunk by chunk.
+    Uses its own session because the generator outlives the request handler; session_factory
+    points at the database the request was routed to (replica or primary).
+    """
+    db = session_factory()
+    try:
+        # The client paces the stream: the transaction sits idle between chunks
+        disable_query_timeouts(db)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # BOM so Excel opens UTF-8 (Turkish characters) correctly
+        buffer.write("\ufeff")
+        writer.writerow(EXPORT_HEADERS.get(lang, EXPORT_HEADERS["tr"]))
+
+        for partition in db.execute(build_findings_export_query(filters)).partitions():
+            for row in partition:
+                values = _format_row(row, lang)
+                writer.writerow([v.isoformat() if isinstance(v, datetime) else v for v in values])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        remaining = buffer.getvalue()
+        if remaining:
+            yield remaining
+    finally:
+        db.close()
+
+def _xlsx_value(value):
+    if isinstance(value, datetime):
+        # Excel has no timezone support
+        return value.replace(tzinfo=None)
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    return value
+
+def write_findings_xlsx(db: Session, filters: list, lang: str = "tr") -> str:
+    """Write the XLSX export with a write-only workbook and return the temp file path"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Findings" if lang == "en" else "Bulgular")
+    ws.append(EXPORT_HEADERS.get(lang, EXPORT_HEADERS["tr"]))
+
+    disable_query_timeouts(db)
+    for row in db.execute(build_findings_export_query(filters)):
+        ws.append([_xlsx_value(v) for v in _format_row(row, lang)])
+
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
+    temp_path = temp_file.name
+    temp_file.close()
+
+    wb.save(temp_path)
+    return temp_path
+
+def findings_export_response(db: Session, export_format: str, filters: List, lang: str, filename: str):
+    """Build the streaming response for a findings export in the requested format"""
+    if export_format == "csv":
+        return StreamingResponse(
+            iter_findings_csv(routed_session_factory(db), filters, lang),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'}
+        )
+    if export_format == "xlsx":
+        xlsx_path = write_findings_xlsx(db, filters, lang)
+        return FileResponse(
+            xlsx_path,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            filename=f"{filename}.xlsx",
+            background=BackgroundTask(os.remove, xlsx_path)
+        )
+    raise HTTPException(
+        status_code=400,
+        detail=f"Unsupported export format '{export_format}'. Supported formats: {', '.join(EXPORT_FORMATS)}"
+    )
@@ -0,0 +1,190 @@
+"""
+Background jobs
+Jobs run in the worker's thread pool after the response has been sent (FastAPI BackgroundTasks)
+with their own database session; progress is committed as the job advances so clients can poll
+GET /jobs/{id}. While the handler runs, a heartbeat thread bumps updated_at from its own
+connection (long statements included): a job interrupted by a worker restart stops beating and
+is marked failed by fail_stale_jobs when a worker starts. Job types can register a cleanup that
+undoes the partial work of a failed job (see register_job_cleanup).
+Every status and progress write only applies while the job is still running, so a job failed by
+the sweep is never revived by its runner; the runner stops at its next progress update.
+"""
+from sqlalchemy import or_, and_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+import logging
+import threading
+import traceback
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# job_type -> cleanup(db, job), run in the transaction that marks the job failed
+_job_cleanups: Dict[str, Callable[[Session, Job], None]] = {}
+
+class JobAborted(Exception):
+    """The job is no longer running (failed by fail_stale_jobs meanwhile); its handler must stop"""
+
+def register_job_cleanup(job_type: str, cleanup: Callable[[Session, Job], None]):
+    _job_cleanups[job_type] = cleanup
+
+def create_job(db: Session, job_type: str, user_id: Optional[int] = None, parameters: Optional[Dict[str, Any]] = None) -> Job:
+    """Add a pending job (committed by the caller)"""
+    job = Job(
+        job_type=job_type,
+        status=JobStatus.PENDING,
+        parameters=parameters or {},
+        created_by_user_id=user_id
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+def _update_job(db: Session, job_id: int, status: JobStatus, **values) -> bool:
+    """UPDATE the job only while it has the given status; False when no row matched"""
+    statement = (
+        update(Job)
+        .where(Job.id == job_id, Job.status == status)
+        .values(updated_at=func.now(), **values)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(statement).rowcount > 0
+
+def update_job_progress(db: Session, job: Job, completed_steps: int, total_steps: Optional[int] = None, message: Optional[str] = None):
+    """
+    Update progress counters (persisted with the caller's next commit).
+    Raises JobAborted when the job is no longer running; the caller's work is then rolled back.
+    """
+    values: Dict[str, Any] = {"completed_steps": completed_steps}
+    if total_steps is None:
+        total_steps = job.total_steps
+    else:
+        values["total_steps"] = total_steps
+    if total_steps:
+        values["progress"] = min(100, int(completed_steps * 100 / total_steps))
+    if message is not None:
+        values["message"] = message
+    # Waits for the sweep's row lock, so a concurrent fail_stale_jobs either sees this
+    # progress or wins and the update matches nothing
+    if not _update_job(db, job.id, JobStatus.RUNNING, **values):
+        raise JobAborted(f"Job {job.id} is no longer running")
+    # The job object is expired by the commit and reloaded on next access
+    db.expire(job)
+
+def _fail_job(db: Session, job: Job, error: str):
+    """Mark a job failed and undo its partial work (committed by the caller)"""
+    job.status = JobStatus.FAILED
+    job.error = error
+    job.finished_at = func.now()
+    cleanup = _job_cleanups.get(job.job_type)
+    if cleanup:
+        cleanup(db, job)
+
+class JobHeartbeat:
+    """Bumps updated_at of a running job every interval from its own connection until stopped"""
+    
+    def __init__(self, job_id: int, interval_seconds: Optional[float] = None):
+        self.job_id = job_id
+        self.interval_seconds = interval_seconds or settings.JOB_HEARTBEAT_SECONDS
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"job-{job_id}-heartbeat", daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+    
+    def _run(self):
+        jobs = Job.__table__
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                with engine.begin() as conn:
+                    beating = conn.execute(
+                        update(jobs)
+                        .where(jobs.c.id == self.job_id, jobs.c.status == JobStatus.RUNNING)
+                        .values(updated_at=func.now())
+                    ).rowcount
+            except SQLAlchemyError as e:
+                # A missed beat is harmless as long as the next ones get through
+                logger.warning(f"Job {self.job_id} heartbeat failed: {e}")
+                continue
+            if not beating:
+                return
+
+def run_job(job_id: int, handler: Callable[[Session, Job], Optional[Dict[str, Any]]]):
+    """
+    Execute handler(db, job) for a pending job and record the outcome.
+    The handler commits its own units of work; its return value is stored as the job result.
+    """
+    db = SessionLocal()
+    heartbeat = None
+    try:
+        started = _update_job(db, job_id, JobStatus.PENDING, status=JobStatus.RUNNING, started_at=func.now())
+        db.commit()
+        if not started:
+            return
+        job = db.query(Job).filter(Job.id == job_id).first()
+        heartbeat = JobHeartbeat(job_id)
+        heartbeat.start()
+        
+        try:
+            result = handler(db, job)
+        except JobAborted as e:
+            db.rollback()
+            logger.warning(f"Job {job_id} ({job.job_type}) stopped: {e}")
+            return
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Job {job_id} ({job.job_type}) failed: {e}\n{traceback.format_exc()}")
+            # Failed (and cleaned up) by the sweep already when no longer running
+            job = db.query(Job).filter(Job.id == job_id, Job.status == JobStatus.RUNNING).with_for_update().first()
+            if job:
+                _fail_job(db, job, str(e))
+            db.commit()
+            return
+        
+        finished = _update_job(
+            db, job_id, JobStatus.RUNNING,
+            status=JobStatus.SUCCEEDED, progress=100, result=result, finished_at=func.now()
+        )
+        if not finished:
+            db.rollback()
+            logger.warning(f"Job {job_id} ({job.job_type}) finished after it had been marked failed; keeping it failed")
+            return
+        db.commit()
+    finally:
+        if heartbeat:
+            heartbeat.stop()
+        db.close()
+
+def fail_stale_jobs(stale_after_seconds: Optional[int] = None) -> int:
+    """
+    Mark jobs without a heartbeat for stale_after_seconds failed: running jobs of a killed worker,
+    and pending jobs whose worker died before starting them. Returns the number of jobs failed.
+    """
+    if stale_after_seconds is None:
+        stale_after_seconds = settings.JOB_STALE_AFTER_SECONDS
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after_seconds)
+    db = SessionLocal()
+    try:
+        # SKIP LOCKED: several workers start at once, each job is failed by one of them
+        stale_jobs = db.query(Job).filter(
+            or_(
+                and_(Job.status == JobStatus.RUNNING, Job.updated_at < cutoff),
+                and_(Job.status == JobStatus.PENDING, Job.created_at < cutoff)
+            )
+        ).with_for_update(skip_locked=True).all()
+        for job in stale_jobs:
+            logger.warning(f"Job {job.id} ({job.job_type}) has no progress since {job.updated_at}; marking it failed")
+            _fail_job(db, job, "Interrupted: the worker running this job stopped")
+        db.commit()
+        return len(stale_jobs)
+    finally:
+        db.close()
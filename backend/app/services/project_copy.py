@@ -0,0 +1,93 @@
+"""
+Project deep copy
+The project row and its user assignments are copied in the request; audits are cloned with one
+INSERT ... SELECT (ID mapping drawn from the sequence inside the database) and their findings,
+comments and evidence references audit by audit in a background job, committing progress after
+each audit. Nothing of the source graph is loaded into Python. A failed or interrupted copy
+moves the incomplete target project to the trash (soft delete), from where it can still be
+restored or is purged with the other deleted rows.
+"""
+from sqlalchemy import select, insert, literal, text
+from sqlalchemy.orm import Session
+from app.db.database import disable_query_timeouts
+from app.models.audit import AuditStatus
+from app.models.job import Job
+from app.models.project import Project, ProjectUser
+from app.services.audit_copy import copy_audit_contents
+from app.services.analytics_cache import invalidate_analytics_cache
+from app.services.deletion import soft_delete_project
+from app.services.jobs import register_job_cleanup, update_job_progress
+
+PROJECT_COPY_JOB = "project_copy"
+
+PROJECT_AUDITS_COPY_SQL = """
+WITH source AS MATERIALIZED (
+    SELECT a.id, nextval(pg_get_serial_sequence('audits', 'id')) AS new_id
+    FROM (SELECT id FROM audits WHERE project_id = :source_project_id AND deleted_at IS NULL ORDER BY id) a
+),
+copied_audits AS (
+    INSERT INTO audits (id, name, description, standard, project_id, audit_date, status)
+    SELECT s.new_id, a.name, a.description, a.standard, :target_project_id, a.audit_date, :status
+    FROM source s
+    JOIN audits a ON a.id = s.id
+    ORDER BY s.id
+)
+SELECT id AS source_audit_id, new_id AS target_audit_id FROM source ORDER BY id
+"""
+
+def copy_project_assignments(db: Session, source_project_id: int, target_project_id: int):
+    """Copy user assignments from source to target project"""
+    db.execute(
+        insert(ProjectUser).from_select(
+            ["project_id", "user_id"],
+            select(literal(target_project_id), ProjectUser.user_id).where(ProjectUser.project_id == source_project_id)
+        )
+    )
+
+def run_project_copy(db: Session, job: Job) -> dict:
+    """Job handler: clone audits and their contents of parameters["source_project_id"] into the target project"""
+    parameters = job.parameters
+    source_project_id = parameters["source_project_id"]
+    target_project_id = parameters["target_project_id"]
+    
+    # Each commit ends the transaction and with it the lifted timeouts
+    disable_query_timeouts(db)
+    # New audits start in planning, like copy_audit
+    audit_pairs = db.execute(text(PROJECT_AUDITS_COPY_SQL), {
+        "source_project_id": source_project_id,
+        "target_project_id": target_project_id,
+        "status": AuditStatus.PLANNING.value,
+    }).all()
+    update_job_progress(db, job, 0, total_steps=len(audit_pairs), message=f"{len(audit_pairs)} audits created")
+    db.commit()
+    
+    totals = {"findings": 0, "comments": 0, "evidences": 0}
+    for index, (source_audit_id, target_audit_id) in enumerate(audit_pairs, start=1):
+        disable_query_timeouts(db)
+        copied = copy_audit_contents(
+            db,
+            source_audit_id=source_audit_id,
+            target_audit_id=target_audit_id,
+            include_comments=parameters.get("include_comments", False),
+            include_evidence=parameters.get("include_evidence", False),
+            user_id=job.created_by_user_id
+        )
+        for key in totals:
+            totals[key] += copied[key]
+        update_job_progress(db, job, index, message=f"Audit {index}/{len(audit_pairs)} copied")
+        db.commit()
+    
+    invalidate_analytics_cache(target_project_id)
+    return {"project_id": target_project_id, "audits": len(audit_pairs), **totals}
+
+def discard_partial_copy(db: Session, job: Job):
+    """Job cleanup: trash the target project of a failed copy instead of leaving it half filled"""
+    target_project_id = (job.parameters or {}).get("target_project_id")
+    # Already deleted by a user: keep that deletion (its timestamp links the audits deleted with it)
+    if target_project_id is None or not db.query(Project.id).filter(Project.id == target_project_id).first():
+        return
+    soft_delete_project(db, target_project_id)
+    job.message = f"Copy incomplete; project {target_project_id} moved to trash"
+    invalidate_analytics_cache(target_project_id)
+
+register_job_cleanup(PROJECT_COPY_JOB, discard_partial_copy)
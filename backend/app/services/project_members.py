@@ -0,0 +1,37 @@
+"""
+Project membership
+Assignments are applied as a set diff: candidate users are validated with one IN query and only
+added / removed members are written, so reassigning a large team takes a constant number of
+round trips and an unchanged list writes nothing.
+"""
+from sqlalchemy import select, insert, delete
+from sqlalchemy.orm import Session
+from typing import Iterable
+from app.models.project import ProjectUser
+from app.models.user import User
+
+def sync_project_members(db: Session, project_id: int, organization_id: int, user_ids: Iterable[int]) -> dict:
+    """
+    Make the project's assigned users exactly user_ids.
+    Unknown users and users of other organizations are ignored.
+    Returns the added and removed user IDs.
+    """
+    requested_ids = set(user_ids)
+    valid_ids = set()
+    if requested_ids:
+        valid_ids = set(db.execute(
+            select(User.id).where(User.id.in_(requested_ids), User.organization_id == organization_id)
+        ).scalars().all())
+    current_ids = set(db.execute(
+        select(ProjectUser.user_id).where(ProjectUser.project_id == project_id)
+    ).scalars().all())
+
+    added_ids = sorted(valid_ids - current_ids)
+    removed_ids = sorted(current_ids - valid_ids)
+    if removed_ids:
+        db.execute(
+            delete(ProjectUser).where(ProjectUser.project_id == project_id, ProjectUser.user_id.in_(removed_ids))
+        )
+    if added_ids:
+        db.execute(insert(ProjectUser), [{"project_id": project_id, "user_id": user_id} for user_id in added_ids])
+    return {"added": added_ids, "removed": removed_ids}
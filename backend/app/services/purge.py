@@ -0,0 +1,80 @@
+"""
+Purge of soft-deleted rows
+Rows whose deleted_at is older than the retention window are hard-deleted in small batches,
+one transaction per batch with a pause in between, so the purge never holds locks on the
+hot tables for long. Findings go first (including those of expired audits), then audits,
+then projects, so the cascades of the later phases are nearly empty.
+"""
+from sqlalchemy import select, delete, or_
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import time
+from app.core.config import settings
+from app.models.audit import Audit
+from app.models.finding import Finding, Evidence
+from app.models.project import Project
+from app.services.deletion import audit_evidence_paths
+from app.services.evidence_files import unreferenced_evidence_paths, remove_evidence_files
+
+def _purge_in_batches(db: Session, model, expired_condition, evidence_paths_for, batch_size: int, pause_seconds: float) -> int:
+    """Delete rows of model matching expired_condition batch by batch; returns the number deleted"""
+    purged = 0
+    while True:
+        batch_ids = db.execute(
+            select(model.id)
+            .where(expired_condition)
+            .order_by(model.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .execution_options(include_deleted=True)
+        ).scalars().all()
+        if not batch_ids:
+            return purged
+
+        evidence_paths = evidence_paths_for(batch_ids)
+        db.execute(delete(model).where(model.id.in_(batch_ids)))
+        orphaned_paths = unreferenced_evidence_paths(db, evidence_paths)
+        db.commit()
+        remove_evidence_files(orphaned_paths)
+
+        purged += len(batch_ids)
+        if len(batch_ids) < batch_size:
+            return purged
+        time.sleep(pause_seconds)
+
+def _finding_evidence_paths(db: Session, finding_ids):
+    return db.execute(
+        select(Evidence.file_path).distinct().where(Evidence.finding_id.in_(finding_ids))
+    ).scalars().all()
+
+def purge_soft_deleted(
+    db: Session,
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None
+) -> dict:
+    """Hard-delete projects, audits and findings soft-deleted before the retention window"""
+    retention_days = settings.SOFT_DELETE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    pause_seconds = settings.PURGE_BATCH_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+    expired_audits = select(Audit.id).where(Audit.deleted_at < cutoff)
+    findings = _purge_in_batches(
+        db, Finding,
+        or_(Finding.deleted_at < cutoff, Finding.audit_id.in_(expired_audits)),
+        lambda ids: _finding_evidence_paths(db, ids),
+        batch_size, pause_seconds
+    )
+    audits = _purge_in_batches(
+        db, Audit, Audit.deleted_at < cutoff,
+        lambda ids: audit_evidence_paths(db, Audit.id.in_(ids)),
+        batch_size, pause_seconds
+    )
+    projects = _purge_in_batches(
+        db, Project, Project.deleted_at < cutoff,
+        lambda ids: audit_evidence_paths(db, Audit.project_id.in_(ids)),
+        batch_size, pause_seconds
+    )
+    return {"findings": findings, "audits": audits, "projects": projects, "cutoff": cutoff.isoformat()}
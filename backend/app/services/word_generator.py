@@ -8,10 +8,16 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_BREAK
 from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, selectinload
+from app.db.database import disable_query_timeouts
 from app.models.audit import Audit
+from app.models.finding import Finding
+from app.models.project import Project
 from app.models.template import Severity, Status
+from app.core.i18n import get_severity_label, get_status_label
 from datetime import datetime
+from typing import Optional
 import tempfile
 from collections import Counter
 
@@ -33,23 +39,10 @@ STATUS_COLORS = {
 }
 
 def get_severity_text(severity: Severity) -> str:
-    texts = {
-        Severity.CRITICAL: "Kritik",
-        Severity.HIGH: "Yüksek",
-        Severity.MEDIUM: "Orta",
-        Severity.LOW: "Düşük",
-        Severity.INFO: "Bilgi"
-    }
-    return texts.get(severity, severity.value.upper())
+    return get_severity_label(severity, "tr")
 
 def get_status_text(status: Status) -> str:
-    texts = {
-        Status.OPEN: "Açık",
-        Status.IN_PROGRESS: "Devam Ediyor",
-        Status.RESOLVED: "Çözüldü",
-        Status.CLOSED: "Kapatıldı"
-    }
-    return texts.get(status, status.value.upper())
+    return get_status_label(status, "tr")
 
 def add_cover_page(doc: Document, audit: Audit, organization, project):
     """Add professional cover page"""
@@ -218,70 +211,74 @@ def add_findings_section(doc: Document, findings):
         return
     
     for idx, finding in enumerate(findings, 1):
-        # Finding heading
-        finding_heading = doc.add_heading(f"BULGU #{idx}: {finding.title}", level=2)
-        finding_heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        
-        # Severity and Status badges
-        badge_para = doc.add_paragraph()
-        badge_para.paragraph_format.space_after = Pt(6)
-        
-        # Severity badge
-        severity_run = badge_para.add_run(f"Önem Derecesi: {get_severity_text(finding.severity)}")
-        severity_run.font.bold = True
-        severity_run.font.size = Pt(10)
-        severity_run.font.color.rgb = SEVERITY_COLORS.get(finding.severity, RGBColor(0, 0, 0))
-        severity_run.add_text("  |  ")
-        
-        # Status badge
-        status_run = badge_para.add_run(f"Durum: {get_status_text(finding.status)}")
-        status_run.font.bold = True
-        status_run.font.size = Pt(10)
-        status_run.font.color.rgb = STATUS_COLORS.get(finding.status, RGBColor(0, 0, 0))
-        
-        # Control reference
-        if finding.control_reference:
-            ref_para = doc.add_paragraph()
-            ref_para.add_run("Kontrol Referansı: ").font.bold = True
-            ref_para.add_run(finding.control_reference).font.size = Pt(11)
-        
-        # Description
-        if finding.description:
-            desc_para = doc.add_paragraph()
-            desc_para.add_run("Açıklama:").font.bold = True
-            desc_para.add_run().font.size = Pt(11)
-            
-            desc_content = doc.add_paragraph(finding.description)
-            desc_content.runs[0].font.size = Pt(11)
-            desc_content.paragraph_format.space_after = Pt(6)
+        add_finding_entry(doc, idx, finding)
+
+def add_finding_entry(doc: Document, idx: int, finding):
+    """Add a single finding with its badges, details and evidence list"""
+    # Finding heading
+    finding_heading = doc.add_heading(f"BULGU #{idx}: {finding.title}", level=2)
+    finding_heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    
+    # Severity and Status badges
+    badge_para = doc.add_paragraph()
+    badge_para.paragraph_format.space_after = Pt(6)
+    
+    # Severity badge
+    severity_run = badge_para.add_run(f"Önem Derecesi: {get_severity_text(finding.severity)}")
+    severity_run.font.bold = True
+    severity_run.font.size = Pt(10)
+    severity_run.font.color.rgb = SEVERITY_COLORS.get(finding.severity, RGBColor(0, 0, 0))
+    severity_run.add_text("  |  ")
+    
+    # Status badge
+    status_run = badge_para.add_run(f"Durum: {get_status_text(finding.status)}")
+    status_run.font.bold = True
+    status_run.font.size = Pt(10)
+    status_run.font.color.rgb = STATUS_COLORS.get(finding.status, RGBColor(0, 0, 0))
+    
+    # Control reference
+    if finding.control_reference:
+        ref_para = doc.add_paragraph()
+        ref_para.add_run("Kontrol Referansı: ").font.bold = True
+        ref_para.add_run(finding.control_reference).font.size = Pt(11)
+    
+    # Description
+    if finding.description:
+        desc_para = doc.add_paragraph()
+        desc_para.add_run("Açıklama:").font.bold = True
+        desc_para.add_run().font.size = Pt(11)
         
-        # Recommendation
-        if finding.recommendation:
-            rec_para = doc.add_paragraph()
-            rec_para.add_run("Öneri:").font.bold = True
-            rec_para.add_run().font.size = Pt(11)
-            
-            rec_content = doc.add_paragraph(finding.recommendation)
-            rec_content.runs[0].font.size = Pt(11)
-            rec_content.paragraph_format.space_after = Pt(6)
+        desc_content = doc.add_paragraph(finding.description)
+        desc_content.runs[0].font.size = Pt(11)
+        desc_content.paragraph_format.space_after = Pt(6)
+    
+    # Recommendation
+    if finding.recommendation:
+        rec_para = doc.add_paragraph()
+        rec_para.add_run("Öneri:").font.bold = True
+        rec_para.add_run().font.size = Pt(11)
         
-        # Evidence count
-        if finding.evidences:
-            evid_para = doc.add_paragraph()
-            evid_para.add_run(f"Kanıt Sayısı: {len(finding.evidences)}").font.bold = True
-            evid_para.add_run().font.size = Pt(11)
-            
-            for evidence in finding.evidences:
-                evid_item = doc.add_paragraph(f"  • {evidence.file_name}", style='List Bullet')
-                evid_item.runs[0].font.size = Pt(10)
-                if evidence.description:
-                    evid_desc = doc.add_paragraph(f"    Açıklama: {evidence.description}", style='List Bullet 2')
-                    evid_desc.runs[0].font.size = Pt(9)
-                    evid_desc.runs[0].font.color.rgb = RGBColor(107, 114, 128)
+        rec_content = doc.add_paragraph(finding.recommendation)
+        rec_content.runs[0].font.size = Pt(11)
+        rec_content.paragraph_format.space_after = Pt(6)
+    
+    # Evidence count
+    if finding.evidences:
+        evid_para = doc.add_paragraph()
+        evid_para.add_run(f"Kanıt Sayısı: {len(finding.evidences)}").font.bold = True
+        evid_para.add_run().font.size = Pt(11)
         
-        # Add spacing between findings
-        doc.add_paragraph()
-        doc.add_paragraph()
+        for evidence in finding.evidences:
+            evid_item = doc.add_paragraph(f"  • {evidence.file_name}", style='List Bullet')
+            evid_item.runs[0].font.size = Pt(10)
+            if evidence.description:
+                evid_desc = doc.add_paragraph(f"    Açıklama: {evidence.description}", style='List Bullet 2')
+                evid_desc.runs[0].font.size = Pt(9)
+                evid_desc.runs[0].font.color.rgb = RGBColor(107, 114, 128)
+    
+    # Add spacing between findings
+    doc.add_paragraph()
+    doc.add_paragraph()
 
 def add_conclusion_section(doc: Document, audit: Audit, findings):
     """Add conclusion and recommendations section"""
@@ -365,3 +362,222 @@ def generate_audit_word_report(audit: Audit, db: Session) -> str:
     
     return temp_path
 
+
+def add_consolidated_cover_page(doc: Document, organization, project, audit_count: int, period_label: str):
+    """Add cover page for a consolidated (project or organization) report"""
+    section = doc.sections[0]
+    section.page_height = Cm(29.7)  # A4 height
+    section.page_width = Cm(21.0)   # A4 width
+    section.top_margin = Cm(3)
+    section.bottom_margin = Cm(2)
+    section.left_margin = Cm(2.5)
+    section.right_margin = Cm(2.5)
+    
+    title_para = doc.add_paragraph()
+    title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title_run = title_para.add_run("KONSOLİDE DENETİM RAPORU")
+    title_run.font.size = Pt(28)
+    title_run.font.bold = True
+    title_run.font.color.rgb = RGBColor(37, 99, 235)  # Blue
+    title_para.space_after = Pt(24)
+    
+    doc.add_paragraph()
+    doc.add_paragraph()
+    
+    scope_para = doc.add_paragraph()
+    scope_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    scope_run = scope_para.add_run(project.name if project else organization.name)
+    scope_run.font.size = Pt(20)
+    scope_run.font.bold = True
+    scope_para.space_after = Pt(12)
+    
+    for _ in range(8):
+        doc.add_paragraph()
+    
+    info_data = [
+        ("Organizasyon", organization.name),
+        ("Proje", project.name if project else "Tüm Projeler"),
+        ("Dönem", period_label),
+        ("Denetim Sayısı", audit_count),
+        ("Rapor Tarihi", datetime.now().strftime("%d.%m.%Y")),
+    ]
+    
+    table = doc.add_table(rows=len(info_data), cols=2)
+    table.style = 'Light Grid Accent 1'
+    table.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    for i, (label, value) in enumerate(info_data):
+        table.rows[i].cells[0].text = label
+        table.rows[i].cells[1].text = str(value)
+        
+        label_run = table.rows[i].cells[0].paragraphs[0].runs[0]
+        label_run.font.bold = True
+        label_run.font.size = Pt(11)
+        
+        value_run = table.rows[i].cells[1].paragraphs[0].runs[0]
+        value_run.font.size = Pt(11)
+    
+    doc.add_page_break()
+
+def add_consolidated_summary(doc: Document, audit_count: int, severity_counts: Counter, standards):
+    """Add executive summary and scope for a consolidated report (rendered once)"""
+    heading = doc.add_heading('ÖZET YÖNETİCİ RAPORU', level=1)
+    heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    
+    total_findings = sum(severity_counts.values())
+    summary_para = doc.add_paragraph()
+    summary_para.add_run(
+        f"Bu rapor, kapsamdaki {audit_count} denetimin sonuçlarını tek bir belgede toplamaktadır. "
+        f"Denetimler boyunca toplamda {total_findings} bulgu tespit edilmiştir."
+    ).font.size = Pt(11)
+    
+    doc.add_paragraph()
+    stats_para = doc.add_paragraph("Bulgu Dağılımı:", style='List Bullet')
+    stats_para.runs[0].font.bold = True
+    stats_para.runs[0].font.size = Pt(11)
+    
+    for severity in [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW, Severity.INFO]:
+        count = severity_counts.get(severity, 0)
+        if count > 0:
+            stat_para = doc.add_paragraph(f"  • {get_severity_text(severity)}: {count} bulgu", style='List Bullet 2')
+            stat_para.runs[0].font.size = Pt(10)
+    
+    doc.add_paragraph()
+    
+    heading = doc.add_heading('DENETİM KAPSAMI VE METODOLOJİSİ', level=1)
+    heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    
+    scope_content = doc.add_paragraph(
+        "Denetimler aşağıdaki standartlar kapsamında gerçekleştirilmiştir: "
+        + (", ".join(s.value for s in standards) if standards else "Belirtilmemiş")
+    )
+    scope_content.runs[0].font.size = Pt(11)
+    
+    doc.add_paragraph()
+    doc.add_page_break()
+
+def add_consolidated_audit_section(doc: Document, audit_idx: int, audit: Audit, findings, severity_counts: Counter):
+    """Add one audit chapter of a consolidated report; findings are consumed as an iterator"""
+    heading = doc.add_heading(f"DENETİM #{audit_idx}: {audit.name}", level=1)
+    heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    
+    meta_items = [
+        ("Standart", audit.standard.value),
+        ("Denetim Tarihi", audit.audit_date.strftime("%d.%m.%Y") if audit.audit_date else "Belirtilmemiş"),
+        ("Bulgu Sayısı", sum(severity_counts.values())),
+    ]
+    for label, value in meta_items:
+        meta_para = doc.add_paragraph()
+        meta_para.add_run(f"{label}: ").font.bold = True
+        meta_para.add_run(str(value)).font.size = Pt(11)
+    
+    if audit.description:
+        desc_content = doc.add_paragraph(audit.description)
+        desc_content.runs[0].font.size = Pt(11)
+    
+    has_findings = False
+    for idx, finding in enumerate(findings, 1):
+        has_findings = True
+        add_finding_entry(doc, idx, finding)
+    
+    if not has_findings:
+        no_findings = doc.add_paragraph("Denetim kapsamında bulgu tespit edilmemiştir.")
+        no_findings.runs[0].font.size = Pt(11)
+        no_findings.runs[0].italic = True
+    
+    doc.add_page_break()
+
+def generate_consolidated_word_report(
+    db: Session,
+    organization,
+    project=None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    batch_size: int = 200
+) -> str:
+    """
+    Generate a single Word (.docx) report covering every audit of a project or organization.
+    Audits and findings are streamed with server-side cursors and rendered incrementally,
+    summary figures come from aggregate queries so no full finding list is ever materialized.
+    """
+    # Rendering between batches keeps the transaction open longer than the API timeouts allow
+    disable_query_timeouts(db)
+    audit_filters = [Project.organization_id == organization.id]
+    if project is not None:
+        audit_filters.append(Audit.project_id == project.id)
+    if start_date:
+        audit_filters.append(Audit.audit_date >= start_date)
+    if end_date:
+        audit_filters.append(Audit.audit_date <= end_date)
+    
+    # Shared figures, computed in SQL
+    per_audit_counts = {}
+    severity_counts = Counter()
+    count_rows = db.execute(
+        select(Finding.audit_id, Finding.severity, func.count(Finding.id))
+        .join(Audit, Finding.audit_id == Audit.id)
+        .join(Project, Audit.project_id == Project.id)
+        .where(*audit_filters)
+        .group_by(Finding.audit_id, Finding.severity)
+    )
+    for audit_id, severity, count in count_rows:
+        per_audit_counts.setdefault(audit_id, Counter())[severity] = count
+        severity_counts[severity] += count
+    
+    audit_count, = db.execute(
+        select(func.count(Audit.id)).join(Project, Audit.project_id == Project.id).where(*audit_filters)
+    ).one()
+    standards = db.execute(
+        select(Audit.standard).join(Project, Audit.project_id == Project.id)
+        .where(*audit_filters).distinct().order_by(Audit.standard)
+    ).scalars().all()
+    
+    if start_date or end_date:
+        period_label = " - ".join([
+            start_date.strftime("%d.%m.%Y") if start_date else "…",
+            end_date.strftime("%d.%m.%Y") if end_date else "…",
+        ])
+    else:
+        period_label = "Tüm Dönemler"
+    
+    doc = Document()
+    doc.core_properties.title = f"Konsolide Denetim Raporu - {project.name if project else organization.name}"
+    doc.core_properties.author = "ArchRampart Audit Tool"
+    doc.core_properties.comments = f"{audit_count} denetim"
+    
+    add_consolidated_cover_page(doc, organization, project, audit_count, period_label)
+    add_consolidated_summary(doc, audit_count, severity_counts, standards)
+    
+    audits = db.execute(
+        select(Audit).join(Project, Audit.project_id == Project.id)
+        .where(*audit_filters)
+        .order_by(Audit.audit_date, Audit.id)
+        .execution_options(yield_per=batch_size)
+    ).scalars()
+    
+    for audit_idx, audit in enumerate(audits, 1):
+        findings = db.execute(
+            select(Finding)
+            .options(selectinload(Finding.evidences))
+            .where(Finding.audit_id == audit.id)
+            .order_by(Finding.id)
+            .execution_options(yield_per=batch_size)
+        ).scalars()
+        add_consolidated_audit_section(doc, audit_idx, audit, findings, per_audit_counts.get(audit.id, Counter()))
+    
+    heading = doc.add_heading('SONUÇ VE ÖNERİLER', level=1)
+    heading.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    conclusion_para = doc.add_paragraph()
+    conclusion_para.add_run(
+        "Bu konsolide rapor, kapsamdaki denetimlerde tespit edilen bulguları ve önerileri içermektedir. "
+        "Organizasyonun ilgili standartlara uygunluğunu artırmak için belirtilen önerilerin "
+        "değerlendirilmesi ve uygulanması önerilmektedir."
+    ).font.size = Pt(11)
+    
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.docx')
+    temp_path = temp_file.name
+    temp_file.close()
+    
+    doc.save(temp_path)
+    
+    return temp_path
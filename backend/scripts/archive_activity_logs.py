@@ -0,0 +1,48 @@
+"""
+Activity log partition maintenance: creates the monthly partitions of the coming
+ACTIVITY_LOG_PARTITIONS_AHEAD months, then archives months older than ACTIVITY_LOG_RETENTION_MONTHS
+to ACTIVITY_LOG_ARCHIVE_DIR/activity_logs_YYYY_MM.csv.gz and detaches and drops them.
+A partition is only dropped once its archive has been written completely.
+Schedule with cron, e.g.:
+    15 3 1 * * docker exec rampart_backend python scripts/archive_activity_logs.py
+Usage: python scripts/archive_activity_logs.py [--dry-run]
+"""
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Archiving a month of activity may run longer than the API's statement timeout
+os.environ["DB_STATEMENT_TIMEOUT_MS"] = "0"
+
+from app.core.config import settings
+from app.db.database import engine
+from app.services.activity_partitions import archive_partition, drop_partition, ensure_partitions, expired_partitions
+
+def archive_activity_logs(dry_run: bool = False):
+    with engine.connect() as conn:
+        expired = expired_partitions(conn)
+    if dry_run:
+        print(f"📋 Retention {settings.ACTIVITY_LOG_RETENTION_MONTHS} month(s); would archive: {', '.join(expired) or 'nothing'}")
+        return
+
+    created = ensure_partitions(engine)
+    print(f"✅ Partitions created: {', '.join(created) or 'none needed'}")
+    for name in expired:
+        path = archive_partition(engine, name)
+        print(f"📦 {name} archived to {path}")
+        drop_partition(engine, name)
+        print(f"🗑️  {name} detached and dropped")
+    print(f"✅ Activity log maintenance complete ({len(expired)} partition(s) archived)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create upcoming activity_logs partitions and archive expired ones")
+    parser.add_argument("--dry-run", action="store_true", help="only list the partitions that would be archived")
+    args = parser.parse_args()
+    try:
+        archive_activity_logs(args.dry_run)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,167 @@
+"""
+Check the aggregated dashboard statistics against the original per-value COUNT queries.
+Seeds two organizations with projects, audits and findings (including soft-deleted ones)
+inside a transaction, computes /analytics/dashboard for a platform admin, an org admin and an
+auditor, with and without a project filter, once with the FILTER aggregates / rollups and once
+with one COUNT(*) per status and severity, and compares the figures. Everything is rolled back.
+Run it after `python scripts/migrate.py` against a development or CI database; exits with 1 when
+a figure differs.
+Usage: python scripts/check_dashboard_stats.py
+"""
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seeding and the per-value COUNT queries may run longer than the API's statement timeout
+os.environ["DB_STATEMENT_TIMEOUT_MS"] = "0"
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.db.database import engine
+from app.models.organization import Organization
+from app.models.project import Project, ProjectUser
+from app.models.audit import Audit, AuditStatus, AuditStandard
+from app.models.finding import Finding
+from app.models.template import Severity, Status
+from app.models.user import User, UserRole
+from app.core.dependencies import get_accessible_project_ids_query
+from app.api.v1.endpoints.analytics import _compute_dashboard_stats, _compute_my_findings
+
+FINDING_COUNT = 3000
+
+def seed(db: Session) -> dict:
+    """Throw-away organizations, users, projects, audits and findings; returns users and a project id"""
+    stamp = datetime.now().timestamp()
+    org, other_org = Organization(name="dashboard-check"), Organization(name="dashboard-check-other")
+    db.add_all([org, other_org])
+    db.flush()
+
+    def user(role, organization_id=None):
+        return User(
+            email=f"dashboard-check-{role.value}-{stamp}@example.com", hashed_password="!",
+            full_name="Dashboard Check", role=role, organization_id=organization_id
+        )
+    platform_admin, org_admin, auditor = user(UserRole.PLATFORM_ADMIN), user(UserRole.ORG_ADMIN, org.id), user(UserRole.AUDITOR, org.id)
+    projects = [Project(name=f"dashboard-check-{i}", organization_id=org.id) for i in range(3)]
+    other_project = Project(name="dashboard-check-other", organization_id=other_org.id)
+    db.add_all([platform_admin, org_admin, auditor, *projects, other_project])
+    db.flush()
+
+    # The auditor is a member of two projects, one of which gets soft-deleted below
+    db.add_all([ProjectUser(project_id=projects[0].id, user_id=auditor.id), ProjectUser(project_id=projects[2].id, user_id=auditor.id)])
+    all_projects = projects + [other_project]
+    audits = [
+        Audit(
+            name=f"dashboard-check-{i}", standard=AuditStandard.ISO27001,
+            project_id=all_projects[i % len(all_projects)].id, status=list(AuditStatus)[i % len(AuditStatus)]
+        )
+        for i in range(12)
+    ]
+    db.add_all(audits)
+    db.flush()
+
+    db.execute(text("""
+        INSERT INTO findings (audit_id, title, severity, status, assigned_to_user_id, due_date, deleted_at)
+        SELECT
+            (:audit_ids)[1 + n % cardinality(:audit_ids)],
+            'Finding ' || n,
+            ((:severities)[1 + n % cardinality(:severities)])::severity,
+            ((:statuses)[1 + (n / 5) % cardinality(:statuses)])::status,
+            CASE WHEN n % 3 = 0 THEN :assignee_id END,
+            CASE WHEN n % 4 = 0 THEN now() + (n % 20 - 10) * interval '1 day' END,
+            CASE WHEN n % 40 = 0 THEN now() END
+        FROM generate_series(1, :count) AS n
+    """), {
+        "audit_ids": [audit.id for audit in audits],
+        "severities": [severity.name for severity in Severity],
+        "statuses": [finding_status.name for finding_status in Status],
+        "assignee_id": auditor.id, "count": FINDING_COUNT,
+    })
+    # A soft-deleted audit and a soft-deleted project hide their findings
+    now = datetime.now()
+    audits[1].deleted_at = now
+    projects[2].deleted_at = now
+    db.query(Audit).filter(Audit.project_id == projects[2].id).update({Audit.deleted_at: now}, synchronize_session=False)
+    db.flush()
+    return {"users": [platform_admin, org_admin, auditor], "project_id": projects[0].id}
+
+def reference_stats(db: Session, user: User, project_id) -> dict:
+    """The dashboard as the original implementation computed it: one COUNT(*) per figure"""
+    if user.role == UserRole.PLATFORM_ADMIN:
+        accessible_project_ids = None
+    elif user.role == UserRole.ORG_ADMIN:
+        accessible_project_ids = [p.id for p in db.query(Project).filter(Project.organization_id == user.organization_id).all()]
+    else:
+        accessible_project_ids = [
+            project.id for project in db.query(Project).join(ProjectUser, ProjectUser.project_id == Project.id)
+            .filter(ProjectUser.user_id == user.id).all()
+        ]
+
+    audits_query = db.query(Audit)
+    findings_query = db.query(Finding).join(Audit)
+    if accessible_project_ids is not None:
+        audits_query = audits_query.filter(Audit.project_id.in_(accessible_project_ids))
+        findings_query = findings_query.filter(Audit.project_id.in_(accessible_project_ids))
+    if project_id:
+        audits_query = audits_query.filter(Audit.project_id == project_id)
+        findings_query = findings_query.filter(Audit.project_id == project_id)
+
+    is_open = Finding.status.in_([Status.OPEN, Status.IN_PROGRESS])
+    now = datetime.now()
+    total_findings = findings_query.count()
+    completed_findings = findings_query.filter(Finding.status == Status.RESOLVED).count()
+    completion_rate = (completed_findings / total_findings * 100) if total_findings > 0 else 0
+    return {
+        "total_projects": db.query(Project).count() if accessible_project_ids is None else len(accessible_project_ids),
+        "total_audits": audits_query.count(),
+        "total_findings": total_findings,
+        "open_findings": findings_query.filter(is_open).count(),
+        "urgent_findings": findings_query.filter(Finding.severity.in_([Severity.CRITICAL, Severity.HIGH]), is_open).count(),
+        "my_findings": findings_query.filter(Finding.assigned_to_user_id == user.id).count(),
+        "overdue_findings": findings_query.filter(Finding.due_date.isnot(None), Finding.due_date < now, is_open).count(),
+        "due_soon_findings": findings_query.filter(
+            Finding.due_date.isnot(None), Finding.due_date <= now + timedelta(days=3), Finding.due_date > now, is_open
+        ).count(),
+        "completion_rate": round(completion_rate, 2),
+        "audit_status_distribution": {status.value: audits_query.filter(Audit.status == status).count() for status in AuditStatus},
+        "severity_distribution": {severity.value: findings_query.filter(Finding.severity == severity).count() for severity in Severity},
+        "status_distribution": {status.value: findings_query.filter(Finding.status == status).count() for status in Status},
+    }
+
+def check_dashboard_stats() -> bool:
+    print("🔍 Comparing dashboard aggregates with per-value COUNT queries...")
+    failures = 0
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            db = Session(bind=conn)
+            seeded = seed(db)
+            for user in seeded["users"]:
+                for project_id in [None, seeded["project_id"]]:
+                    accessible_project_ids = get_accessible_project_ids_query(user)
+                    stats = _compute_dashboard_stats(db, accessible_project_ids, project_id)
+                    stats["my_findings"] = _compute_my_findings(db, accessible_project_ids, project_id, user.id)
+                    expected = reference_stats(db, user, project_id)
+                    label = f"{user.role.value}, project {project_id or 'all'}"
+                    differences = [key for key in expected if stats.get(key) != expected[key]]
+                    if differences:
+                        failures += 1
+                        print(f"  ❌ {label}:")
+                        for key in differences:
+                            print(f"     {key}: expected {expected[key]}, got {stats.get(key)}")
+                    else:
+                        print(f"  ✅ {label}")
+        finally:
+            transaction.rollback()
+
+    if failures:
+        print(f"❌ {failures} dashboard scope(s) differ")
+        return False
+    print("✅ Dashboard figures match!")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if check_dashboard_stats() else 1)
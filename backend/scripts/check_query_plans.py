@@ -0,0 +1,234 @@
+"""
+Check that the hot endpoint queries are served by their indexes.
+Seeds a throw-away organization with a few thousand findings, evidences, notifications and
+activity logs inside a transaction, runs EXPLAIN on the queries behind the main list / stats
+endpoints and checks that each plan uses the expected index. Everything is rolled back at the end.
+Run it after `python scripts/migrate.py` against a development or CI database; exits with 1 when
+a query no longer uses its index, e.g. after an index was dropped or a filter changed shape.
+Usage: python scripts/check_query_plans.py [--verbose]
+"""
+import argparse
+import json
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seeding and ANALYZE may run longer than the API's statement timeout
+os.environ["DB_STATEMENT_TIMEOUT_MS"] = "0"
+
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.db.database import engine
+from app.models.organization import Organization
+from app.models.project import Project
+from app.models.audit import Audit, AuditStandard
+from app.models.finding import Finding, Evidence
+from app.models.template import Template, TemplateItem, Severity, Status, OPEN_STATUSES
+from app.models.notification import Notification
+from app.models.activity import ActivityLog
+from app.models.user import User, UserRole
+
+FINDINGS_PER_AUDIT = 500
+AUDIT_COUNT = 20
+NOTIFICATION_COUNT = 5000
+ACTIVITY_LOG_COUNT = 20000
+
+# The partitioned index an index on a partition belongs to (the index itself for plain tables)
+PARENT_INDEX_SQL = text("SELECT COALESCE(pg_partition_root(to_regclass(:index_name)), to_regclass(:index_name))::text")
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, executed with the statement's own bind processing"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+def seed(db: Session) -> dict:
+    """Throw-away rows for the checks; returns the ids the queries filter on"""
+    organization = Organization(name="query-plan-check")
+    user = User(
+        email=f"query-plan-check-{datetime.now().timestamp()}@example.com",
+        hashed_password="!", full_name="Query Plan Check", role=UserRole.AUDITOR
+    )
+    template = Template(name="query-plan-check", standard=AuditStandard.ISO27001)
+    db.add_all([organization, user, template])
+    db.flush()
+    db.add_all([
+        TemplateItem(template_id=template.id, order_number=i, default_title=f"Item {i}")
+        for i in range(50)
+    ])
+    projects = [Project(name=f"query-plan-check-{i}", organization_id=organization.id) for i in range(5)]
+    db.add_all(projects)
+    db.flush()
+    audits = [
+        Audit(name=f"query-plan-check-{i}", standard=AuditStandard.ISO27001, project_id=projects[i % len(projects)].id)
+        for i in range(AUDIT_COUNT)
+    ]
+    db.add_all(audits)
+    db.flush()
+    audit_ids = [audit.id for audit in audits]
+
+    severities = [severity.name for severity in Severity]
+    statuses = [finding_status.name for finding_status in Status]
+    db.execute(text("""
+        INSERT INTO findings (audit_id, title, severity, status, assigned_to_user_id, due_date, deleted_at, created_at)
+        SELECT
+            (:audit_ids)[1 + n % cardinality(:audit_ids)],
+            'Finding ' || n,
+            ((:severities)[1 + n % cardinality(:severities)])::severity,
+            ((:statuses)[1 + (n / 7) % cardinality(:statuses)])::status,
+            CASE WHEN n % 3 = 0 THEN :user_id END,
+            CASE WHEN n % 4 = 0 THEN now() + (n % 60 - 30) * interval '1 day' END,
+            CASE WHEN n % 50 = 0 THEN now() END,
+            now() - (n % 365) * interval '1 day'
+        FROM generate_series(1, :count) AS n
+    """), {
+        "audit_ids": audit_ids, "severities": severities, "statuses": statuses,
+        "user_id": user.id, "count": FINDINGS_PER_AUDIT * AUDIT_COUNT,
+    })
+    db.execute(text("""
+        INSERT INTO evidences (finding_id, file_path, file_name)
+        SELECT id, 'query-plan-check/' || id, 'evidence.pdf'
+        FROM findings WHERE audit_id = ANY(:audit_ids) AND id % 2 = 0
+    """), {"audit_ids": audit_ids})
+    db.execute(text("""
+        INSERT INTO notifications (user_id, type, title, message, read, created_at)
+        SELECT :user_id, 'FINDING_ASSIGNED'::notificationtype, 'Notification ' || n, '-', n % 5 <> 0, now() - n * interval '1 hour'
+        FROM generate_series(1, :count) AS n
+    """), {"user_id": user.id, "count": NOTIFICATION_COUNT})
+    db.execute(text("""
+        INSERT INTO activity_logs (user_id, entity_type, entity_id, action, created_at)
+        SELECT :user_id, (ARRAY['project', 'audit', 'finding'])[1 + n % 3], n % 1000, 'updated', now() - n * interval '1 minute'
+        FROM generate_series(1, :count) AS n
+    """), {"user_id": user.id, "count": ACTIVITY_LOG_COUNT})
+    db.execute(text("ANALYZE findings, audits, projects, evidences, template_items, activity_logs, notifications"))
+
+    finding_id = db.execute(select(func.min(Finding.id)).where(Finding.audit_id == audit_ids[0])).scalar()
+    return {
+        "organization_id": organization.id, "project_id": projects[0].id, "audit_id": audit_ids[0],
+        "audit_ids": audit_ids[:5], "finding_id": finding_id, "template_id": template.id, "user_id": user.id,
+    }
+
+def hot_queries(ids: dict):
+    """(label, statement, expected index or indexes) for the queries behind the main endpoints"""
+    live_finding = Finding.deleted_at.is_(None)
+    now = datetime.now()
+    return [
+        ("projects of an organization",
+         select(Project).where(Project.organization_id == ids["organization_id"], Project.deleted_at.is_(None)),
+         "ix_projects_organization_id_live"),
+        ("audits of a project",
+         select(Audit).where(Audit.project_id == ids["project_id"], Audit.deleted_at.is_(None)),
+         "ix_audits_project_id_live"),
+        ("findings of an audit",
+         select(Finding).where(Finding.audit_id == ids["audit_id"], live_finding).limit(100),
+         ("ix_findings_audit_status_severity", "ix_findings_audit_id")),
+        ("findings of an audit by status and severity",
+         select(Finding).where(
+             Finding.audit_id == ids["audit_id"], Finding.status == Status.OPEN, Finding.severity == Severity.CRITICAL, live_finding
+         ),
+         "ix_findings_audit_status_severity"),
+        ("finding stats of audits",
+         select(Finding.audit_id, Finding.status, Finding.severity, func.count())
+         .where(Finding.audit_id.in_(ids["audit_ids"]), live_finding)
+         .group_by(Finding.audit_id, Finding.status, Finding.severity),
+         "ix_findings_audit_status_severity"),
+        ("findings of an audit incl. deleted (cascade / purge)",
+         select(Finding.id).where(Finding.audit_id == ids["audit_id"]),
+         "ix_findings_audit_id"),
+        ("overdue findings",
+         select(func.count(Finding.id)).where(
+             Finding.due_date.isnot(None), Finding.due_date < now, Finding.status.in_(OPEN_STATUSES), live_finding
+         ),
+         "ix_findings_open_due_date"),
+        ("findings due soon with an assignee",
+         select(Finding.id, Finding.assigned_to_user_id).where(
+             Finding.due_date.isnot(None), Finding.due_date <= now + timedelta(days=3), Finding.due_date > now,
+             Finding.status.in_(OPEN_STATUSES), Finding.assigned_to_user_id.isnot(None), live_finding
+         ),
+         "ix_findings_open_due_date"),
+        ("evidences of a finding",
+         select(Evidence).where(Evidence.finding_id == ids["finding_id"]),
+         "ix_evidences_finding_id"),
+        ("template items",
+         select(TemplateItem).where(TemplateItem.template_id == ids["template_id"]).order_by(TemplateItem.order_number),
+         "ix_template_items_template_id"),
+        ("unread notifications",
+         select(Notification).where(Notification.user_id == ids["user_id"], Notification.read == False)
+         .order_by(Notification.created_at.desc()).limit(50),
+         "ix_notifications_user_read_created_at"),
+        ("unread notification count",
+         select(func.count(Notification.id)).where(Notification.user_id == ids["user_id"], Notification.read == False),
+         "ix_notifications_user_read_created_at"),
+        ("activity of an entity",
+         select(ActivityLog).where(ActivityLog.entity_type == "finding", ActivityLog.entity_id == 42)
+         .order_by(ActivityLog.created_at.desc()).limit(100),
+         "ix_activity_logs_entity_created_at"),
+        ("activity of a user in the last week",
+         select(ActivityLog).where(ActivityLog.user_id == ids["user_id"], ActivityLog.created_at >= now - timedelta(days=7))
+         .order_by(ActivityLog.created_at.desc()).limit(100),
+         "ix_activity_logs_user_id_created_at"),
+    ]
+
+def check_query_plans(verbose: bool = False) -> bool:
+    print("🔍 Checking query plans of the hot endpoint queries...")
+    failures = 0
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            db = Session(bind=conn)
+            ids = seed(db)
+            # Development tables are small enough for a sequential scan to win regardless of the
+            # indexes; with it disabled the check is whether the expected index can serve the query
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+            for label, statement, expected in hot_queries(ids):
+                expected_indexes = (expected,) if isinstance(expected, str) else expected
+                plan = conn.execute(Explain(statement)).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                nodes = list(_plan_nodes(plan[0]["Plan"]))
+                # Index scans on partitions name the partition's index; report the parent index
+                index_names = {
+                    conn.execute(PARENT_INDEX_SQL, {"index_name": node["Index Name"]}).scalar()
+                    for node in nodes if "Index Name" in node
+                }
+                used = [index_name for index_name in expected_indexes if index_name in index_names]
+                if used:
+                    print(f"  ✅ {label}: {used[0]}")
+                else:
+                    failures += 1
+                    scans = ", ".join(
+                        f"{node['Node Type']} on {node.get('Index Name') or node.get('Relation Name')}"
+                        for node in nodes if "Relation Name" in node or "Index Name" in node
+                    )
+                    print(f"  ❌ {label}: expected {' or '.join(expected_indexes)}, plan uses {scans}")
+                if verbose:
+                    print(json.dumps(plan, indent=2))
+        finally:
+            transaction.rollback()
+
+    if failures:
+        print(f"❌ {failures} query plan(s) do not use their index")
+        return False
+    print("✅ Every hot query uses its index!")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot endpoint queries and check their indexes")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+    sys.exit(0 if check_query_plans(args.verbose) else 1)
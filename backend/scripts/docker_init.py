@@ -1,6 +1,6 @@
 """
 Docker initialization script for backend
-Creates database tables, runs migrations, creates default templates and admin user
+Applies schema migrations, creates default templates and admin user
 """
 import os
 import sys
@@ -8,41 +8,29 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Schema changes and index builds may legitimately run longer than the API's statement timeout
+os.environ["DB_STATEMENT_TIMEOUT_MS"] = "0"
+
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal, engine, Base
+from app.db.database import SessionLocal, engine
+from app.db.migrations import run_migrations as apply_schema_migrations
+from app.services.activity_partitions import ensure_partitions
 from app.models.user import User, UserRole
 from app.models.template import Template
 from app.core.security import get_password_hash
 
-def init_database():
-    """Initialize database - create tables"""
-    print("📊 Creating database tables...")
-    try:
-        Base.metadata.create_all(bind=engine)
-        print("✅ Tables created!")
-    except Exception as e:
-        print(f"⚠️  Error creating tables: {e}")
-        raise
-
 def run_migrations():
-    """Run database migrations"""
-    if os.path.exists("scripts/migrate_new_features.py"):
-        print("🔄 Running migrations...")
-        try:
-            import subprocess
-            result = subprocess.run(
-                ["python", "scripts/migrate_new_features.py"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                print("✅ Migrations completed!")
-            else:
-                print("⚠️  Migration script output:")
-                print(result.stdout)
-                print(result.stderr)
-        except Exception as e:
-            print(f"⚠️  Migration error: {e}")
+    """Apply pending schema migrations (tables, columns, indexes); the API workers do no DDL"""
+    print("📊 Applying schema migrations...")
+    applied = apply_schema_migrations(engine)
+    if applied:
+        print(f"✅ {len(applied)} migration(s) applied")
+    else:
+        print("✅ Schema is up to date")
+    # Upcoming activity_logs partitions (scripts/archive_activity_logs.py also archives old ones)
+    created = ensure_partitions(engine)
+    if created:
+        print(f"✅ Activity log partitions created: {', '.join(created)}")
 
 def create_default_templates():
     """Create default templates if they don't exist"""
@@ -138,11 +126,7 @@ if __name__ == "__main__":
     print("")
     
     try:
-        # Initialize database
-        init_database()
-        print("")
-        
-        # Run migrations
+        # Create / migrate the schema
         run_migrations()
         print("")
         
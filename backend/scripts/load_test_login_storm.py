@@ -0,0 +1,81 @@
+"""
+Login storm load test: measures latency of a cheap authenticated endpoint (GET /auth/me)
+on its own and while many concurrent logins hash passwords, and prints p50/p95/p99 for both.
+With hashing off the event loop the two p99 values should stay close.
+Usage:
+    python scripts/load_test_login_storm.py --base-url http://localhost:8000/api/v1 \
+        --email admin@archrampart.com --password admin123 --logins 200 --concurrency 32
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+def _login(base_url: str, email: str, password: str) -> str:
+    body = urllib.parse.urlencode({"username": email, "password": password}).encode()
+    request = urllib.request.Request(
+        f"{base_url}/auth/login", data=body,
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())["access_token"]
+
+def _timed_me(base_url: str, token: str) -> float:
+    request = urllib.request.Request(f"{base_url}/auth/me", headers={"Authorization": f"Bearer {token}"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=60) as response:
+        response.read()
+    return (time.perf_counter() - started) * 1000
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {"n": 0}
+    def pick(p):
+        return samples[min(len(samples) - 1, int(round(p / 100 * (len(samples) - 1))))]
+    return {"n": len(samples), "p50": round(pick(50), 1), "p95": round(pick(95), 1), "p99": round(pick(99), 1)}
+
+def _probe(base_url: str, token: str, count: int, interval: float, stop: threading.Event = None):
+    samples = []
+    for _ in range(count):
+        if stop is not None and stop.is_set():
+            break
+        samples.append(_timed_me(base_url, token))
+        time.sleep(interval)
+    return samples
+
+def run(args):
+    token = _login(args.base_url, args.email, args.password)
+    print("📏 Baseline (no logins)...")
+    baseline = _probe(args.base_url, token, args.probes, args.interval)
+    print(f"   {_percentiles(baseline)}")
+
+    print(f"🌩️  Login storm: {args.logins} logins, {args.concurrency} concurrent...")
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as prober:
+        probe_future = prober.submit(_probe, args.base_url, token, args.probes, args.interval, stop)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as storm:
+            list(storm.map(lambda _: _login(args.base_url, args.email, args.password), range(args.logins)))
+        storm_seconds = time.perf_counter() - started
+        stop.set()
+        during = probe_future.result()
+
+    print(f"   {args.logins / storm_seconds:.1f} logins/s")
+    print(f"   {_percentiles(during)}")
+    if baseline and during:
+        print(f"✅ p99 during storm / baseline: {_percentiles(during)['p99'] / max(_percentiles(baseline)['p99'], 0.1):.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--probes", type=int, default=200, help="Probe requests per phase")
+    parser.add_argument("--interval", type=float, default=0.01, help="Seconds between probe requests")
+    run(parser.parse_args())
@@ -0,0 +1,44 @@
+"""
+Apply pending schema migrations (app/db/migrations/versions) or show their status.
+Run once before starting the API workers; concurrent runs wait for each other.
+Usage:
+    python scripts/migrate.py            # apply everything pending
+    python scripts/migrate.py --to 12    # apply up to version 12
+    python scripts/migrate.py --status
+"""
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Index builds and backfills may legitimately run longer than the API's statement timeout
+os.environ["DB_STATEMENT_TIMEOUT_MS"] = "0"
+
+from app.db.database import engine
+from app.db.migrations import run_migrations, migration_status
+
+def migrate(target_version=None):
+    print("🗄️  Applying schema migrations...")
+    applied = run_migrations(engine, target_version)
+    if applied:
+        print(f"✅ {len(applied)} migration(s) applied")
+    else:
+        print("✅ Schema is up to date")
+
+def status():
+    for migration in migration_status(engine):
+        state = f"applied {migration['applied_at']:%Y-%m-%d %H:%M} ({migration['duration_ms']} ms)" if migration["applied_at"] else "pending"
+        mode = "" if migration["transactional"] else " [non-transactional]"
+        print(f"  {migration['version']:04d}_{migration['name']}{mode}: {state}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--to", type=int, default=None, help="Last version to apply")
+    parser.add_argument("--status", action="store_true", help="List migrations and whether they are applied")
+    args = parser.parse_args()
+    if args.status:
+        status()
+    else:
+        migrate(args.to)
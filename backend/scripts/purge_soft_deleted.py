@@ -0,0 +1,28 @@
+"""
+Hard-delete projects, audits and findings soft-deleted longer than SOFT_DELETE_RETENTION_DAYS.
+Schedule with cron, e.g.:
+    30 3 * * * docker exec rampart_backend python scripts/purge_soft_deleted.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal
+from app.services.purge import purge_soft_deleted
+
+def purge():
+    db = SessionLocal()
+    try:
+        result = purge_soft_deleted(db)
+        print(f"✅ Soft-deleted rows purged: {result}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    purge()
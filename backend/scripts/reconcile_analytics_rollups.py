@@ -0,0 +1,32 @@
+"""
+Nightly reconciliation of analytics rollups against the findings table.
+Schedule with cron, e.g.:
+    0 3 * * * docker exec rampart_backend python scripts/reconcile_analytics_rollups.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The full rebuild may run longer than the API's statement timeout
+os.environ["DB_STATEMENT_TIMEOUT_MS"] = "0"
+
+from app.db.database import SessionLocal
+from app.services.analytics_rollups import rebuild_finding_rollups
+
+def reconcile():
+    db = SessionLocal()
+    try:
+        result = rebuild_finding_rollups(db)
+        db.commit()
+        print(f"✅ Rollups reconciled: {result}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    reconcile()
@@ -411,7 +411,7 @@ def main():
             print("\n✅ Translation complete!")
             print("📝 Next steps:")
             print("   1. Review the updated template file")
-            print("   2. Run migration: python backend/scripts/migrate_template_i18n.py")
+            print("   2. Run migration: python backend/scripts/migrate.py")
             print("   3. Recreate templates: python backend/scripts/create_default_templates_full.py")
         except Exception as e:
             print(f"❌ Error updating file: {e}")
@@ -18,6 +18,13 @@ export interface DashboardStats {
 export interface TimelinePoint {
   date: string
   count: number
+  series?: Record<string, number>
+}
+
+export interface TimelineOptions {
+  granularity?: 'day' | 'week' | 'month'
+  tz?: string
+  split?: 'severity' | 'status'
 }
 
 export const analyticsApi = {
@@ -25,10 +32,13 @@ export const analyticsApi = {
     const params = projectId ? `?project_id=${projectId}` : ''
     return apiClient.get<DashboardStats>(`/analytics/dashboard${params}`)
   },
-  getFindingsTimeline: (days?: number, projectId?: number) => {
+  getFindingsTimeline: (days?: number, projectId?: number, options: TimelineOptions = {}) => {
     const params = new URLSearchParams()
     if (days) params.append('days', days.toString())
     if (projectId) params.append('project_id', projectId.toString())
+    if (options.granularity) params.append('granularity', options.granularity)
+    params.append('tz', options.tz || Intl.DateTimeFormat().resolvedOptions().timeZone)
+    if (options.split) params.append('split', options.split)
     const queryString = params.toString()
     return apiClient.get<TimelinePoint[]>(`/analytics/findings-timeline${queryString ? `?${queryString}` : ''}`)
   },
@@ -15,6 +15,19 @@ export interface Audit {
   updated_at?: string
 }
 
+// Audit list entry; finding_stats is only filled when listed with includeStats
+export interface AuditWithStats extends Audit {
+  finding_stats: AuditFindingStats | null
+}
+
+export interface AuditFindingStats {
+  total: number
+  by_severity: Record<string, number>
+  by_status: Record<string, number>
+  overdue: number
+  completion_percentage: number
+}
+
 export interface AuditCreate {
   name: string
   description?: string
@@ -35,15 +48,26 @@ export interface AuditUpdate {
 }
 
 export const auditsApi = {
-  getAll: (projectId?: number) => {
-    const params = projectId ? `?project_id=${projectId}` : ''
-    return apiClient.get<Audit[]>(`/audits${params}`)
+  getAll: (projectId?: number, includeStats = false) => {
+    const params = new URLSearchParams()
+    if (projectId) params.append('project_id', projectId.toString())
+    if (includeStats) params.append('include_stats', 'true')
+    const query = params.toString()
+    return apiClient.get<AuditWithStats[]>(`/audits${query ? `?${query}` : ''}`)
   },
   getById: (id: number) => apiClient.get<Audit>(`/audits/${id}`),
   create: (data: AuditCreate) => apiClient.post<Audit>('/audits', data),
   update: (id: number, data: AuditUpdate) => apiClient.put<Audit>(`/audits/${id}`, data),
-  delete: (id: number) => apiClient.delete(`/audits/${id}`),
-  copy: (id: number, newName: string) => apiClient.post<Audit>(`/audits/${id}/copy?new_name=${encodeURIComponent(newName)}`),
+  // Moves to trash (restorable for the retention window); permanent deletes immediately
+  delete: (id: number, permanent = false) =>
+    apiClient.delete(`/audits/${id}`, { params: permanent ? { permanent: true } : undefined }),
+  restore: (id: number) => apiClient.post<Audit>(`/audits/${id}/restore`),
+  copy: (id: number, newName: string, options: { includeComments?: boolean; includeEvidence?: boolean } = {}) => {
+    const params = new URLSearchParams({ new_name: newName })
+    if (options.includeComments) params.append('include_comments', 'true')
+    if (options.includeEvidence) params.append('include_evidence', 'true')
+    return apiClient.post<Audit>(`/audits/${id}/copy?${params.toString()}`)
+  },
   generateWord: (id: number) => apiClient.get(`/reports/audit/${id}/word`, { responseType: 'blob' }),
 }
 
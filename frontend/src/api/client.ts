@@ -32,8 +32,16 @@ const apiClient = axios.create({
   },
 })
 
+// Read-your-writes: after a write the backend returns a deadline until which reads must come
+// from the primary database; it is sent back on every request (expired values are ignored)
+const READ_YOUR_WRITES_HEADER = 'X-Read-Your-Writes-Until'
+let readYourWritesUntil: string | null = null
+
 // Add auth token to requests
 apiClient.interceptors.request.use((config) => {
+  if (readYourWritesUntil) {
+    config.headers[READ_YOUR_WRITES_HEADER] = readYourWritesUntil
+  }
   const stored = localStorage.getItem('auth-storage')
   if (stored) {
     try {
@@ -50,7 +58,13 @@ apiClient.interceptors.request.use((config) => {
 
 // Add response interceptor for better error handling
 apiClient.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const deadline = response.headers[READ_YOUR_WRITES_HEADER.toLowerCase()]
+    if (deadline) {
+      readYourWritesUntil = deadline
+    }
+    return response
+  },
   (error) => {
     // Better error messages for network errors
     if (error.code === 'ECONNREFUSED' || error.code === 'ERR_NETWORK') {
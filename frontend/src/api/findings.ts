@@ -84,7 +84,10 @@ export const findingsApi = {
   getById: (id: number) => apiClient.get<Finding>(`/findings/${id}`),
   create: (data: FindingCreate) => apiClient.post<Finding>('/findings', data),
   update: (id: number, data: FindingUpdate) => apiClient.put<Finding>(`/findings/${id}`, data),
-  delete: (id: number) => apiClient.delete(`/findings/${id}`),
+  // Moves to trash (restorable for the retention window); permanent deletes immediately
+  delete: (id: number, permanent = false) =>
+    apiClient.delete(`/findings/${id}`, { params: permanent ? { permanent: true } : undefined }),
+  restore: (id: number) => apiClient.post<Finding>(`/findings/${id}/restore`),
   uploadEvidence: (findingId: number, file: File, description?: string) => {
     const formData = new FormData()
     formData.append('file', file)
@@ -0,0 +1,25 @@
+import apiClient from './client'
+
+export type JobStatus = 'pending' | 'running' | 'succeeded' | 'failed'
+
+export interface Job {
+  id: number
+  job_type: string
+  status: JobStatus
+  progress: number
+  completed_steps: number
+  total_steps?: number
+  message?: string
+  parameters?: Record<string, any>
+  result?: Record<string, any>
+  error?: string
+  created_by_user_id?: number
+  created_at: string
+  started_at?: string
+  finished_at?: string
+}
+
+export const jobsApi = {
+  getAll: (status?: JobStatus) => apiClient.get<Job[]>(`/jobs/${status ? `?status=${status}` : ''}`),
+  get: (id: number) => apiClient.get<Job>(`/jobs/${id}`),
+}
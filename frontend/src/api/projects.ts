@@ -1,4 +1,5 @@
 import apiClient from './client'
+import type { Job } from './jobs'
 
 export interface Project {
   id: number
@@ -32,7 +33,17 @@ export const projectsApi = {
   getById: (id: number) => apiClient.get<Project>(`/projects/${id}`),
   create: (data: ProjectCreate) => apiClient.post<Project>('/projects', data),
   update: (id: number, data: ProjectUpdate) => apiClient.put<Project>(`/projects/${id}`, data),
-  delete: (id: number) => apiClient.delete(`/projects/${id}`),
-  copy: (id: number, newName: string) => apiClient.post<Project>(`/projects/${id}/copy?new_name=${encodeURIComponent(newName)}`),
+  // Moves to trash (restorable for the retention window); permanent deletes immediately
+  delete: (id: number, permanent = false) =>
+    apiClient.delete(`/projects/${id}`, { params: permanent ? { permanent: true } : undefined }),
+  restore: (id: number) => apiClient.post<Project>(`/projects/${id}/restore`),
+  // Deep copy runs as a background job; poll jobsApi.get(job.id) for progress
+  copy: (id: number, newName: string, options: { includeComments?: boolean; includeEvidence?: boolean } = {}) => {
+    const params = new URLSearchParams({ new_name: newName })
+    if (options.includeComments) params.append('include_comments', 'true')
+    if (options.includeEvidence) params.append('include_evidence', 'true')
+    return apiClient.post<Job>(`/projects/${id}/copy?${params.toString()}`)
+  },
+  generateWord: (id: number) => apiClient.get(`/reports/project/${id}/word`, { responseType: 'blob' }),
 }
 
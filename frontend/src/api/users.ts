@@ -42,6 +42,8 @@ export const usersApi = {
   create: (data: UserCreate) => apiClient.post<User>('/users', data),
   update: (id: number, data: UserUpdate) => apiClient.put<User>(`/users/${id}`, data),
   delete: (id: number) => apiClient.delete(`/users/${id}`),
-  changePassword: (data: ChangePasswordData) => apiClient.post('/users/me/change-password', data),
+  // Returns a fresh access token; the previous one is revoked by the change
+  changePassword: (data: ChangePasswordData) =>
+    apiClient.post<{ message: string; access_token: string; token_type: string }>('/users/me/change-password', data),
 }
 
@@ -77,10 +77,14 @@ export default function Layout() {
 
     try {
       setPasswordLoading(true)
-      await usersApi.changePassword({
+      const response = await usersApi.changePassword({
         current_password: passwordData.current_password,
         new_password: passwordData.new_password,
       })
+      // The old token is revoked by the password change
+      if (response.data?.access_token) {
+        useAuthStore.getState().setToken(response.data.access_token)
+      }
       setShowPasswordModal(false)
       setPasswordData({
         current_password: '',
@@ -2,7 +2,7 @@ import { useState, useEffect, useCallback } from 'react'
 import { useTranslation } from 'react-i18next'
 import { useSearchParams } from 'react-router-dom'
 import { useAuthStore } from '../store/authStore'
-import { auditsApi, Audit, AuditCreate, AuditStandard, AuditStatus } from '../api/audits'
+import { auditsApi, Audit, AuditWithStats, AuditCreate, AuditStandard, AuditStatus } from '../api/audits'
 import { projectsApi } from '../api/projects'
 import { templatesApi } from '../api/templates'
 import { Plus, Edit, Trash2, Copy, FileCheck, FileText, X } from 'lucide-react'
@@ -12,7 +12,7 @@ export default function Audits() {
   const { t, i18n } = useTranslation()
   const { user: currentUser } = useAuthStore()
   const [searchParams, setSearchParams] = useSearchParams()
-  const [audits, setAudits] = useState<Audit[]>([])
+  const [audits, setAudits] = useState<AuditWithStats[]>([])
   const [projects, setProjects] = useState<any[]>([])
   const [templates, setTemplates] = useState<any[]>([])
   const [loading, setLoading] = useState(true)
@@ -60,7 +60,8 @@ export default function Audits() {
   const loadAudits = async () => {
     try {
       setLoading(true)
-      const response = await auditsApi.getAll(selectedProject || undefined)
+      // Finding counters come with the list in the same request
+      const response = await auditsApi.getAll(selectedProject || undefined, true)
       setAudits(response.data)
     } catch (error: any) {
       console.error('Error loading audits:', error)
@@ -349,6 +350,9 @@ export default function Audits() {
                 <th className="table-cell font-bold text-neutral-900 uppercase text-xs tracking-wider">
                   {t('common.status')}
                 </th>
+                <th className="table-cell font-bold text-neutral-900 uppercase text-xs tracking-wider">
+                  {t('audits.findingCount')}
+                </th>
                 <th className="table-cell font-bold text-neutral-900 uppercase text-xs tracking-wider text-right">
                   {t('common.actions')}
                 </th>
@@ -357,6 +361,7 @@ export default function Audits() {
             <tbody>
               {audits.map((audit) => {
                 const project = projects.find(p => p.id === audit.project_id)
+                const stats = audit.finding_stats
                 return (
                   <tr key={audit.id} className="table-row">
                     <td className="table-cell">
@@ -378,6 +383,34 @@ export default function Audits() {
                         {statusLabels[audit.status || 'planning']}
                       </span>
                     </td>
+                    <td className="table-cell">
+                      {stats && stats.total > 0 ? (
+                        <div className="min-w-[8rem]">
+                          <div className="flex items-center gap-2 text-sm">
+                            <span className="font-semibold text-neutral-900">{stats.total}</span>
+                            <span className="text-neutral-600">
+                              {t('audits.openCount', { count: (stats.by_status.open || 0) + (stats.by_status.in_progress || 0) })}
+                            </span>
+                            {stats.overdue > 0 && (
+                              <span className="badge bg-error-100 text-error-800 shadow-sm">
+                                {stats.overdue} {t('findings.overdue')}
+                              </span>
+                            )}
+                          </div>
+                          <div className="mt-1.5 h-1.5 w-full rounded-full bg-neutral-200">
+                            <div
+                              className="h-1.5 rounded-full bg-success-500"
+                              style={{ width: `${stats.completion_percentage}%` }}
+                            />
+                          </div>
+                          <span className="text-xs text-neutral-500">
+                            {t('audits.completion', { percent: stats.completion_percentage })}
+                          </span>
+                        </div>
+                      ) : (
+                        <span className="text-sm text-neutral-400">-</span>
+                      )}
+                    </td>
                     <td className="table-cell text-right">
                       <div className="flex justify-end items-center space-x-1">
                         <button
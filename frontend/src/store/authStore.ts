@@ -30,6 +30,8 @@ interface AuthState {
   token: string | null
   login: (email: string, password: string) => Promise<void>
   logout: () => void
+  // Replace the token, e.g. after a password change revoked the previous one
+  setToken: (token: string) => void
   isAuthenticated: () => boolean
 }
 
@@ -128,6 +130,11 @@ export const useAuthStore = create<AuthState>((set, get) => ({
     localStorage.removeItem('auth-storage')
     delete axios.defaults.headers.common['Authorization']
   },
+  setToken: (token: string) => {
+    set({ token })
+    localStorage.setItem('auth-storage', JSON.stringify({ token, user: get().user }))
+    axios.defaults.headers.common['Authorization'] = `Bearer ${token}`
+  },
   isAuthenticated: () => {
     return get().token !== null && get().user !== null
   },
@@ -90,6 +90,7 @@ echo ""
 echo "7️⃣  Starting backend..."
 cd backend
 source venv/bin/activate
+python scripts/migrate.py
 nohup uvicorn app.main:app --host 0.0.0.0 --port 8000 > ../backend.log 2>&1 &
 BACKEND_PID=$!
 echo $BACKEND_PID > ../.backend.pid